@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 
 class ArticleConfig(AppConfig):
-    name = 'article'
+    name = 'authors.apps.article'
+    label = 'article'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,126 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+
+def response_timeout():
+    """
+    Returns how long a rendered article stays cached, in seconds
+    """
+    return getattr(settings, 'ARTICLE_CACHE_TIMEOUT', 300)
+
+
+def viewer_class(request):
+    """
+    Returns the class of viewer a response is cached for. Responses are
+    shared by every viewer in a class, so nothing specific to one viewer
+    may be cached.
+    """
+    if request.user.is_authenticated:
+        return 'reader'
+    return 'anonymous'
+
+
+def response_key(request, slug, version):
+    query = hashlib.md5(
+        request.META.get('QUERY_STRING', '').encode('utf-8')).hexdigest()
+    return 'article:{}:{}:{}:{}:{}'.format(
+        slug, version[0], version[1], viewer_class(request), query)
+
+
+def get_article_response(request, slug, version):
+    """
+    Looks up the cached representation of an article for `request`.
+    Responses are keyed by the article's version, which every write to
+    what the article shows bumps in the database, so every process moves
+    to the new key at once without being told. The version is read before
+    the article, so a response serialized while the article changes is
+    stored under the old version.
+    :param request: the request being answered
+    :param slug: the article's unique slug
+    :param version: the article's (pk, version) pair, see article_stamp
+    :return: a (key, data) tuple, data is None if it is not cached
+    """
+    key = response_key(request, slug, version)
+    return key, cache.get(key)
+
+
+def set_article_response(key, data):
+    """
+    Caches the representation of an article under the key returned by
+    get_article_response
+    :param data: the serialized article, without viewer specific fields
+    """
+    cache.set(key, data, response_timeout())
+
+
+def get_tags_response(request, generation):
+    """
+    Looks up the cached tag directory for the query of `request`
+    :param generation: the tag directory's token in the database, see
+                       CacheGeneration
+    :return: a (key, data) tuple, data is None if it is not cached
+    """
+    query = hashlib.md5(
+        request.META.get('QUERY_STRING', '').encode('utf-8')).hexdigest()
+    key = 'tags:{}:{}'.format(generation, query)
+    return key, cache.get(key)
+
+
+def set_tags_response(key, data):
+    """
+    Caches the tag directory under the key returned by get_tags_response
+    """
+    cache.set(key, data, response_timeout())
+
+
+def search_key(backend, terms, filters, generation):
+    """
+    Returns the key the results of a search are cached under in the
+    current corpus generation. Read the generation before searching, so
+    results read while an article changes are stored under the old one.
+    :param backend: the search backend that ranks the results
+    :param terms: the normalized search terms
+    :param filters: the structured filters, as a dict of sorted lists
+    :param generation: the corpus's token in the database, see
+                       CacheGeneration
+    """
+    search = hashlib.md5(json.dumps(
+        [backend, terms, filters], sort_keys=True).encode('utf-8')).hexdigest()
+    return 'search:{}:{}'.format(generation, search)
+
+
+def get_search_results(key):
+    return caches['search'].get(key)
+
+
+def set_search_results(key, rows):
+    """
+    Caches the ranked rows of a search in the search cache, which bounds
+    how many searches are kept and for how long
+    """
+    caches['search'].set(key, rows)
+
+
+def count_key(filters, generation):
+    """
+    Returns the key the number of articles matching structured filters is
+    cached under in the current corpus generation. Read the generation
+    before counting, like for search_key.
+    :param filters: the structured filters, as a dict of sorted lists
+    :param generation: the corpus's token in the database, see
+                       CacheGeneration
+    """
+    counted = hashlib.md5(
+        json.dumps(filters, sort_keys=True).encode('utf-8')).hexdigest()
+    return 'count:{}:{}'.format(generation, counted)
+
+
+def get_count(key):
+    return cache.get(key)
+
+
+def set_count(key, count):
+    cache.set(key, count, response_timeout())
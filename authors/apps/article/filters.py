@@ -0,0 +1,92 @@
+from datetime import datetime, time
+
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import (
+    NotAuthenticated, PermissionDenied, ValidationError)
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Article, ArticleBookmark, ArticleFavourite
+
+
+class ArticleFilter(BaseFilterBackend):
+    """
+    Narrows articles by structured query params. Each filter is a lookup
+    on an index rather than a full-text match:
+
+    - `author`: the author's username, on (author, created_at, id)
+    - `tag`: a tag name, on taggit's through table; repeat it to require
+      several tags
+    - `favorited_by`, `bookmarked_by`: a username, on the user column of
+      the favourites or bookmarks table. Bookmarks are private, so only
+      the signed in user's own can be filtered by.
+    - `created_after`, `created_before`: an ISO 8601 date or datetime,
+      on (created_at, id). After is inclusive, before is exclusive.
+    """
+    params = ('author', 'tag', 'favorited_by', 'bookmarked_by',
+              'created_after', 'created_before')
+    # params naming a user, who alone may filter by them
+    private_params = ('bookmarked_by', )
+
+    def filter_queryset(self, request, queryset, view=None):
+        for param in self.params:
+            for value in request.query_params.getlist(param):
+                if param in self.private_params:
+                    self.check_owner(request, value)
+                queryset = getattr(self, 'filter_' + param)(queryset, value)
+        return queryset
+
+    def check_owner(self, request, username):
+        """
+        :raises NotAuthenticated: if nobody is signed in
+        :raises PermissionDenied: if `username` is someone else's
+        """
+        if not request.user.is_authenticated:
+            raise NotAuthenticated()
+        if request.user.username != username:
+            raise PermissionDenied('You can only filter by your own bookmarks')
+
+    def filter_author(self, queryset, username):
+        return queryset.filter(author__username=username)
+
+    def filter_tag(self, queryset, name):
+        through = Article._meta.get_field('tag_list').through
+        return queryset.filter(pk__in=through.objects.filter(
+            content_type=ContentType.objects.get_for_model(Article),
+            tag__name=name).values('object_id'))
+
+    def filter_favorited_by(self, queryset, username):
+        return queryset.filter(pk__in=ArticleFavourite.objects.filter(
+            user__username=username).values('article_id'))
+
+    def filter_bookmarked_by(self, queryset, username):
+        return queryset.filter(slug__in=ArticleBookmark.objects.filter(
+            user__username=username).values('article_id'))
+
+    def filter_created_after(self, queryset, value):
+        return queryset.filter(
+            created_at__gte=self.parse_moment('created_after', value))
+
+    def filter_created_before(self, queryset, value):
+        return queryset.filter(
+            created_at__lt=self.parse_moment('created_before', value))
+
+    def parse_moment(self, param, value):
+        """
+        Reads a date or datetime param, a date meaning its midnight
+        :raises ValidationError: if the value is neither
+        """
+        try:
+            moment = parse_datetime(value)
+            if moment is None:
+                day = parse_date(value)
+                moment = day and datetime.combine(day, time())
+        except ValueError:
+            moment = None
+        if moment is None:
+            raise ValidationError(
+                {param: 'Enter a valid ISO 8601 date or datetime'})
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
@@ -0,0 +1,133 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+WORD = re.compile(r'\w+')
+
+# words too common to tell documents apart, dropped like PostgreSQL's
+# english configuration drops them
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have he her his i if in into
+    is it its of on or she so than that the their them then there these
+    they this to was we were what when which who will with you your
+""".split())
+
+# endings stripped so "tools" and "tooling" match "tool"
+SUFFIXES = ('ing', 'ed', 'es', 's')
+MIN_STEM = 3
+
+
+def stem(word):
+    """
+    Strips the first of SUFFIXES that leaves at least MIN_STEM characters
+    """
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """
+    Splits `text` into lowercased, stemmed words, without stop words
+    :return: a list of tokens in the order they appear
+    """
+    return [stem(word) for word in WORD.findall(text.lower())
+            if word not in STOP_WORDS]
+
+
+class InvertedIndex(object):
+    """
+    A pure-Python full-text index. Each token has a postings dict mapping
+    the documents containing it to its term frequency, with every field's
+    occurrences counted at that field's weight. Documents are added and
+    removed one at a time, and searches match documents containing every
+    query token, scored with BM25.
+    """
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, weights):
+        """
+        :param weights: the weight of each field, e.g. {'title': 1.0}
+        """
+        self.weights = weights
+        self.postings = defaultdict(dict)
+        self.lengths = {}
+        self.tokens = {}
+        self.order = {}
+        self.total_length = 0.0
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, document, fields, order=0):
+        """
+        Indexes a document, replacing it if it is indexed
+        :param document: the document's id
+        :param fields: a dict of field name to text
+        :param order: breaks ties between equal scores, higher first
+        """
+        self.remove(document)
+        frequencies = Counter()
+        for name, text in fields.items():
+            weight = self.weights[name]
+            for token in tokenize(text or ''):
+                frequencies[token] += weight
+
+        for token, frequency in frequencies.items():
+            self.postings[token][document] = frequency
+        length = sum(frequencies.values())
+        self.lengths[document] = length
+        self.tokens[document] = list(frequencies)
+        self.order[document] = order
+        self.total_length += length
+
+    def remove(self, document):
+        """
+        Drops a document from the index, if it is indexed
+        """
+        if document not in self.lengths:
+            return
+        self.total_length -= self.lengths.pop(document)
+        del self.order[document]
+        for token in self.tokens.pop(document):
+            postings = self.postings[token]
+            del postings[document]
+            if not postings:
+                del self.postings[token]
+
+    def search(self, text):
+        """
+        Finds the documents containing every token of `text`
+        :return: a list of (document, score) pairs, best first
+        """
+        tokens = set(tokenize(text))
+        if not tokens:
+            return []
+        postings = sorted((self.postings.get(token, {}) for token in tokens),
+                          key=len)
+        if not postings[0]:
+            return []
+
+        count = len(self.lengths)
+        average = self.total_length / count or 1.0
+        weights = [(token_postings, math.log(
+            1 + (count - len(token_postings) + 0.5) /
+            (len(token_postings) + 0.5))) for token_postings in postings]
+        scores = []
+        for document in postings[0]:
+            norm = self.k1 * (
+                1 - self.b + self.b * self.lengths[document] / average)
+            score = 0.0
+            for token_postings, idf in weights:
+                frequency = token_postings.get(document)
+                if frequency is None:
+                    break
+                score += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            else:
+                scores.append((document, score))
+
+        scores.sort(key=lambda match: (
+            match[1], self.order[match[0]], match[0]), reverse=True)
+        return scores
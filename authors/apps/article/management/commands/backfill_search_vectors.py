@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import Article
+
+
+class Command(BaseCommand):
+    """
+    Stores the search vector of articles saved before it was kept up to
+    date. Articles are processed in primary key order, one UPDATE and
+    transaction per chunk.
+    """
+    help = 'Recomputes the stored search vectors of articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Number of articles indexed per transaction')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_pk = 0
+        indexed = 0
+
+        while True:
+            chunk = list(Article.objects.filter(pk__gt=last_pk).order_by(
+                'pk').values_list('pk', flat=True)[:chunk_size])
+            if not chunk:
+                break
+
+            with transaction.atomic():
+                indexed += Article.objects.filter(
+                    pk__in=chunk).update_search_vectors()
+            last_pk = chunk[-1]
+
+        self.stdout.write('Indexed {} articles'.format(indexed))
@@ -0,0 +1,48 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from ....authentication.models import User
+from ....authentication.serializers import AuthorSerializer, UserSerializer
+from ....profiles.models import UserProfile
+
+
+class Command(BaseCommand):
+    """
+    Measures the CPU cost of embedding an author in a serialized article
+    with the full `UserSerializer`, which signs a JWT per user, against
+    the compact `AuthorSerializer`. Runs on unsaved users, so it needs no
+    database rows and times serialization alone.
+    """
+    help = 'Benchmarks UserSerializer against AuthorSerializer per article'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--articles', type=int, default=1000,
+            help='Number of embedded authors serialized per run')
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Number of runs; the fastest one is reported')
+
+    def handle(self, *args, **options):
+        count = options['articles']
+        authors = []
+        for number in range(count):
+            user = User(pk=number + 1, username='author{}'.format(number),
+                        email='author{}@olympians.com'.format(number))
+            user.profile = UserProfile(username=user, bio='I write things')
+            authors.append(user)
+
+        results = {}
+        for serializer_class in (UserSerializer, AuthorSerializer):
+            timings = timeit.repeat(
+                lambda: serializer_class(authors, many=True).data,
+                number=1, repeat=options['repeat'])
+            per_article = min(timings) / count * 1e6
+            results[serializer_class.__name__] = per_article
+            self.stdout.write('{:<18} {:8.1f} us per article'.format(
+                serializer_class.__name__, per_article))
+
+        saving = results['UserSerializer'] - results['AuthorSerializer']
+        self.stdout.write('{:<18} {:8.1f} us per article ({:.0%})'.format(
+            'saving', saving, saving / results['UserSerializer']))
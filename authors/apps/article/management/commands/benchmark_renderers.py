@@ -0,0 +1,90 @@
+import json
+import timeit
+from collections import OrderedDict
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from ...renderer import ArticleJSONRenderer
+from ....core import renderers
+
+
+def legacy_render(data):
+    """
+    The article list rendering used before the shared renderer base: one
+    stdlib json.dumps over the envelope, returning str that DRF then
+    encodes to bytes
+    """
+    return json.dumps({
+        'articles': data,
+        'articlesCount': len(data)
+    }).encode('utf-8')
+
+
+class Command(BaseCommand):
+    """
+    Measures rendering a list of serialized articles with the previous
+    json.dumps renderer against ArticleJSONRenderer with each available
+    encoder. Uses synthetic payloads shaped like ArticleSerializer output,
+    so it needs no database rows and times rendering alone.
+    """
+    help = 'Benchmarks the article renderer and its JSON encoders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--articles', type=int, default=1000,
+            help='Number of articles rendered per run')
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Number of runs; the fastest one is reported')
+
+    def handle(self, *args, **options):
+        count = options['articles']
+        data = [self.article(number) for number in range(count)]
+
+        renderer = ArticleJSONRenderer()
+        candidates = [('legacy json.dumps', None, legacy_render)]
+        encoders = [('stdlib', 'authors.apps.core.renderers.stdlib_encode')]
+        if renderers.orjson is not None:
+            encoders.append(
+                ('orjson', 'authors.apps.core.renderers.orjson_encode'))
+        for name, path in encoders:
+            candidates.append(('renderer ' + name, path, renderer.render))
+
+        baseline = None
+        for name, encoder_path, render in candidates:
+            with override_settings(JSON_ENCODER=encoder_path):
+                timings = timeit.repeat(
+                    lambda: render(data), number=1, repeat=options['repeat'])
+            per_article = min(timings) / count * 1e6
+            if baseline is None:
+                baseline = per_article
+            self.stdout.write('{:<20} {:8.2f} us per article ({:.0%})'.format(
+                name, per_article, per_article / baseline))
+
+    def article(self, number):
+        author = OrderedDict([
+            ('username', 'author{}'.format(number)),
+            ('bio', 'I write about teams and software'),
+            ('avatar', None),
+        ])
+        return OrderedDict([
+            ('title', 'Article number {}'.format(number)),
+            ('description', 'be epic'),
+            ('body', 'powering todays teams ' * 50),
+            ('tag_list', ['andela', 'teams']),
+            ('created_at', '2019-03-01T10:00:00.000000Z'),
+            ('updated_at', '2019-03-01T10:00:00.000000Z'),
+            ('slug', 'article-number-{}'.format(number)),
+            ('favourited', False),
+            ('read_time', '1 minute(s)'),
+            ('word_count', 150),
+            ('author', author),
+            ('likes_count', 3),
+            ('dislikes_count', 0),
+            ('favourites_count', 1),
+            ('comments_count', 2),
+            ('likes', [OrderedDict([('user', author)])] * 3),
+            ('dislikes', []),
+            ('rates', 4.5),
+        ])
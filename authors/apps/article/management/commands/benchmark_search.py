@@ -0,0 +1,95 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from ....authentication.models import User
+from ...models import Article
+from ...search import InvertedIndexSearchBackend, PostgresSearchBackend
+
+POSTGRES = 'authors.apps.article.search.PostgresSearchBackend'
+
+
+class Command(BaseCommand):
+    """
+    Measures index build time and query latency of the PostgreSQL search
+    backend against the in-process inverted index. Writes a synthetic
+    corpus, with words drawn so a few are common and most are rare, in a
+    transaction that is rolled back afterwards.
+    """
+    help = 'Benchmarks the article search backends on a synthetic corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--articles', type=int, default=5000,
+            help='Number of synthetic articles indexed')
+        parser.add_argument(
+            '--queries', type=int, default=200,
+            help='Number of searches timed per backend')
+        parser.add_argument(
+            '--vocabulary', type=int, default=5000,
+            help='Number of distinct words in the corpus')
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Seed of the synthetic corpus and queries')
+
+    def handle(self, *args, **options):
+        generator = random.Random(options['seed'])
+        words = ['{}{}'.format(
+            ''.join(generator.choice('bcdfghjklmnprstvz') +
+                    generator.choice('aeiou') for _ in range(3)), number)
+            for number in range(options['vocabulary'])]
+        # Zipf-like: the n-th word is drawn in proportion to 1 / n
+        frequency = [1.0 / rank for rank in range(1, len(words) + 1)]
+
+        def text(count):
+            return ' '.join(generator.choices(words, frequency, k=count))
+
+        searches = [generator.choices(words, frequency, k=generator.choice(
+            (1, 2))) for _ in range(options['queries'])]
+
+        with transaction.atomic():
+            author = User.objects.create_user(
+                'benchmark-search', 'benchmark-search@olympians.com',
+                'qwerty12')
+            Article.objects.bulk_create([Article(
+                title=text(6), slug='benchmark-search-{}'.format(number),
+                description=text(15), body=text(300), author=author)
+                for number in range(options['articles'])])
+            corpus = Article.objects.filter(author=author)
+
+            backends = []
+            with override_settings(ARTICLE_SEARCH_BACKEND=POSTGRES):
+                started = time.perf_counter()
+                corpus.update_search_vectors()
+                backends.append(('postgres', PostgresSearchBackend(),
+                                 time.perf_counter() - started))
+            inverted = InvertedIndexSearchBackend()
+            started = time.perf_counter()
+            inverted.build()
+            backends.append(('inverted index', inverted,
+                             time.perf_counter() - started))
+
+            self.stdout.write('{:<16} {:>12} {:>12} {:>12}'.format(
+                'backend', 'build', 'median', 'p95'))
+            for name, backend, build in backends:
+                latencies = sorted(
+                    self.time_search(backend, corpus, terms)
+                    for terms in searches)
+                self.stdout.write(
+                    '{:<16} {:>9.1f} ms {:>9.2f} ms {:>9.2f} ms'.format(
+                        name, build * 1e3,
+                        latencies[len(latencies) // 2] * 1e3,
+                        latencies[int(len(latencies) * 0.95)] * 1e3))
+
+            transaction.set_rollback(True)
+
+    def time_search(self, backend, corpus, terms):
+        """
+        Times loading the first page of ranked results for `terms`
+        """
+        started = time.perf_counter()
+        list(backend.rank(corpus, terms)[:10])
+        return time.perf_counter() - started
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...trending import compute_trending
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the trending article scores from the engagement recorded
+    since the last run and swaps in the new top articles. Run it from a
+    scheduler with --once, or leave it looping.
+    """
+    help = 'Recomputes trending article scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Compute the scores once and exit')
+        parser.add_argument(
+            '--interval', type=float, default=300,
+            help='Seconds to sleep between runs')
+
+    def handle(self, *args, **options):
+        while True:
+            scored = compute_trending(timezone.now())
+            self.stdout.write(
+                'Updated trending scores of {} articles'.format(scored))
+            if options['once']:
+                return
+            time.sleep(options['interval'])
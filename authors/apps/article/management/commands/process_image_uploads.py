@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...uploads import process_pending
+
+
+class Command(BaseCommand):
+    """
+    Stores pending article images from the spool directory. The web
+    process does this in the background after each upload; the command
+    picks up what a restarted process left behind, or runs the pipeline
+    on its own when ARTICLE_IMAGE_WORKER is off.
+    """
+    help = 'Uploads spooled article images to the image storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Process the images that are due and exit')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to sleep between polls')
+        parser.add_argument(
+            '--batch-size', type=int, default=10,
+            help='Number of images claimed per transaction')
+
+    def handle(self, *args, **options):
+        while True:
+            attempted = process_pending(batch_size=options['batch_size'])
+            if attempted or options['once']:
+                self.stdout.write(
+                    'Attempted {} image uploads'.format(attempted))
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import Article, TagCount
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the denormalized engagement counters on articles to repair
+    any drift from the likes, favourites, rates and comments tables.
+    Articles are processed in primary key order, one chunk per transaction.
+    The article counts of tags are recomputed too.
+    """
+    help = ('Recomputes article like, favourite, rating and comment '
+            'counters and tag article counts')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Number of articles reconciled per transaction')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_pk = 0
+        reconciled = 0
+
+        while True:
+            chunk = list(Article.objects.filter(pk__gt=last_pk).order_by(
+                'pk').values_list('pk', flat=True)[:chunk_size])
+            if not chunk:
+                break
+
+            with transaction.atomic():
+                reconciled += Article.objects.filter(
+                    pk__in=chunk).reconcile_counters()
+            last_pk = chunk[-1]
+
+        self.stdout.write(
+            'Reconciled counters on {} articles'.format(reconciled))
+        self.stdout.write('Reconciled article counts of {} tags'.format(
+            TagCount.objects.reconcile()))
@@ -1,21 +1,320 @@
+from collections import OrderedDict
+from datetime import timedelta
 from functools import reduce
 import operator
+import re
+import uuid
 
-from django.contrib.postgres.search import SearchVector, SearchQuery, SearchVectorField
-from django.db import models
+import readtime
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import (
+    BooleanField, Count, Exists, F, FloatField, IntegerField, Max, OuterRef,
+    Q, Subquery, Sum, TextField, Value)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce, Concat, Substr
+from django.db.models.query import ModelIterable, prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.text import slugify
 from rest_framework import status
 from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 from cloudinary.models import CloudinaryField
 from taggit.managers import TaggableManager
+from taggit.models import Tag
 
 from authors.apps.authentication.models import User
 from ..profiles.models import UserProfile
 
 
+# what word_count counts as a word
+WORD = re.compile(r'\w+')
+
+# first key of the advisory locks taken while allocating article slugs
+SLUG_LOCK_NAMESPACE = 7316
+
+# slugs of the routes next to /api/articles/<slug>, never given to articles
+RESERVED_SLUGS = frozenset(['feed', 'trending'])
+
+# likers and dislikers embedded in an article, the rest are paginated
+# from /api/articles/<slug>/likes and /dislikes
+LIKERS_PREVIEW_SIZE = 5
+
+
+def load_tag_names(articles):
+    """
+    Replaces `tag_list` on each article with a list of its tag names,
+    fetched for the whole batch in one query over taggit's through table.
+    :param articles: a list of Article instances
+    :return: the same list
+    """
+    if not articles:
+        return articles
+
+    through = Article._meta.get_field('tag_list').through
+    rows = through.objects.filter(
+        content_type=ContentType.objects.get_for_model(Article),
+        object_id__in=[article.pk for article in articles]
+    ).order_by('id').values_list('object_id', 'tag__name')
+
+    names = {}
+    for object_id, name in rows:
+        names.setdefault(object_id, []).append(name)
+
+    for article in articles:
+        article.tag_list = names.get(article.pk, [])
+    return articles
+
+
+def load_likers(articles):
+    """
+    Sets `prefetched_likes` and `prefetched_dislikes` on each article to
+    its latest likes and dislikes, see ArticleLikesQuerySet.preview,
+    fetched for the whole batch in one query.
+    :param articles: a list of Article instances
+    :return: the same list
+    """
+    if not articles:
+        return articles
+
+    likes, dislikes = {}, {}
+    for reaction in ArticleLikes.objects.preview(
+            [article.slug for article in articles]):
+        reactions = likes if reaction.likes == 1 else dislikes
+        reactions.setdefault(reaction.article_id, []).append(reaction)
+
+    for article in articles:
+        article.prefetched_likes = likes.get(article.slug, [])
+        article.prefetched_dislikes = dislikes.get(article.slug, [])
+    return articles
+
+
+def create_tags(tag_model, names):
+    """
+    Creates tags named `names` in one INSERT. If a slug clashes or another
+    request created one of them first, falls back to taggit's one by one
+    path, which resolves both.
+    :return: the tags keyed by name
+    """
+    if not names:
+        return {}
+    try:
+        with transaction.atomic():
+            tags = tag_model.objects.bulk_create([
+                tag_model(name=name, slug=tag_model().slugify(name))
+                for name in names])
+    except IntegrityError:
+        tags = []
+        for name in names:
+            try:
+                tags.append(tag_model.objects.get(name=name))
+            except tag_model.DoesNotExist:
+                tags.append(tag_model.objects.create(name=name))
+    return {tag.name: tag for tag in tags}
+
+
+class ArticleQuerySet(models.QuerySet):
+    """
+    Queryset helpers shared by the article list and detail endpoints
+    """
+    _load_tags = False
+    _load_likers = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._load_tags = self._load_tags
+        clone._load_likers = self._load_likers
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super()._fetch_all()
+        if fetched or not issubclass(self._iterable_class, ModelIterable):
+            return
+        if self._load_tags:
+            load_tag_names(self._result_cache)
+        if self._load_likers:
+            load_likers(self._result_cache)
+
+    def with_tags(self):
+        """
+        Loads the tag names of all fetched articles in one query and sets
+        them as a plain list on `tag_list`, like prefetch_related does for
+        ordinary relations.
+        :return: a queryset
+        """
+        clone = self._chain()
+        clone._load_tags = True
+        return clone
+
+    def stream(self, chunk_size=200):
+        """
+        Iterates over the articles through a server-side cursor, so only
+        `chunk_size` of them are held in memory at a time. Prefetches and
+        with_tags() are run once per chunk, which iterator() alone skips.
+        :param chunk_size: the number of articles fetched per round trip
+        :return: a generator of articles
+        """
+        lookups = self._prefetch_related_lookups
+        chunk = []
+        for article in self.iterator(chunk_size=chunk_size):
+            chunk.append(article)
+            if len(chunk) == chunk_size:
+                yield from self._prepare_chunk(chunk, lookups)
+                chunk = []
+        yield from self._prepare_chunk(chunk, lookups)
+
+    def _prepare_chunk(self, chunk, lookups):
+        if chunk and lookups:
+            prefetch_related_objects(chunk, *lookups)
+        if self._load_tags:
+            load_tag_names(chunk)
+        if self._load_likers:
+            load_likers(chunk)
+        return chunk
+
+    def lock_slug(self, base):
+        """
+        Waits for other transactions allocating a slug from `base` to end.
+        Call it in a transaction; the lock is released when it ends.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s, hashtext(%s))',
+                           [SLUG_LOCK_NAMESPACE, base])
+
+    def next_free_slug(self, base):
+        """
+        Returns `base` if no article uses it, or else `base` with the suffix
+        after the highest numbered `base-<n>` in use, in one query. The
+        RESERVED_SLUGS always count as used.
+        :param base: the slug made from the title
+        :return: a slug no article had when the query ran
+        """
+        numbered = Q(slug__regex=r'^{}-[0-9]{{1,9}}$'.format(re.escape(base)))
+        taken = self.filter(Q(slug=base) | numbered).aggregate(
+            exact=Count('pk', filter=Q(slug=base)),
+            highest=Max(Cast(Concat(
+                Value('0'), Substr('slug', len(base) + 2)), IntegerField()),
+                filter=numbered))
+        if not taken['exact'] and base not in RESERVED_SLUGS:
+            return base
+        return '{}-{}'.format(base, (taken['highest'] or 0) + 1)
+
+    def with_engagement(self, viewer=None, likers=True):
+        """
+        Annotates whether `viewer` favourited each article and loads the
+        latest likers of all fetched articles in one query, see
+        load_likers, so ArticleSerializer needs no per-article queries.
+        Counts and the rating average are read from the counter columns.
+        :param viewer: the requesting user, may be anonymous or None
+        :param likers: False when the response leaves out likes/dislikes
+        :return: an annotated queryset
+        """
+        queryset = self.select_related('author__profile')
+        if likers:
+            queryset = queryset._chain()
+            queryset._load_likers = True
+
+        if viewer is not None and viewer.is_authenticated:
+            return queryset.annotate(is_favourited=Exists(
+                ArticleFavourite.objects.filter(
+                    article=OuterRef('pk'), user=viewer)))
+        return queryset.annotate(
+            is_favourited=Value(False, output_field=BooleanField()))
+
+    def reconcile_counters(self):
+        """
+        Recomputes the engagement counters of every article in the
+        queryset from the likes, favourites, rates and comments tables.
+        Articles whose counters drifted also get their version bumped, so
+        cached responses and ETags show the repaired counts.
+        :return: the number of articles whose counters drifted
+        """
+        def total(queryset, aggregate, output_field=IntegerField()):
+            return Coalesce(Subquery(
+                queryset.order_by().values('article').annotate(
+                    total=aggregate).values('total'),
+                output_field=output_field), 0)
+
+        likes = ArticleLikes.objects.filter(article=OuterRef('slug'))
+        rates = Rate.objects.filter(article=OuterRef('pk'))
+        counters = {
+            'likes_count': total(likes.filter(likes=1), Count('id')),
+            'dislikes_count': total(likes.filter(dislikes=-1), Count('id')),
+            'favourites_count': total(ArticleFavourite.objects.filter(
+                article=OuterRef('pk')), Count('id')),
+            'comments_count': total(ArticleComment.objects.filter(
+                article=OuterRef('slug'), is_active=True), Count('id')),
+            'rating_sum': total(rates, Sum('your_rating'), FloatField()),
+            'rating_count': total(rates, Count('id')),
+        }
+
+        drifted = self.annotate(**{
+            'actual_' + field: counter
+            for field, counter in counters.items()}).exclude(**{
+                field: F('actual_' + field) for field in counters})
+        return Article.objects.filter(pk__in=drifted.values('pk')).update(
+            version=F('version') + 1, last_activity_at=timezone.now(),
+            **counters)
+
+    def update_search_vectors(self):
+        """
+        Recomputes the stored search vector of every article in the
+        queryset in one UPDATE: the title weighted A, the description and
+        tag names B and the body C. The search backend reindexes them and
+        cached search results are dropped.
+        :return: the number of articles updated
+        """
+        through = Article._meta.get_field('tag_list').through
+        tags = through.objects.filter(
+            content_type=ContentType.objects.get_for_model(Article),
+            object_id=OuterRef('pk')).order_by().values('object_id').annotate(
+                names=StringAgg('tag__name', ' ')).values('names')
+
+        updated = self.update(search_vector=(
+            SearchVector('title', weight='A') +
+            SearchVector('description', weight='B') +
+            SearchVector(Coalesce(Subquery(tags, output_field=TextField()),
+                                  Value('')), weight='B') +
+            SearchVector('body', weight='C')))
+        from .search import get_search_backend  # search imports models
+        get_search_backend().index(self)
+        CacheGeneration.objects.bump(SEARCH_GENERATION)
+        return updated
+
+    def showing(self, user_ids):
+        """
+        Narrows the queryset to the articles that embed any of the users'
+        profiles: as their author, a commenter or a liker
+        :param user_ids: primary keys of users, which their profiles share
+        """
+        user_ids = list(user_ids)
+        return self.filter(
+            Q(author_id__in=user_ids) |
+            Q(slug__in=ArticleComment.objects.filter(
+                author_id__in=user_ids).values('article_id')) |
+            Q(slug__in=ArticleLikes.objects.filter(
+                user_id__in=user_ids).values('article_id')))
+
+    def touch(self):
+        """
+        Bumps the version and last activity of every article in the
+        queryset, for changes to what they embed rather than to their rows
+        :return: the slugs of the articles touched
+        """
+        slugs = list(self.values_list('slug', flat=True))
+        if slugs:
+            Article.objects.filter(slug__in=slugs).update(
+                version=F('version') + 1, last_activity_at=timezone.now())
+        return slugs
+
+
 # Create your models here.
 class Article(models.Model):
     title = models.CharField(max_length=225)
@@ -27,49 +326,238 @@ class Article(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(
         User, related_name="articles", on_delete=models.CASCADE)
+    # kept in step by save() and set_tags(), see update_search_vectors
     search_vector = SearchVectorField(null=True)
 
+    # engagement counters, kept in step by update_counters and repaired
+    # by the reconcile_counters management command
+    likes_count = models.IntegerField(default=0)
+    dislikes_count = models.IntegerField(default=0)
+    favourites_count = models.IntegerField(default=0)
+    comments_count = models.IntegerField(default=0)
+    rating_sum = models.FloatField(default=0)
+    rating_count = models.IntegerField(default=0)
+
+    # bumped on every edit and engagement change, used to answer
+    # conditional GETs without serializing the article
+    version = models.IntegerField(default=0)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+
+    # reading figures, recomputed in save() whenever the body changes
+    word_count = models.IntegerField(default=0)
+    read_time_minutes = models.IntegerField(default=1)
+
+    # saves retried when concurrent saves take the slug first
+    SLUG_ATTEMPTS = 10
+
+    # fields the stored search vector is computed from, with the tags
+    SEARCHED_FIELDS = frozenset(('title', 'description', 'body'))
+
+    # fields only ever written through update_counters
+    COUNTER_FIELDS = (
+        'likes_count', 'dislikes_count', 'favourites_count',
+        'comments_count', 'rating_sum', 'rating_count',
+        'version', 'last_activity_at')
+
+    objects = ArticleQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['author', 'created_at', 'id']),
+            models.Index(fields=['updated_at']),
+            GinIndex(fields=['search_vector']),
+        ]
+
     def __str__(self):
         return self.title
 
     def get_absolute_url(self):
         return reverse("articles:articles", kwargs={"slug": self.slug})
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'body' in field_names:
+            instance._loaded_body = values[field_names.index('body')]
+        return instance
+
+    def body_changed(self):
+        """
+        Returns True if `body` differs from the value loaded from the database
+        """
+        if self._state.adding or not hasattr(self, '_loaded_body'):
+            return 'body' not in self.get_deferred_fields()
+        return self.body != self._loaded_body
+
+    def measure_body(self):
+        """
+        Stores the word count and read time of `body`
+        """
+        self.word_count = len(WORD.findall(self.body))
+        self.read_time_minutes = readtime.of_text(self.body).minutes
+
     def save(self, *args, **kwargs):
+        if self.body_changed():
+            self.measure_body()
         if not self.slug:
-            """
-            creating slug
-            """
-            a_slug = slugify(self.title)
-            origin = 1
-            unique_slug = a_slug
-            while Article.objects.filter(slug=unique_slug).exists():
-                unique_slug = '{}-{}'.format(a_slug, origin)
-                origin += 1
-            self.slug = unique_slug
+            self.save_with_free_slug(*args, **kwargs)
+            return
+        updating = not self._state.adding
+        if updating and 'update_fields' not in kwargs:
+            # never write back counters that may be stale in memory
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS]
         super().save(*args, **kwargs)
+        if self.SEARCHED_FIELDS.intersection(
+                kwargs.get('update_fields') or self.SEARCHED_FIELDS):
+            Article.objects.filter(pk=self.pk).update_search_vectors()
+        if updating:
+            Article.update_counters(self.slug)
+        if 'body' not in self.get_deferred_fields():
+            self._loaded_body = self.body
+
+    def save_with_free_slug(self, *args, **kwargs):
+        """
+        Saves a new article under the next free slug for its title.
+        Saves of the same title take turns on a transaction-level advisory
+        lock, so they do not pick the same slug. A slug taken some other way
+        in the meantime makes the unique index reject the insert, and the
+        next free slug is tried instead. Titles without a letter or digit
+        slugify can keep, e.g. "???", are numbered from 'article'.
+        """
+        base = slugify(self.title) or 'article'
+        for attempt in range(self.SLUG_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    Article.objects.lock_slug(base)
+                    self.slug = Article.objects.next_free_slug(base)
+                    self.save(*args, **kwargs)
+                return
+            except IntegrityError:
+                taken = Article.objects.filter(slug=self.slug).exists()
+                if not taken or attempt == self.SLUG_ATTEMPTS - 1:
+                    self.slug = ''
+                    raise
+
+    def set_tags(self, names):
+        """
+        Makes `names` the tags of this saved article, writing only what
+        changed: existing tags are looked up and missing ones created in
+        bulk, then only the removed and added links are written and the
+        tags' article counts adjusted, and the article's version bumped.
+        Costs the same few queries however many tags change.
+        :param names: the tag names, in order
+        """
+        names = list(OrderedDict.fromkeys(names))
+        through = self._meta.get_field('tag_list').through
+        tag_model = through.tag_model()
+        links = through.objects.filter(
+            content_type=ContentType.objects.get_for_model(Article),
+            object_id=self.pk)
+
+        with transaction.atomic():
+            current = {name: (pk, tag_id) for name, pk, tag_id in
+                       links.values_list('tag__name', 'id', 'tag_id')}
+            wanted = set(names)
+            removed = [link for name, link in current.items()
+                       if name not in wanted]
+            added = [name for name in names if name not in current]
+            if removed:
+                through.objects.filter(
+                    pk__in=[pk for pk, _ in removed]).delete()
+                TagCount.objects.adjust(
+                    [tag_id for _, tag_id in removed], -1)
+            if added:
+                tags = tag_model.objects.in_bulk(added, field_name='name')
+                missing = [name for name in added if name not in tags]
+                tags.update(create_tags(tag_model, missing))
+                through.objects.bulk_create([
+                    through(content_object=self, tag=tags[name])
+                    for name in added])
+                TagCount.objects.adjust(
+                    [tags[name].pk for name in added], 1)
+            if removed or added:
+                Article.objects.filter(pk=self.pk).update_search_vectors()
+                Article.update_counters(self.slug)
+
+        self.tag_list = names
+
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return 0
+        return self.rating_sum / self.rating_count
+
+    @staticmethod
+    def update_counters(slug, **deltas):
+        """
+        Adds `deltas` to the engagement counters of an article and bumps
+        its version in a single UPDATE, so concurrent writers do not lose
+        increments. Call it inside the transaction that changes the counted
+        rows, or with no deltas when anything else shown with the article
+        changes.
+        :param slug: the article's unique slug
+        :param deltas: counter field names mapped to the amount to add
+        """
+        Article.objects.filter(slug=slug).update(
+            version=F('version') + 1, last_activity_at=timezone.now(),
+            **{field: F(field) + delta for field, delta in deltas.items()})
 
     def search_articles(self, args):
         """ This method is used to search for articles.
-        Given a list of arguments, it performs a full text search query.
+        Given a list of arguments, it performs a full text search query
+        on the configured search backend.
         :params *args: list of arguments to query against
         :returns: a queryset
         """
-        query_args = []
+        from .search import get_search_backend  # search imports models
+        return get_search_backend().match(Article.objects.all(), args)
 
-        for val in args:
-            query_args.append(SearchQuery(val))
 
-        search_vector = SearchVector('title', 'body', 'slug',
-                                     'author__username', 'tag_list__name')
+class ArticleImageQuerySet(models.QuerySet):
 
-        query = Article.objects.annotate(search=search_vector).filter(
-            search=reduce(operator.and_, query_args, SearchQuery('')))
+    def claim(self, limit, lease):
+        """
+        Leases up to `limit` pending images that are due for an upload
+        attempt, skipping any another worker is claiming. Each is made due
+        again only `lease` seconds later, in a transaction that commits
+        before returning, so no lock is held during the upload and an
+        image whose worker died is retried once its lease runs out.
+        :return: a list of images
+        """
+        with transaction.atomic():
+            images = list(self.select_for_update(skip_locked=True).filter(
+                status=ArticleImage.PENDING,
+                available_at__lte=timezone.now()).order_by(
+                    'available_at')[:limit])
+            self.filter(pk__in=[image.pk for image in images]).update(
+                available_at=timezone.now() + timedelta(seconds=lease))
+        return images
 
-        return query
+    def next_due(self):
+        """
+        Returns when the next pending image is due, or None if there is none
+        """
+        return self.filter(status=ArticleImage.PENDING).aggregate(
+            due=models.Min('available_at'))['due']
 
 
 class ArticleImage(models.Model):
+    PENDING = 'pending'
+    READY = 'ready'
+    FAILED = 'failed'
+    STATUSES = ((PENDING, 'pending'), (READY, 'ready'), (FAILED, 'failed'))
+
+    # uploads given up after this many failed attempts
+    MAX_ATTEMPTS = 5
+    # seconds before the first retry, doubled after each further failure
+    RETRY_DELAY = 30
+    # seconds an upload attempt may take before another worker retries it
+    UPLOAD_LEASE = 10 * 60
+
     article = models.ForeignKey(
         Article,
         related_name='article_images',
@@ -81,8 +569,44 @@ class ArticleImage(models.Model):
         auto_now=True, verbose_name='When was this image saved')
     description = models.CharField(db_index=True, max_length=255)
 
+    # uploads are spooled to local disk and stored by a background worker
+    status = models.CharField(max_length=10, choices=STATUSES, default=READY)
+    spool_path = models.CharField(max_length=255, blank=True)
+    attempts = models.IntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    objects = ArticleImageQuerySet.as_manager()
+
     class Meta:
         ordering = ('created',)
+        indexes = [models.Index(fields=['status', 'available_at'])]
+
+    def mark_ready(self, image):
+        """
+        Records the stored image and forgets the spooled file
+        :param image: the value the storage backend returned
+        """
+        self.image = image
+        self.status = self.READY
+        self.spool_path = ''
+        self.last_error = ''
+        self.save()
+
+    def mark_failed(self, error):
+        """
+        Records a failed upload attempt and schedules a retry with an
+        exponential backoff, or gives up after MAX_ATTEMPTS
+        :param error: the exception the attempt raised
+        """
+        self.attempts += 1
+        self.last_error = repr(error)
+        if self.attempts >= self.MAX_ATTEMPTS:
+            self.status = self.FAILED
+        else:
+            self.available_at = timezone.now() + timedelta(
+                seconds=self.RETRY_DELAY * 2 ** (self.attempts - 1))
+        self.save()
 
 
 class Rate(models.Model):
@@ -101,6 +625,48 @@ class Rate(models.Model):
     )
 
     your_rating = models.FloatField(null=False)
+    created = models.DateTimeField(default=timezone.now, db_index=True)
+
+
+class ArticleLikesQuerySet(models.QuerySet):
+
+    def newest_first(self):
+        return self.order_by('-created', '-id')
+
+    def preview(self, slugs):
+        """
+        Returns the latest LIKERS_PREVIEW_SIZE likes and the latest
+        LIKERS_PREVIEW_SIZE dislikes of each article. A lateral join reads
+        them for each article newest first off the (article, created, id)
+        index, so the cost stays bounded on popular articles.
+        :param slugs: the slugs of the articles
+        :return: a queryset of reactions with their users loaded, newest
+                 first
+        """
+        quote = connection.ops.quote_name
+
+        def column(name):
+            return quote(ArticleLikes._meta.get_field(name).column)
+
+        def latest(condition):
+            return (
+                '(SELECT {id} FROM {table} WHERE {article} = articles.slug '
+                'AND {condition} ORDER BY {created} DESC, {id} DESC '
+                'LIMIT %s)').format(
+                    id=column('id'), table=quote(ArticleLikes._meta.db_table),
+                    article=column('article'), created=column('created'),
+                    condition=condition)
+
+        reactions = RawSQL(
+            'SELECT reactions.{id} FROM unnest(%s) AS articles(slug) '
+            'CROSS JOIN LATERAL ({likes} UNION ALL {dislikes}) AS '
+            'reactions'.format(
+                id=column('id'),
+                likes=latest('{} = 1'.format(column('likes'))),
+                dislikes=latest('{} = -1'.format(column('dislikes')))),
+            (list(slugs), LIKERS_PREVIEW_SIZE, LIKERS_PREVIEW_SIZE))
+        return self.filter(pk__in=reactions).select_related(
+            'user__profile').newest_first()
 
 
 class ArticleLikes(models.Model):
@@ -117,8 +683,14 @@ class ArticleLikes(models.Model):
     dislikes = models.IntegerField(null=True)
     created = models.DateTimeField(auto_now=True)
 
+    objects = ArticleLikesQuerySet.as_manager()
+
     class Meta:
         ordering = ('created',)
+        indexes = [
+            models.Index(fields=['article', 'created', 'id']),
+            models.Index(fields=['created']),
+        ]
 
     @staticmethod
     def get_article(slug):
@@ -126,7 +698,9 @@ class ArticleLikes(models.Model):
         :param slug: The Article's unique slug
         :return: returns a serialized Article
         """
-        article = get_object_or_404(Article, slug=slug)
+        article = get_object_or_404(
+            Article.objects.select_related('author__profile').with_tags(),
+            slug=slug)
         return article
 
     @staticmethod
@@ -141,33 +715,40 @@ class ArticleLikes(models.Model):
         try:
             likes = ArticleLikes.objects.filter(user=user, article=slug)
             article = ArticleLikes.get_article(slug=slug)
-            article.tag_list = list(article.tag_list.names())
         except:
             APIException.status_code = status.HTTP_404_NOT_FOUND
             raise APIException(
                 {'article': {
                     'message': 'Article requested does not exist'
                 }})
-        if not likes:
-            if value == 1:
-                ArticleLikes.objects.create(
-                    user=user, article=article, likes=value)
-                return Response(
-                    {'message': 'Successfully liked: {} article'.format(slug),
-                     'article': ArticleSerializer(article).data},
-                    status=status.HTTP_201_CREATED)
-            ArticleLikes.objects.create(
-                user=user, article=article, dislikes=value)
-            return Response(
-                {'message': 'Successfully disliked: {} article'.format(slug),
-                 'article': ArticleSerializer(article).data},
-                status=status.HTTP_201_CREATED)
-        likes.delete()
-        return Response({
-            'message':
-                'Successfully undid (dis)like on {} article'.format(slug),
-            'article': ArticleSerializer(article).data
-        }, status=status.HTTP_202_ACCEPTED)
+        with transaction.atomic():
+            if not likes:
+                if value == 1:
+                    ArticleLikes.objects.create(
+                        user=user, article=article, likes=value)
+                    Article.update_counters(slug, likes_count=1)
+                    message = 'Successfully liked: {} article'
+                else:
+                    ArticleLikes.objects.create(
+                        user=user, article=article, dislikes=value)
+                    Article.update_counters(slug, dislikes_count=1)
+                    message = 'Successfully disliked: {} article'
+                response_status = status.HTTP_201_CREATED
+            else:
+                Article.update_counters(
+                    slug,
+                    likes_count=-len([l for l in likes if l.likes == 1]),
+                    dislikes_count=-len(
+                        [l for l in likes if l.dislikes == -1]))
+                likes.delete()
+                message = 'Successfully undid (dis)like on {} article'
+                response_status = status.HTTP_202_ACCEPTED
+
+        article.refresh_from_db(fields=Article.COUNTER_FIELDS)
+        return Response(
+            {'message': message.format(slug),
+             'article': ArticleSerializer(article).data},
+            status=response_status)
 
 
 class ArticleComment(models.Model):
@@ -188,6 +769,7 @@ class ArticleComment(models.Model):
 
     class Meta:
         ordering = ('createdAt',)
+        indexes = [models.Index(fields=['createdAt'])]
 
     def __str__(self):
         return self.body[:20]
@@ -274,6 +856,7 @@ class ArticleFavourite(models.Model):
         on_delete=models.CASCADE
     )
     favourited = models.BooleanField(default=False)
+    created = models.DateTimeField(default=timezone.now, db_index=True)
 
 
 class ArticleBookmark(models.Model):
@@ -333,3 +916,283 @@ class ReportArticle(models.Model):
         on_delete=models.CASCADE
     )
 
+
+
+# followers given a new article per INSERT when it is fanned out
+FEED_BATCH_SIZE = 500
+# most recent articles of an author added to a feed on follow
+FEED_BACKFILL_SIZE = 200
+
+
+class FeedEntryQuerySet(models.QuerySet):
+    """
+    Writes the per-reader timelines the feed endpoint reads. Articles are
+    copied into the feed of every follower when they are published, so a
+    feed page is a range scan of the reader's own entries.
+    """
+
+    def add(self, entries):
+        """
+        Inserts feed entries in one INSERT. If a concurrent follow or
+        publish added one of them first, falls back to adding them one by
+        one, skipping those that exist.
+        :param entries: unsaved FeedEntry instances
+        """
+        if not entries:
+            return
+        try:
+            with transaction.atomic():
+                self.bulk_create(entries)
+        except IntegrityError:
+            for entry in entries:
+                self.get_or_create(
+                    user_id=entry.user_id, article_id=entry.article_id,
+                    defaults={'author_id': entry.author_id,
+                              'created_at': entry.created_at})
+
+    def fan_out(self, article, batch_size=FEED_BATCH_SIZE):
+        """
+        Adds a new article to the feed of every follower of its author,
+        `batch_size` followers at a time
+        :param article: the article just published
+        """
+        follows = UserProfile.following.through.objects.filter(
+            to_userprofile_id=article.author_id)
+        last_follower = 0
+        while True:
+            followers = list(follows.filter(
+                from_userprofile_id__gt=last_follower).order_by(
+                    'from_userprofile_id').values_list(
+                        'from_userprofile_id', flat=True)[:batch_size])
+            if not followers:
+                return
+            self.add([
+                FeedEntry(user_id=follower, article_id=article.pk,
+                          author_id=article.author_id,
+                          created_at=article.created_at)
+                for follower in followers])
+            last_follower = followers[-1]
+
+    def backfill(self, follows):
+        """
+        Adds the most recent articles of newly followed authors to their
+        readers' feeds
+        :param follows: (reader id, author id) pairs
+        """
+        for reader_id, author_id in follows:
+            articles = Article.objects.filter(author_id=author_id).exclude(
+                pk__in=self.filter(user_id=reader_id, author_id=author_id)
+                .values('article_id')).order_by(
+                    '-created_at', '-id').values_list(
+                        'pk', 'created_at')[:FEED_BACKFILL_SIZE]
+            self.add([
+                FeedEntry(user_id=reader_id, article_id=pk,
+                          author_id=author_id, created_at=created_at)
+                for pk, created_at in articles])
+
+    def prune(self, follows):
+        """
+        Removes unfollowed authors' articles from their readers' feeds
+        :param follows: (reader id, author id) pairs
+        """
+        follows = list(follows)
+        if follows:
+            self.filter(reduce(operator.or_, (
+                Q(user_id=reader_id, author_id=author_id)
+                for reader_id, author_id in follows))).delete()
+
+
+class FeedEntry(models.Model):
+    """An article in the feed of a reader who follows its author"""
+    user = models.ForeignKey(
+        User, related_name='feed_entries', on_delete=models.CASCADE)
+    article = models.ForeignKey(
+        Article, related_name='feed_entries', on_delete=models.CASCADE)
+    # copied from the article so feeds are pruned and paged on their own
+    author = models.ForeignKey(
+        User, related_name='+', on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('user', 'article')
+        indexes = [models.Index(fields=['user', 'created_at', 'id'])]
+
+
+class ArticleView(models.Model):
+    """
+    The reads of an article written in one flush, counted towards its
+    trending score
+    """
+    article = models.ForeignKey(
+        Article,
+        to_field='slug',
+        db_column='article',
+        on_delete=models.CASCADE,
+        related_name='views')
+    created = models.DateTimeField(default=timezone.now, db_index=True)
+    count = models.PositiveIntegerField(default=1)
+
+
+def decay_factor(column, now, half_life):
+    """
+    SQL for how much engagement at `column` is worth at `now`, halving
+    every `half_life` seconds
+    :param column: the quoted, qualified timestamp column
+    """
+    return RawSQL(
+        'power(2.0, extract(epoch from ({} - %s)) / %s)'.format(column),
+        (now, half_life), output_field=models.FloatField())
+
+
+class TrendingScoreQuerySet(models.QuerySet):
+
+    def at(self, now, half_life):
+        """
+        Annotates each score as decayed to `now`
+        """
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        return self.annotate(current=F('score') * decay_factor(
+            table + '.' + connection.ops.quote_name('scored_at'),
+            now, half_life))
+
+
+class TrendingScore(models.Model):
+    """
+    The time-decayed engagement of an article as of `scored_at`. Scores
+    are only rewritten for articles with new engagement; the rest are
+    decayed when they are ranked.
+    """
+    article = models.OneToOneField(
+        Article, primary_key=True, related_name='trending_score',
+        on_delete=models.CASCADE)
+    score = models.FloatField()
+    scored_at = models.DateTimeField()
+
+    objects = TrendingScoreQuerySet.as_manager()
+
+    def decayed(self, now, half_life):
+        return self.score * 2 ** (
+            (self.scored_at - now).total_seconds() / half_life)
+
+
+class TrendingArticle(models.Model):
+    """
+    The top articles by trending score, swapped as a whole by each run
+    of the compute_trending command
+    """
+    rank = models.IntegerField(primary_key=True)
+    article = models.ForeignKey(
+        Article, related_name='+', on_delete=models.CASCADE)
+    score = models.FloatField()
+
+
+class TrendingRun(models.Model):
+    """The engagement counted so far: everything up to `until`"""
+    until = models.DateTimeField()
+
+
+# the cache generations of the tag directory and of search results
+TAGS_GENERATION = 'tags'
+SEARCH_GENERATION = 'search'
+
+
+class CacheGenerationQuerySet(models.QuerySet):
+
+    def current(self, name):
+        """
+        :param name: the name of the cached data, e.g. TAGS_GENERATION
+        :return: the token its cached copies are keyed by, None if it
+                 never changed
+        """
+        return self.filter(name=name).values_list('token', flat=True).first()
+
+    def bump(self, name):
+        """
+        Moves `name` to a new token. Call it in the transaction that
+        changes the data, so every process stops reading the old copies
+        the moment it commits.
+        :param name: the name of the cached data
+        """
+        token = uuid.uuid4().hex
+        if self.filter(name=name).update(token=token):
+            return
+        try:
+            with transaction.atomic():
+                self.create(name=name, token=token)
+        except IntegrityError:
+            self.filter(name=name).update(token=token)
+
+
+class CacheGeneration(models.Model):
+    """
+    The generation token of data cached by every process, kept in the
+    database rather than the cache so a change committed by one worker is
+    seen by all of them. A random token rather than a counter is used so
+    a rolled back change can never come back and revive copies cached
+    under it.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    token = models.CharField(max_length=32)
+
+    objects = CacheGenerationQuerySet.as_manager()
+
+
+class TagCountQuerySet(models.QuerySet):
+
+    def adjust(self, tag_ids, delta):
+        """
+        Adds `delta` to the article counts of tags, creating the counts of
+        tags used for the first time. Call it in the transaction that adds
+        or removes the tags.
+        :param tag_ids: the primary keys of the tags
+        :param delta: 1 when the tags were added to an article, -1 when
+                      they were removed
+        """
+        tag_ids = list(tag_ids)
+        if not tag_ids:
+            return
+        if delta > 0:
+            missing = set(tag_ids) - set(self.filter(
+                tag_id__in=tag_ids).values_list('tag_id', flat=True))
+            try:
+                with transaction.atomic():
+                    self.bulk_create([TagCount(tag_id=pk) for pk in missing])
+            except IntegrityError:
+                for pk in missing:
+                    self.get_or_create(tag_id=pk)
+        self.filter(tag_id__in=tag_ids).update(articles=F('articles') + delta)
+        CacheGeneration.objects.bump(TAGS_GENERATION)
+
+    def reconcile(self):
+        """
+        Recomputes the article count of every tag from taggit's through
+        table
+        :return: the number of tags counted
+        """
+        through = Article._meta.get_field('tag_list').through
+        counts = list(through.objects.filter(
+            content_type=ContentType.objects.get_for_model(Article)).values(
+                'tag_id').annotate(articles=Count('id')).order_by())
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create([TagCount(**count) for count in counts])
+            CacheGeneration.objects.bump(TAGS_GENERATION)
+        return len(counts)
+
+
+class TagCount(models.Model):
+    """
+    The number of articles using a tag, kept in step by Article.set_tags
+    so the tag directory never has to group taggit's through table
+    """
+    tag = models.OneToOneField(
+        Tag, primary_key=True, related_name='article_count',
+        on_delete=models.CASCADE)
+    articles = models.IntegerField(default=0)
+
+    objects = TagCountQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=['articles'])]
@@ -0,0 +1,236 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import get_count, set_count
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates a queryset on an indexed (timestamp, id) pair instead of an
+    OFFSET, so fetching page N costs the same as fetching page 1.
+    The cursors handed to clients are opaque base64 strings.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'limit'
+    cursor_query_param = 'cursor'
+    timestamp_field = 'created_at'
+    results_key = 'results'
+    count_key = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+    # a known row count, e.g. from a counter column, saves the COUNT query
+    total = None
+    # the key the row count is cached under, see count_key, saves the
+    # COUNT query while it is cached
+    count_cache_key = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns one page of rows, newest first
+        :param queryset: the unpaginated queryset
+        :param request: the request carrying `cursor` and `limit`
+        :return: a list of model instances
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_count(queryset)
+
+        direction, position = self.decode_cursor(request)
+        field = self.timestamp_field
+
+        if direction == 'prev':
+            queryset = queryset.filter(self.after(position)).order_by(
+                field, 'id')
+        else:
+            if position is not None:
+                queryset = queryset.filter(self.before(position))
+            queryset = queryset.order_by('-' + field, '-id')
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if direction == 'prev':
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = rows
+        return rows
+
+    def get_count(self, queryset):
+        """
+        Counts the rows on their own, without ordering or joins on the page,
+        or reads the cached count
+        """
+        if self.total is not None:
+            return self.total
+        if self.count_cache_key is None:
+            return queryset.order_by().count()
+        count = get_count(self.count_cache_key)
+        if count is None:
+            count = queryset.order_by().count()
+            set_count(self.count_cache_key, count)
+        return count
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size < 1:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def before(self, position):
+        timestamp, pk = position
+        field = self.timestamp_field
+        return Q(**{field + '__lt': timestamp}) | Q(
+            **{field: timestamp, 'id__lt': pk})
+
+    def after(self, position):
+        timestamp, pk = position
+        field = self.timestamp_field
+        return Q(**{field + '__gt': timestamp}) | Q(
+            **{field: timestamp, 'id__gt': pk})
+
+    def encode_cursor(self, direction, instance):
+        timestamp = getattr(instance, self.timestamp_field)
+        payload = json.dumps([direction, timestamp.isoformat(), instance.pk])
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8'))
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(
+            url, self.cursor_query_param, cursor.decode('ascii'))
+        return url
+
+    def decode_cursor(self, request):
+        """
+        Turns the `cursor` query param back into (direction, position)
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return 'next', None
+
+        try:
+            payload = base64.urlsafe_b64decode(encoded.encode('ascii'))
+            direction, timestamp, pk = json.loads(payload.decode('utf-8'))
+            timestamp = parse_datetime(timestamp)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if timestamp is None or direction not in ('next', 'prev'):
+            raise NotFound(self.invalid_cursor_message)
+
+        return direction, (timestamp, pk)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor('next', self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor('prev', self.page[0])
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            (self.results_key, data),
+            (self.count_key, self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ]))
+
+
+class ArticleCursorPagination(KeysetPagination):
+    """
+    Cursor pagination for article lists, ordered by (created_at, id)
+    """
+    results_key = 'articles'
+    count_key = 'articlesCount'
+
+
+class LikersCursorPagination(KeysetPagination):
+    """
+    Cursor pagination for the users who liked or disliked an article
+    """
+    timestamp_field = 'created'
+    results_key = 'users'
+    count_key = 'usersCount'
+
+
+class SearchPagination(BasePagination):
+    """
+    Limit/offset pagination for ranked search results. One row more than
+    the page is fetched to tell whether there is a next page, so the
+    matches are never counted.
+    """
+    default_limit = 10
+    max_limit = 50
+    limit_query_param = 'limit'
+    offset_query_param = 'offset'
+    results_key = 'articles'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns one page of rows
+        :param queryset: the ordered, unpaginated queryset
+        :param request: the request carrying `limit` and `offset`
+        :return: a list of rows
+        """
+        self.request = request
+        self.limit = self.get_param(
+            request, self.limit_query_param, self.default_limit, 1)
+        self.limit = min(self.limit, self.max_limit)
+        self.offset = self.get_param(request, self.offset_query_param, 0, 0)
+
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_param(self, request, name, default, minimum):
+        try:
+            value = int(request.query_params[name])
+        except (KeyError, ValueError):
+            return default
+        return max(value, minimum)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit)
+
+    def get_previous_link(self):
+        if not self.offset:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        offset = self.offset - self.limit
+        if offset <= 0:
+            return remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.offset_query_param, offset)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            (self.results_key, data),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ]))
@@ -1,79 +1,125 @@
-import json
-from rest_framework.renderers import JSONRenderer
+from django.http import StreamingHttpResponse
 
+from ..core.renderers import EnvelopeJSONRenderer, encode, encode_object
 
-class ArticleJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
 
-    def render(self, data, media_type=None, renderer_context=None):
-        if data is not None:
+class ArticleJSONRenderer(EnvelopeJSONRenderer):
+    envelope = 'article'
 
-            if isinstance(data, dict):
-                return json.dumps({
-                    'article': data
-                })
-            return json.dumps({
-                'articles': data,
-                'articlesCount': len(data)
-            })
-        return json.dumps({
-            "article": 'No article found.'
-        })
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return self.wrap('No article found.')
+        if isinstance(data, dict):
+            if 'articlesCount' in data:
+                # already enveloped by the paginator
+                return encode(data)
+            return self.wrap(data)
+        return encode_object([
+            ('articles', encode(data)),
+            ('articlesCount', len(data))
+        ])
 
 
-class CommentJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
+class CommentJSONRenderer(EnvelopeJSONRenderer):
+    envelope = 'comment'
 
-    def render(self, data, media_type=None, renderer_context=None):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
         if isinstance(data, dict):
             errors = data.get('errors', None)
             is_active = data.get('is_active', None)
 
             if errors is not None:
-                return super(CommentJSONRenderer, self).render(data)
+                return encode(data)
 
             if is_active is not None:
                 data = self.filter_data(data)
 
-            return json.dumps({
-                'comment': data
-            })
+            return self.wrap(data)
 
         for comment in data:
             comment = self.filter_data(comment)
 
-        return json.dumps({
-            'comments': data,
-            'commentsCount': len(data)
-        })
+        return encode_object([
+            ('comments', encode(data)),
+            ('commentsCount', len(data))
+        ])
 
     def filter_data(self, data):
+        # fields may be missing when the client asked for a subset
         if data['is_active'] == False:
-            del data['like']
-            del data['dislike']
-            del data['total_likes']
-            del data['total_dislikes']
-            del data['is_active']
-            del data['article']
-            del data['author']
-            del data['id']
-            del data['createdAt']
-            del data['updatedAt']
-            del data['body']
+            for key in ('like', 'dislike', 'total_likes', 'total_dislikes',
+                        'is_active', 'article', 'author', 'id', 'createdAt',
+                        'updatedAt', 'body'):
+                data.pop(key, None)
             data['comment'] = "deleted"
         else:
-            del data['is_active']
-            del data['article']
-            data['author'] = {
-                "username": data['author']['username'],
-                "bio": data['author']['bio'],
-                "image": data['author']['avatar'],
-                "following": data['author']['following']
-            }
-
-        if len(data['subcomments']) > 0:
+            data.pop('is_active', None)
+            data.pop('article', None)
+            if 'author' in data:
+                data['author'] = {
+                    "username": data['author']['username'],
+                    "bio": data['author']['bio'],
+                    "image": data['author']['avatar'],
+                    "following": data['author']['following']
+                }
+
+        if len(data.get('subcomments', [])) > 0:
             for comment in data['subcomments']:
                 if type(comment) != int:
                     comment = self.filter_data(comment)
 
         return data
+
+
+class StreamingJSONRenderer(object):
+    """
+    Renders a collection one row at a time into a StreamingHttpResponse,
+    keeping the `{"<results_key>": [...], "<count_key>": n}` envelope.
+    Rows are serialized as they are read, so memory stays flat however
+    many there are.
+    """
+    results_key = 'results'
+    count_key = 'count'
+    # rows rendered into each chunk written to the client
+    chunk_size = 200
+
+    def represent(self, serializer, row):
+        return serializer.to_representation(row)
+
+    def stream(self, rows, serializer):
+        """
+        Yields the JSON document in chunks of encoded bytes
+        :param rows: an iterable of model instances
+        :param serializer: a serializer instance used to represent each row
+        """
+        parts = [b'{', encode(self.results_key), b':[']
+        count = 0
+        for row in rows:
+            if count:
+                parts.append(b',')
+            parts.append(encode(self.represent(serializer, row)))
+            count += 1
+            if count % self.chunk_size == 0:
+                yield b''.join(parts)
+                parts = []
+        parts.extend([b'],', encode(self.count_key), b':',
+                      encode(count), b'}'])
+        yield b''.join(parts)
+
+    def response(self, rows, serializer):
+        return StreamingHttpResponse(
+            self.stream(rows, serializer),
+            content_type='application/json; charset=utf-8')
+
+
+class StreamingArticleJSONRenderer(StreamingJSONRenderer):
+    results_key = 'articles'
+    count_key = 'articlesCount'
+
+
+class StreamingCommentJSONRenderer(StreamingJSONRenderer, CommentJSONRenderer):
+    results_key = 'comments'
+    count_key = 'commentsCount'
+
+    def represent(self, serializer, row):
+        return self.filter_data(serializer.to_representation(row))
@@ -0,0 +1,318 @@
+from collections import defaultdict
+from functools import lru_cache, reduce
+import operator
+import threading
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField, Func, TextField, Value
+from django.db.models.functions import Substr
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+
+from .cache import get_search_results, set_search_results
+from .inverted_index import InvertedIndex, tokenize
+from .models import Article
+
+# ts_headline delimits matches with control characters, which are swapped
+# for <mark> tags once the excerpt is escaped, see mark_excerpt
+START_MATCH = '\x02'
+STOP_MATCH = '\x03'
+HEADLINE_OPTIONS = (
+    'StartSel={}, StopSel={}, MinWords=15, MaxWords=35, '
+    'MaxFragments=2, FragmentDelimiter=" ... "'.format(
+        START_MATCH, STOP_MATCH))
+
+# characters of the body shown when there are no search terms
+EXCERPT_LENGTH = 200
+
+# filters on favourites and bookmarks, which change without saving an
+# article, so their results are never cached
+UNCACHED_FILTERS = ('favorited_by', 'bookmarked_by')
+
+
+class Headline(Func):
+    """
+    An excerpt of a text with the matches of a search query highlighted
+    """
+    function = 'ts_headline'
+    output_field = TextField()
+
+    def __init__(self, expression, query, options=HEADLINE_OPTIONS):
+        super(Headline, self).__init__(expression, query, Value(options))
+
+
+def normalize_terms(terms):
+    """
+    Splits search terms into lowercased words and sorts them, so every
+    spelling of a search shares its cached results. Every word of every
+    term must match, so neither the order of the terms nor of the words
+    in them changes the results.
+    :return: a sorted list of distinct words
+    """
+    return sorted({word for term in terms for word in term.lower().split()})
+
+
+def text_query(terms):
+    """
+    Returns a query matching articles that contain all `terms`, or None
+    if there are no terms
+    :param terms: phrases, each matched as plain text
+    """
+    queries = [SearchQuery(term) for term in terms if term]
+    if not queries:
+        return None
+    return reduce(operator.and_, queries)
+
+
+def rank_articles(queryset, query):
+    """
+    Narrows `queryset` to the articles matching `query` on the stored
+    search vector and orders them by rank, best first. Without a query
+    the articles are ordered newest first.
+    :param query: a SearchQuery, or None
+    :return: a queryset of articles annotated with `rank`
+    """
+    if query is None:
+        return queryset.annotate(
+            rank=Value(0.0, output_field=FloatField())).order_by(
+                '-created_at', '-id')
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query)).order_by(
+            '-rank', '-created_at', '-id')
+
+
+class CachedRanking(object):
+    """
+    The ranked (pk, rank) rows of a search, the first SEARCH_CACHE_DEPTH
+    of which are cached. Slices within them are served from the cache, so
+    repeating a search skips matching the text; slices past them query
+    `rows` again.
+    """
+
+    def __init__(self, rows, key):
+        """
+        :param rows: the ranked queryset of (pk, rank) rows
+        :param key: the key from search_key, or None not to cache
+        """
+        self.rows = rows
+        self.key = key
+        self.cached = None
+
+    def __getitem__(self, index):
+        if self.key is None:
+            return self.rows[index]
+        if self.cached is None:
+            self.cached = get_search_results(self.key)
+        if self.cached is None:
+            # one row past the depth tells whether there are more
+            self.cached = list(self.rows[:settings.SEARCH_CACHE_DEPTH + 1])
+            set_search_results(self.key, self.cached)
+        if len(self.cached) <= settings.SEARCH_CACHE_DEPTH or \
+                index.stop <= len(self.cached):
+            return self.cached[index]
+        return self.rows[index]
+
+
+def mark_excerpt(excerpt):
+    """
+    HTML-escapes an excerpt of an article body, then marks up the matches
+    delimited by START_MATCH and STOP_MATCH with <mark> tags, so the
+    excerpt is safe to render as HTML whatever the body contains
+    """
+    return escape(excerpt).replace(START_MATCH, '<mark>').replace(
+        STOP_MATCH, '</mark>')
+
+
+def search_results(page, excerpt, mark=mark_excerpt):
+    """
+    Loads what a search result shows for one page of ranked articles.
+    Excerpts are only computed for the page, in a second query, since
+    highlighting reads the whole body.
+    :param page: (pk, rank) pairs in rank order
+    :param excerpt: the expression the excerpt is read from
+    :param mark: turns the text read into the escaped, highlighted excerpt
+    :return: a list of result dicts in the order of `page`
+    """
+    details = {
+        row['pk']: row for row in Article.objects.filter(
+            pk__in=[pk for pk, _ in page]).values(
+                'pk', 'slug', 'title', 'description', 'created_at',
+                author_username=F('author__username'), excerpt=excerpt)}
+    return [dict(details[pk], rank=rank, excerpt=mark(details[pk]['excerpt']))
+            for pk, rank in page if pk in details]
+
+
+class SearchBackend(object):
+    """
+    Matches and ranks articles for the search endpoint. Without search
+    terms every backend lists the articles newest first. `index` and
+    `remove` are called as articles change, for backends that keep their
+    own index.
+    """
+
+    def match(self, queryset, terms):
+        """
+        :return: the articles of `queryset` containing all `terms`
+        """
+        raise NotImplementedError
+
+    def rank(self, queryset, terms):
+        """
+        :param terms: normalized search terms, all of which must match
+        :return: sliceable (pk, rank) rows of the matching articles of
+                 `queryset`, best first
+        """
+        return rank_articles(queryset, None).values_list('pk', 'rank')
+
+    def results(self, page, terms):
+        """
+        :param page: (pk, rank) rows returned by `rank`
+        :return: the result dicts of the page, see search_results
+        """
+        return search_results(page, Substr('body', 1, EXCERPT_LENGTH))
+
+    def index(self, queryset):
+        """
+        Called with articles whose text or tags changed
+        """
+
+    def remove(self, pks):
+        """
+        Called with the primary keys of deleted articles
+        """
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Matches the search vector PostgreSQL stores with each article, see
+    ArticleQuerySet.update_search_vectors
+    """
+
+    def match(self, queryset, terms):
+        query = text_query(terms)
+        if query is None:
+            return queryset.none()
+        return queryset.filter(search_vector=query)
+
+    def rank(self, queryset, terms):
+        query = text_query(terms)
+        if query is None:
+            return super(PostgresSearchBackend, self).rank(queryset, terms)
+        return rank_articles(queryset, query).values_list('pk', 'rank')
+
+    def results(self, page, terms):
+        query = text_query(terms)
+        if query is None:
+            return super(PostgresSearchBackend, self).results(page, terms)
+        return search_results(page, Headline('body', query))
+
+
+class InvertedIndexSearchBackend(SearchBackend):
+    """
+    Matches articles on an InvertedIndex held by this process, scored with
+    BM25. The index is built from the database on first use and then
+    updated as this process saves and deletes articles, so it only sees
+    what other processes change once it is rebuilt. Meant for development
+    and for comparing engines, see the benchmark_search command.
+    """
+    # like the A, B and C weights of the PostgreSQL search vector
+    weights = {'title': 1.0, 'description': 0.4, 'tags': 0.4, 'body': 0.2}
+    # words of the body shown around the first match
+    excerpt_words = 35
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.engine = None
+
+    def build(self):
+        """
+        (Re)builds the index from every article
+        """
+        with self.lock:
+            self.engine = InvertedIndex(self.weights)
+            self.add(Article.objects.all())
+
+    def add(self, queryset):
+        tags = defaultdict(list)
+        through = Article._meta.get_field('tag_list').through
+        for pk, name in through.objects.filter(
+                content_type=ContentType.objects.get_for_model(Article),
+                object_id__in=queryset.values('pk')).values_list(
+                    'object_id', 'tag__name'):
+            tags[pk].append(name)
+        for pk, title, description, body, created_at in queryset.values_list(
+                'pk', 'title', 'description', 'body', 'created_at'):
+            self.engine.add(pk, {
+                'title': title, 'description': description,
+                'tags': ' '.join(tags[pk]), 'body': body,
+            }, order=created_at.timestamp())
+
+    def search(self, terms):
+        with self.lock:
+            if self.engine is None:
+                self.build()
+            return self.engine.search(' '.join(terms))
+
+    def match(self, queryset, terms):
+        return queryset.filter(
+            pk__in=[pk for pk, _ in self.search(terms)])
+
+    def rank(self, queryset, terms):
+        if not terms:
+            return super(InvertedIndexSearchBackend, self).rank(
+                queryset, terms)
+        rows = self.search(terms)
+        if rows and queryset.query.has_filters():
+            allowed = set(queryset.filter(pk__in=[pk for pk, _ in rows])
+                          .values_list('pk', flat=True))
+            rows = [row for row in rows if row[0] in allowed]
+        return rows
+
+    def results(self, page, terms):
+        if not terms:
+            return super(InvertedIndexSearchBackend, self).results(
+                page, terms)
+        tokens = set(tokenize(' '.join(terms)))
+        return search_results(
+            page, F('body'), lambda body: self.highlight(body, tokens))
+
+    def highlight(self, body, tokens):
+        """
+        Returns the HTML-escaped words of `body` from just before its
+        first match, with the matches marked up like mark_excerpt does
+        """
+        words = body.split()
+        matches = [bool(set(tokenize(word)) & tokens) for word in words]
+        start = max(matches.index(True) - 5, 0) if any(matches) else 0
+        return ' '.join(
+            '<mark>{}</mark>'.format(escape(word)) if matched
+            else escape(word)
+            for word, matched in zip(
+                words[start:start + self.excerpt_words],
+                matches[start:start + self.excerpt_words]))
+
+    def index(self, queryset):
+        with self.lock:
+            if self.engine is not None:
+                self.add(queryset)
+
+    def remove(self, pks):
+        with self.lock:
+            if self.engine is not None:
+                for pk in pks:
+                    self.engine.remove(pk)
+
+
+@lru_cache(maxsize=None)
+def load_search_backend(path):
+    return import_string(path)()
+
+
+def get_search_backend():
+    """
+    Returns the search backend named by ARTICLE_SEARCH_BACKEND, one
+    instance per process so in-process indexes are kept
+    """
+    return load_search_backend(settings.ARTICLE_SEARCH_BACKEND)
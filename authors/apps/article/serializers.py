@@ -1,106 +1,129 @@
-import readtime
+from collections import OrderedDict
+
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import transaction
 from django.db.models import Avg
 from rest_framework import serializers
 from rest_framework import response
-from authors.apps.authentication.serializers import UserSerializer
-from .models import Article, ArticleLikes, Rate, ArticleComment, ArticleFavourite, ArticleBookmark, ReportArticle
+from authors.apps.authentication.serializers import AuthorSerializer
+from authors.apps.core.serializers import DynamicFieldsMixin
+from .models import (
+    LIKERS_PREVIEW_SIZE, Article, ArticleImage, ArticleLikes, Rate,
+    ArticleComment, ArticleFavourite, ArticleBookmark, ReportArticle,
+    TagCount)
 from ..profiles.serializers import ProfileSerializer
 
 class LikesSerializer(serializers.ModelSerializer):
     """
     This class serializes data from ArticleLikes model
     """
-    user = UserSerializer()
+    user = AuthorSerializer(read_only=True)
 
     class Meta:
         model = ArticleLikes
         fields = ('user',)
 
 
+class ArticleImageSerializer(serializers.ModelSerializer):
+    """
+    This class serializes data from ArticleImage model. The image is null
+    until a pending upload is stored.
+    """
+    image = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArticleImage
+        fields = ('id', 'image', 'description', 'status')
+
+    def get_image(self, obj):
+        if obj.status != ArticleImage.READY:
+            return None
+        return getattr(obj.image, 'get_prep_value', lambda: obj.image)()
+
+
 class TagSerializer(serializers.Field):
     """
     tag serializer class
     """
 
     def to_internal_value(self, data):
-        tag_data = ArticleSerializer().validate_tag_list(data)
-        return tag_data
+        """
+        checks tags are a list of strings and returns them without repeats
+        """
+        if type(data) is not list:
+            raise serializers.ValidationError({"message": "error"})
+
+        for tag in data:
+            if not isinstance(tag, str):
+                raise serializers.ValidationError({"message": "error"})
+        return list(OrderedDict.fromkeys(data))
 
     def to_representation(self, obj):
         """
         converts taggable manager instance to a list
         """
         if type(obj) is not list:
-            return [tag for tag in obj.all()]
+            return [tag.name for tag in obj.all()]
         return obj
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class TagCountSerializer(serializers.ModelSerializer):
+    """
+    This class serializes a tag with the number of articles using it
+    """
+    name = serializers.CharField(source='tag.name')
+    slug = serializers.CharField(source='tag.slug')
+    articlesCount = serializers.IntegerField(source='articles')
+
+    class Meta:
+        model = TagCount
+        fields = ('name', 'slug', 'articlesCount')
+
+
+class ArticleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     converts the model into JSON format
     """
 
-    author = UserSerializer(read_only=True)
+    author = AuthorSerializer(read_only=True)
     likes = serializers.SerializerMethodField()
     dislikes = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
-    dislikes_count = serializers.SerializerMethodField()
-    tag_list = TagSerializer(default=[], required=False)
+    likes_count = serializers.IntegerField(read_only=True)
+    dislikes_count = serializers.IntegerField(read_only=True)
+    favourites_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    tag_list = TagSerializer(required=False)
     read_time = serializers.SerializerMethodField()
+    word_count = serializers.IntegerField(read_only=True)
 
     def get_rates(self, obj):
         """
             Returns rating average
         """
-        average = Rate.objects.filter(
-            article__pk=obj.pk).aggregate(Avg('your_rating'))
-
-        if average['your_rating__avg'] is None:
-            average_rating = 0
-            return average_rating
-
-        return average['your_rating__avg']
+        return obj.average_rating
 
     favourited = serializers.SerializerMethodField()
     rates = serializers.SerializerMethodField()
 
-    def validate_tag_list(self, validated_data):
-        if type(validated_data) is not list:
-            raise serializers.ValidationError(
-                {"message": "error"}
-            )
-
-        for tag in validated_data:
-            if not isinstance(tag, str):
-                raise serializers.ValidationError(
-                    {"message": "error"}
-                )
-            return validated_data
-
     def create(self, validated_data, *args):
         """
-        post saves tags after the article has been saved
+        saves the article and its tags in one transaction, under a slug
+        allocated from its title whatever slug was sent
         """
-        article = Article(**validated_data)
-        article.save()
-        tags_to = Article.objects.get(pk=article.pk)
+        tag_list = validated_data.pop('tag_list', [])
 
-        if article.tag_list is not None:
-            for tag in article.tag_list:
-                tags_to.tag_list.add(tag)
+        validated_data.pop('slug', None)
 
-            return article
-        article.tag_list = []
+        with transaction.atomic():
+            article = Article(**validated_data)
+            article.save()
+            article.set_tags(tag_list)
         return article
 
     def update(self, instance, validated_data):
         """
-        update the tag_list field
+        saves the article and, when given, the difference in its tags
         """
-        if 'tag_list' not in validated_data:
-            return instance
-
         tag_list = validated_data.pop('tag_list', None)
 
         validated_data.pop('slug', None)
@@ -108,10 +131,10 @@ class ArticleSerializer(serializers.ModelSerializer):
         for (key, value) in validated_data.items():
             setattr(instance, key, value)
 
-        instance.tag_list.set(*tag_list, clear=True)
-        instance.save()
-
-        instance.tag_list = tag_list
+        with transaction.atomic():
+            instance.save()
+            if tag_list is not None:
+                instance.set_tags(tag_list)
         return instance
 
     class Meta:
@@ -126,9 +149,12 @@ class ArticleSerializer(serializers.ModelSerializer):
             'slug',
             'favourited',
             'read_time',
+            'word_count',
             'author',
             'likes_count',
             'dislikes_count',
+            'favourites_count',
+            'comments_count',
             'likes',
             'dislikes',
             'rates',
@@ -136,44 +162,37 @@ class ArticleSerializer(serializers.ModelSerializer):
 
     def get_likes(self, obj):
         """
-        This method returns users who liked an Article
+        This method returns the latest users who liked an Article
         :param obj: This is the Article object
-        :return: users who liked an article
+        :return: at most LIKERS_PREVIEW_SIZE users who liked an article
         """
-        query = obj.liked.filter(likes=1)
+        query = getattr(obj, 'prefetched_likes', None)
+        if query is None:
+            query = obj.liked.filter(likes=1).select_related(
+                'user__profile').newest_first()[:LIKERS_PREVIEW_SIZE]
         return LikesSerializer(query, many=True).data
 
     def get_dislikes(self, obj):
         """
-        This method returns users who disliked an Article
+        This method returns the latest users who disliked an Article
         :param obj: This is the Article object
-        :return: users who liked an article
+        :return: at most LIKERS_PREVIEW_SIZE users who disliked an article
         """
-        query = obj.liked.filter(dislikes=-1)
+        query = getattr(obj, 'prefetched_dislikes', None)
+        if query is None:
+            query = obj.liked.filter(dislikes=-1).select_related(
+                'user__profile').newest_first()[:LIKERS_PREVIEW_SIZE]
         return LikesSerializer(query, many=True).data
 
-    def get_likes_count(self, obj):
-        """
-        This method returns number of users who liked an Article
-        :param obj: This is the Article object
-        :return: count of users who liked an article
-        """
-        return obj.liked.filter(likes=1).count()
-
-    def get_dislikes_count(self, obj):
-        """
-        This method returns number of users who disliked an Article
-        :param obj: This is the Article object
-        :return: count of users who disliked an article
-        """
-        return obj.liked.filter(dislikes=-1).count()
-
     def get_favourited(self, obj):
         """
         This method returns true or false on querying for favourited articel
         :param obj:
         :return: True or False
         """
+        if hasattr(obj, 'is_favourited'):
+            return obj.is_favourited
+
         request = self.context.get('request', None)
         if request is None:
             return False
@@ -185,14 +204,25 @@ class ArticleSerializer(serializers.ModelSerializer):
 
     def get_read_time(self, obj):
         """
-        this method calculates the readtime of an article
+        this method returns the readtime stored when the article was saved
         :param obj: this is the article instance
         :return: the time taken in minutes
         """
-        body = obj.body
-        result = readtime.of_text(body)
-        read_time = result.minutes
-        return str(read_time) + " minute(s)"
+        return str(obj.read_time_minutes) + " minute(s)"
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """
+    This class serializes a search result: the article's summary, its rank
+    and an excerpt with the matches highlighted
+    """
+    slug = serializers.CharField()
+    title = serializers.CharField()
+    description = serializers.CharField()
+    author = serializers.CharField(source='author_username')
+    created_at = serializers.DateTimeField()
+    rank = serializers.FloatField()
+    excerpt = serializers.CharField()
 
 
 class RateSerializer(serializers.ModelSerializer):
@@ -280,10 +310,11 @@ class SubcommentSerializer(serializers.ModelSerializer):
 
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     converts the model into JSON format
     """
+    always_include = ('is_active',)
     subcomments = SubcommentSerializer(many=True, read_only=True)
     author = ProfileSerializer(read_only=True)
     like = serializers.SerializerMethodField()
@@ -0,0 +1,101 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete)
+from django.dispatch import receiver
+
+from ..authentication.models import User
+from ..profiles.models import UserProfile
+from .models import (
+    SEARCH_GENERATION, Article, CacheGeneration, FeedEntry, TagCount)
+from .search import get_search_backend
+from .spelling import vocabulary
+from .suggest import suggestions
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_searches(sender, instance, **kwargs):
+    CacheGeneration.objects.bump(SEARCH_GENERATION)
+
+
+@receiver(post_delete, sender=Article)
+def unsuggest_article(sender, instance, **kwargs):
+    """
+    Drops a deleted article from the search suggestions of this process,
+    which a refresh cannot tell apart from an unchanged one, from the
+    index of the search backend and from the spelling vocabulary
+    """
+    suggestions.remove_article(instance.pk)
+    get_search_backend().remove([instance.pk])
+    vocabulary.remove_article(instance.pk)
+
+
+@receiver(pre_delete, sender=Article)
+def uncount_article_tags(sender, instance, **kwargs):
+    """
+    Takes a deleted article off the article counts of its tags, before
+    its taggit links are deleted with it
+    """
+    through = sender._meta.get_field('tag_list').through
+    TagCount.objects.adjust(through.objects.filter(
+        content_type=ContentType.objects.get_for_model(sender),
+        object_id=instance.pk).values_list('tag_id', flat=True), -1)
+
+
+def touch_articles_showing(user_ids):
+    """
+    Moves the articles that embed the users' profiles to a new version, so
+    their validators and cached responses stop matching the old profiles
+    """
+    Article.objects.showing(user_ids).touch()
+
+
+@receiver(post_save, sender=UserProfile)
+def touch_profile_articles(sender, instance, created, **kwargs):
+    if not created:
+        touch_articles_showing([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def touch_user_articles(sender, instance, created, update_fields=None,
+                        **kwargs):
+    # logins only write last_login, which articles do not show
+    if not created and set(update_fields or ()) != {'last_login'}:
+        touch_articles_showing([instance.pk])
+
+
+@receiver(m2m_changed, sender=UserProfile.following.through)
+def touch_followed_articles(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    """
+    Moves the articles showing followed or unfollowed authors to a new
+    version, since they show whether the reader follows them
+    """
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+    touch_articles_showing([instance.pk] if reverse else pk_set)
+
+
+@receiver(m2m_changed, sender=UserProfile.following.through)
+def update_feeds(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Backfills a reader's feed when they follow an author and prunes it
+    when they unfollow. Profiles share their user's primary key.
+    """
+    if action == 'post_clear':
+        if reverse:
+            FeedEntry.objects.filter(author_id=instance.pk).delete()
+        else:
+            FeedEntry.objects.filter(user_id=instance.pk).delete()
+        return
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+
+    if reverse:
+        follows = [(pk, instance.pk) for pk in pk_set]
+    else:
+        follows = [(instance.pk, pk) for pk in pk_set]
+    if action == 'post_add':
+        FeedEntry.objects.backfill(follows)
+    else:
+        FeedEntry.objects.prune(follows)
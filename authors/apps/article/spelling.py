@@ -0,0 +1,286 @@
+import itertools
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+
+from .inverted_index import STOP_WORDS
+from .models import Article
+
+# words the vocabulary is made of, shorter ones are never corrected
+WORD = re.compile(r'[^\W\d_]{3,}')
+
+# unknown words of a search corrected, and candidates tried for each
+MAX_CORRECTED_WORDS = 5
+CANDIDATES_PER_WORD = 3
+
+
+def words(text):
+    """
+    :return: the set of lowercased vocabulary words in `text`
+    """
+    return set(WORD.findall(text.lower())) - STOP_WORDS
+
+
+def edit_distance(source, target, limit):
+    """
+    Returns the optimal string alignment distance between two words:
+    insertions, deletions, substitutions and swaps of adjacent letters
+    each count one. Gives up once it exceeds `limit`.
+    :return: the distance, or limit + 1 if it is above `limit`
+    """
+    if abs(len(source) - len(target)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(target) + 1))
+    for i, letter in enumerate(source, 1):
+        current = [i] + [0] * len(target)
+        for j, other in enumerate(target, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (letter != other))
+            if i > 1 and j > 1 and letter == target[j - 2] and \
+                    source[i - 2] == other:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class SymSpell(object):
+    """
+    A symmetric delete spelling index. Every word is stored under each
+    string its prefix turns into with up to `max_distance` letters
+    deleted. A misspelling looks up its own deletes, which finds every
+    word within that edit distance without comparing against the whole
+    vocabulary; the candidates found are then checked with edit_distance.
+    Words are counted, so they can be added and discarded one article at
+    a time.
+    """
+
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.counts = Counter()
+        self.deletes = defaultdict(set)
+
+    def __contains__(self, word):
+        return word in self.counts
+
+    def __len__(self):
+        return len(self.counts)
+
+    def edits(self, word):
+        """
+        :return: the strings the prefix of `word` turns into with up to
+                 max_distance deletes, the prefix itself included
+        """
+        found = {word[:self.prefix_length]}
+        frontier = found
+        for _ in range(self.max_distance):
+            frontier = {edit[:position] + edit[position + 1:]
+                        for edit in frontier if len(edit) > 1
+                        for position in range(len(edit))}
+            found |= frontier
+        return found
+
+    def add(self, word, count=1):
+        if word not in self.counts:
+            for edit in self.edits(word):
+                self.deletes[edit].add(word)
+        self.counts[word] += count
+
+    def discard(self, word, count=1):
+        if word not in self.counts:
+            return
+        self.counts[word] -= count
+        if self.counts[word] > 0:
+            return
+        del self.counts[word]
+        for edit in self.edits(word):
+            self.deletes[edit].discard(word)
+            if not self.deletes[edit]:
+                del self.deletes[edit]
+
+    def lookup(self, word, limit):
+        """
+        Finds the known words closest to `word`
+        :return: up to `limit` (word, distance, count) tuples, closest and
+                 then most common first
+        """
+        candidates = set()
+        for edit in self.edits(word):
+            candidates.update(self.deletes.get(edit, ()))
+        matches = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, self.max_distance)
+            if distance <= self.max_distance:
+                matches.append(
+                    (candidate, distance, self.counts[candidate]))
+        matches.sort(key=lambda match: (match[1], -match[2], match[0]))
+        return matches[:limit]
+
+
+class Vocabulary(object):
+    """
+    The words of article titles, bodies and tags in this process, counted
+    by the number of articles using them and held in a SymSpell index.
+    Built from the database on first use, then kept fresh like the search
+    suggestions: articles saved since the last refresh are re-read, each
+    replacing the words it contributed; deleted ones are dropped through
+    a signal and the index is rebuilt every SPELLING_REBUILD_INTERVAL.
+    Updates read the database and build a new index without holding the
+    lock, so other threads keep correcting with the current one.
+    """
+    # re-read saves this much older than the last refresh, for
+    # transactions that committed after it started
+    overlap = timedelta(seconds=60)
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.updating = threading.Lock()
+        self.index = None
+        self.articles = {}
+        self.built_at = self.refreshed_at = 0
+        self.watermark = None
+        # articles deleted while an update reads the database, or None
+        self.removed = None
+
+    def due(self):
+        """
+        :return: the update the index is due for, or None
+        """
+        now = time.monotonic()
+        if self.index is None or \
+                now - self.built_at >= settings.SPELLING_REBUILD_INTERVAL:
+            return self.rebuild
+        if now - self.refreshed_at >= settings.SPELLING_REFRESH_INTERVAL:
+            return self.refresh
+        return None
+
+    def ensure_fresh(self):
+        """
+        Runs the update the index is due for, unless another thread is
+        already updating it
+        """
+        if self.due() is None or \
+                not self.updating.acquire(blocking=self.index is None):
+            return
+        try:
+            update = self.due()
+            if update is not None:
+                with self.lock:
+                    self.removed = set()
+                update()
+        finally:
+            with self.lock:
+                self.removed = None
+            self.updating.release()
+
+    def rebuild(self):
+        """
+        Builds a new index from every article and swaps it in
+        """
+        watermark = timezone.now()
+        index, articles = SymSpell(settings.SPELLING_MAX_DISTANCE), {}
+        for pk, new in self.read_articles(Article.objects.all()):
+            self.replace(index, articles, pk, new)
+        with self.lock:
+            for pk in self.removed:
+                self.replace(index, articles, pk, frozenset())
+            self.index, self.articles = index, articles
+            self.built_at = self.refreshed_at = time.monotonic()
+            self.watermark = watermark
+
+    def refresh(self):
+        """
+        Re-reads the words of the articles saved since the last refresh
+        """
+        watermark = timezone.now()
+        saved = self.read_articles(Article.objects.filter(
+            updated_at__gte=self.watermark - self.overlap))
+        with self.lock:
+            for pk, new in saved:
+                self.replace(self.index, self.articles, pk, new)
+            for pk in self.removed:
+                self.replace(self.index, self.articles, pk, frozenset())
+            self.refreshed_at = time.monotonic()
+            self.watermark = watermark
+
+    def read_articles(self, queryset):
+        """
+        :return: (pk, words) pairs of the articles in `queryset`
+        """
+        tags = defaultdict(list)
+        through = Article._meta.get_field('tag_list').through
+        for pk, name in through.objects.filter(
+                content_type=ContentType.objects.get_for_model(Article),
+                object_id__in=queryset.values('pk')).values_list(
+                    'object_id', 'tag__name'):
+            tags[pk].append(name)
+        return [(pk, words(' '.join([title, body] + tags[pk])))
+                for pk, title, body in queryset.values_list(
+                    'pk', 'title', 'body')]
+
+    @staticmethod
+    def replace(index, articles, pk, new):
+        """
+        Replaces the words article `pk` contributes to `index`
+        :param articles: the words of each article in `index`
+        """
+        old = articles.get(pk, frozenset())
+        for word in old - new:
+            index.discard(word)
+        for word in new - old:
+            index.add(word)
+        if new:
+            articles[pk] = frozenset(new)
+        else:
+            articles.pop(pk, None)
+
+    def remove_article(self, pk):
+        with self.lock:
+            if self.removed is not None:
+                self.removed.add(pk)
+            if self.index is not None:
+                self.replace(self.index, self.articles, pk, frozenset())
+
+    def corrections(self, terms, limit):
+        """
+        Suggests searches with the unknown words of `terms` respelled as
+        known ones
+        :param terms: the normalized search terms
+        :return: up to `limit` corrected searches, those with the fewest
+                 and then the most common changes first
+        """
+        self.ensure_fresh()
+        with self.lock:
+            options = []
+            corrected = 0
+            for word in re.findall(r'\w+', ' '.join(terms)):
+                choices = []
+                if corrected < MAX_CORRECTED_WORDS and \
+                        WORD.fullmatch(word) and word not in STOP_WORDS \
+                        and word not in self.index:
+                    corrected += 1
+                    choices = [(candidate, distance, -count) for candidate,
+                               distance, count in self.index.lookup(
+                                   word, CANDIDATES_PER_WORD)]
+                options.append(choices or [(word, 0, 0)])
+        if all(len(choices) == 1 and choices[0][1] == 0
+               for choices in options):
+            return []
+
+        searches = sorted(
+            itertools.product(*options),
+            key=lambda choice: (sum(option[1] for option in choice),
+                                sum(option[2] for option in choice)))
+        return [' '.join(option[0] for option in choice)
+                for choice in searches[:limit]]
+
+
+vocabulary = Vocabulary()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import uuid
+
+from cloudinary import uploader
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+def spool(upload):
+    """
+    Writes an uploaded file to the local spool directory in chunks, so the
+    request never waits on the storage backend
+    :param upload: an UploadedFile from the request
+    :return: the path of the spooled file
+    """
+    directory = settings.IMAGE_SPOOL_DIR
+    os.makedirs(directory, exist_ok=True)
+    extension = os.path.splitext(upload.name)[1].lower()
+    path = os.path.join(directory, uuid.uuid4().hex + extension)
+    with open(path, 'wb') as spooled:
+        for chunk in upload.chunks():
+            spooled.write(chunk)
+    return path
+
+
+class ImageStorage(object):
+    """
+    Stores spooled article images. `save` returns the value kept in
+    ArticleImage.image and raises on failure so the upload is retried.
+    """
+
+    def save(self, path):
+        raise NotImplementedError
+
+
+class CloudinaryImageStorage(ImageStorage):
+    """
+    Uploads images to Cloudinary, where the site serves them from
+    """
+
+    def save(self, path):
+        result = uploader.upload(path, resource_type='image')
+        return '{resource_type}/{type}/v{version}/{public_id}.{format}'.format(
+            **result)
+
+
+class LocalImageStorage(ImageStorage):
+    """
+    Copies images into a local directory, for tests and offline runs
+    """
+
+    def __init__(self, location=None):
+        self.location = location or getattr(
+            settings, 'LOCAL_IMAGE_ROOT',
+            os.path.join(settings.BASE_DIR, 'media', 'article_images'))
+
+    def save(self, path):
+        os.makedirs(self.location, exist_ok=True)
+        name = os.path.basename(path)
+        shutil.copyfile(path, os.path.join(self.location, name))
+        return 'local/' + name
+
+
+def get_image_storage():
+    """
+    Returns the storage backend named by ARTICLE_IMAGE_STORAGE
+    """
+    return import_string(settings.ARTICLE_IMAGE_STORAGE)()
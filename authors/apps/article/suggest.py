@@ -0,0 +1,295 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from ..authentication.models import User
+from .models import Article
+
+# kinds of suggestion, in the order they win ties
+ARTICLE = 'article'
+TAG = 'tag'
+AUTHOR = 'author'
+
+NON_WORD = re.compile(r'\W+')
+
+
+def normalize(text):
+    """
+    Lowercases `text` and collapses everything but letters and digits to
+    single spaces, so prefixes match however the text is punctuated
+    """
+    return NON_WORD.sub(' ', text.lower()).strip()
+
+
+class PrefixIndex(object):
+    """
+    An in-memory prefix index: a sorted list of (key, entry) pairs that
+    is searched with bisect. Titles are also indexed from each of their
+    words, so "vim" finds "Learning vim". Each entry is ranked by weight,
+    then by whether the prefix starts its label, then by label length.
+    Results are memoized per prefix until the index changes. Entries are
+    inserted in place one at a time, or appended and sorted once when
+    loaded in bulk.
+    """
+    # characters of each key indexed, longer prefixes match on these
+    key_length = 64
+    memo_size = 1024
+
+    def __init__(self):
+        self.keys = []
+        self.sorted = True
+        self.entries = {}
+        self.memo = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, entry, label, weight=0, data=None, words=False):
+        """
+        Adds or replaces an entry
+        :param entry: a hashable, orderable id, e.g. ('article', 12)
+        :param label: the text the entry is found by and shown as
+        :param weight: higher weights rank first
+        :param data: extra fields returned with the entry
+        :param words: index the label from each of its words too
+        """
+        self.remove(entry)
+        text = normalize(label)
+        keys = {text[:self.key_length]}
+        if words:
+            starts = [match.end() for match in re.finditer(' ', text)]
+            keys.update(text[start:start + self.key_length]
+                        for start in starts)
+        keys.discard('')
+        if self.sorted:
+            for key in keys:
+                bisect.insort(self.keys, (key, entry))
+        else:
+            self.keys.extend((key, entry) for key in keys)
+        self.entries[entry] = (label, weight, data or {}, keys, text)
+        self.memo.clear()
+
+    def remove(self, entry):
+        """
+        Removes an entry, if it is indexed
+        """
+        existing = self.entries.pop(entry, None)
+        if existing is None:
+            return
+        for key in existing[3]:
+            if not self.sorted:
+                self.keys.remove((key, entry))
+                continue
+            position = bisect.bisect_left(self.keys, (key, entry))
+            if position < len(self.keys) and \
+                    self.keys[position] == (key, entry):
+                del self.keys[position]
+        self.memo.clear()
+
+    @contextmanager
+    def loading(self):
+        """
+        Appends the keys of entries added in the block and sorts them once
+        at the end, rather than inserting each into the sorted list. Do
+        not search the index in the block.
+        """
+        self.sorted = False
+        try:
+            yield self
+        finally:
+            self.keys.sort()
+            self.sorted = True
+            self.memo.clear()
+
+    def search(self, prefix, limit):
+        """
+        Returns the best `limit` entries with a key starting with `prefix`
+        :return: a list of (entry, label, data) tuples
+        """
+        prefix = normalize(prefix)[:self.key_length]
+        if not prefix:
+            return []
+        if (prefix, limit) in self.memo:
+            self.memo.move_to_end((prefix, limit))
+            return self.memo[(prefix, limit)]
+
+        matches = set()
+        position = bisect.bisect_left(self.keys, (prefix,))
+        while position < len(self.keys) and \
+                self.keys[position][0].startswith(prefix):
+            matches.add(self.keys[position][1])
+            position += 1
+
+        def rank(entry):
+            label, weight, _, _, text = self.entries[entry]
+            return (-weight, not text.startswith(prefix), len(label), entry)
+
+        results = [(entry,) + self.entries[entry][:1] + self.entries[entry][2:3]
+                   for entry in heapq.nsmallest(limit, matches, key=rank)]
+        self.memo[(prefix, limit)] = results
+        if len(self.memo) > self.memo_size:
+            self.memo.popitem(last=False)
+        return results
+
+
+class Suggestions(object):
+    """
+    The typeahead index of article titles, tag names and author usernames
+    of this process. It is built from the database on first use and then
+    kept fresh without rescanning:
+
+    - every SUGGEST_REFRESH_INTERVAL seconds, articles saved since the
+      last refresh are re-added with their tags and authors, found with
+      the updated_at index, and so are users saved since then
+    - deleted articles are removed through a signal
+    - every SUGGEST_REBUILD_INTERVAL seconds the index is rebuilt, which
+      drops what other processes deleted and refreshes the weights
+
+    One thread at a time updates the index. It reads the database without
+    holding the lock, which only guards the index in memory, so other
+    threads keep searching the current index meanwhile; they only wait
+    for the first build.
+    """
+    # re-read saves this much older than the last refresh, for
+    # transactions that committed after it started
+    overlap = timedelta(seconds=60)
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.updating = threading.Lock()
+        self.index = None
+        self.built_at = self.refreshed_at = 0
+        self.watermark = None
+        # entries removed while an update reads the database, or None
+        self.removed = None
+
+    def search(self, prefix, limit):
+        self.ensure_fresh()
+        with self.lock:
+            return self.index.search(prefix, limit)
+
+    def due(self):
+        """
+        :return: the update the index is due for, or None
+        """
+        now = time.monotonic()
+        if self.index is None or \
+                now - self.built_at >= settings.SUGGEST_REBUILD_INTERVAL:
+            return self.rebuild
+        if now - self.refreshed_at >= settings.SUGGEST_REFRESH_INTERVAL:
+            return self.refresh
+        return None
+
+    def ensure_fresh(self):
+        """
+        Runs the update the index is due for, unless another thread is
+        already updating it
+        """
+        if self.due() is None or \
+                not self.updating.acquire(blocking=self.index is None):
+            return
+        try:
+            update = self.due()
+            if update is not None:
+                with self.lock:
+                    self.removed = set()
+                update()
+        finally:
+            with self.lock:
+                self.removed = None
+            self.updating.release()
+
+    def rebuild(self):
+        """
+        Builds a new index from every article, used tag and author and
+        swaps it in
+        """
+        watermark = timezone.now()
+        entries = self.articles(Article.objects.all())
+        entries += self.tags(
+            Article._meta.get_field('tag_list').through.objects)
+        entries += self.authors(User.objects.filter(is_active=True).annotate(
+            written=Count('articles')).filter(written__gt=0))
+        index = PrefixIndex()
+        with index.loading():
+            self.apply(index, entries)
+        with self.lock:
+            self.apply(index, [(entry, None) for entry in self.removed])
+            self.index = index
+            self.built_at = self.refreshed_at = time.monotonic()
+            self.watermark = watermark
+
+    def refresh(self):
+        """
+        Re-adds the articles saved since the last refresh with their tags
+        and authors, and the authors saved since then, renamed or
+        deactivated ones included
+        """
+        watermark = timezone.now()
+        since = self.watermark - self.overlap
+        saved = Article.objects.filter(updated_at__gte=since)
+        entries = self.articles(saved)
+        if entries:
+            entries += self.tags(Article._meta.get_field(
+                'tag_list').through.objects.filter(
+                    object_id__in=[entry[1] for entry, _ in entries]))
+        entries += self.authors(User.objects.filter(
+            Q(pk__in=saved.values('author_id')) | Q(updated_at__gte=since)
+        ).annotate(written=Count('articles')))
+        with self.lock:
+            self.apply(self.index, entries)
+            self.apply(self.index, [(entry, None) for entry in self.removed])
+            self.refreshed_at = time.monotonic()
+            self.watermark = watermark
+
+    @staticmethod
+    def apply(index, entries):
+        """
+        Adds entries to `index`, removing those without arguments
+        :param entries: (entry, arguments of PrefixIndex.add or None) pairs
+        """
+        for entry, arguments in entries:
+            if arguments is None:
+                index.remove(entry)
+            else:
+                index.add(entry, **arguments)
+
+    def articles(self, queryset):
+        return [((ARTICLE, pk), {
+            'label': title, 'weight': weight, 'data': {'slug': slug},
+            'words': True,
+        }) for pk, title, slug, weight in queryset.values_list(
+            'pk', 'title', 'slug', F('likes_count') + F('favourites_count'))]
+
+    def tags(self, links):
+        return [((TAG, pk), {'label': name, 'weight': articles or 0})
+                for pk, name, articles in links.filter(
+                    content_type=ContentType.objects.get_for_model(Article)
+                ).values_list('tag_id', 'tag__name',
+                              'tag__article_count__articles').distinct()]
+
+    def authors(self, users):
+        return [((AUTHOR, pk), {'label': username, 'weight': written}
+                 if is_active and written else None)
+                for pk, username, is_active, written in users.values_list(
+                    'pk', 'username', 'is_active', 'written')]
+
+    def remove_article(self, pk):
+        with self.lock:
+            if self.removed is not None:
+                self.removed.add((ARTICLE, pk))
+            if self.index is not None:
+                self.index.remove((ARTICLE, pk))
+
+
+suggestions = Suggestions()
@@ -169,6 +169,21 @@ class TestArticle(APITestCase):
             "andela-1", result["article"]["slug"])
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_sent_slug_is_ignored(self):
+        """
+        test a slug sent with a new article is replaced by one allocated
+        from its title, so routes like the feed are never shadowed
+        :return:
+        """
+        article = dict(self.article, title="Feed", slug="feed")
+        response = self.client.post('/api/articles/', article,
+                                    HTTP_AUTHORIZATION='Token ' + self.token,
+                                    format='json')
+        result = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(result["article"]["slug"], "feed-1")
+
     def test_same_slug(self):
         """
         tests the response if one creates a slug that is already in use
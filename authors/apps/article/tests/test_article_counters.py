@@ -0,0 +1,157 @@
+import json
+
+from django.core.management import call_command
+from django.utils.six import StringIO
+from rest_framework.test import APIClient, APITestCase
+
+from ..models import Article
+
+
+class TestArticleCounters(APITestCase):
+    """ This class tests the denormalized engagement counters on Article
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        """ Creates an author with an article and a reader with a profile
+        """
+        self.author = {
+            "user": {
+                "username": "kibet",
+                "email": "kibet@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.reader = {
+            "user": {
+                "username": "chirchir",
+                "email": "chirchir@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.article = {
+            "title": "Andela",
+            "description": "be epic",
+            "body": "powering todays teams",
+            "images": ""
+        }
+
+        author_token = self.login(self.author)
+        reader_token = self.login(self.reader)
+        self.author_auth = 'Token ' + author_token
+        self.reader_auth = 'Token ' + reader_token
+
+        for auth, user in ((self.author_auth, self.author),
+                           (self.reader_auth, self.reader)):
+            self.client.post('/api/profile/create_profile/', user,
+                             HTTP_AUTHORIZATION=auth, format='json')
+
+        response = self.client.post('/api/articles/', self.article,
+                                    HTTP_AUTHORIZATION=self.author_auth,
+                                    format='json')
+        self.slug = json.loads(response.content)["article"]["slug"]
+
+    def login(self, user):
+        self.client.post('/api/users/', user, format='json')
+        response = self.client.post('/api/users/login/', user, format='json')
+        return json.loads(response.content)["user"]["token"]
+
+    def counters(self):
+        return Article.objects.values(*Article.COUNTER_FIELDS).get(
+            slug=self.slug)
+
+    def test_like_counters(self):
+        """ Test liking and undoing a like moves the counter both ways
+        """
+        response = self.client.post('/api/articles/' + self.slug + '/like',
+                                    HTTP_AUTHORIZATION=self.reader_auth,
+                                    format='json')
+        self.assertEqual(
+            json.loads(response.content)["article"]["likes_count"], 1)
+        self.assertEqual(self.counters()["likes_count"], 1)
+
+        self.client.post('/api/articles/' + self.slug + '/like',
+                         HTTP_AUTHORIZATION=self.reader_auth, format='json')
+        self.assertEqual(self.counters()["likes_count"], 0)
+
+    def test_favourite_counters(self):
+        """ Test favouriting and unfavouriting moves the counter both ways
+        """
+        url = '/api/articles/' + self.slug + '/favorite'
+        self.client.post(url, HTTP_AUTHORIZATION=self.reader_auth,
+                         format='json')
+        self.assertEqual(self.counters()["favourites_count"], 1)
+
+        self.client.delete(url, HTTP_AUTHORIZATION=self.reader_auth,
+                           format='json')
+        self.assertEqual(self.counters()["favourites_count"], 0)
+
+    def test_rating_counters(self):
+        """ Test rating, re-rating and deleting a rating keep the average
+        """
+        url = '/api/rate/' + self.slug + '/'
+        self.client.post(url, {"your_rating": 4},
+                         HTTP_AUTHORIZATION=self.reader_auth, format='json')
+        self.client.post(url, {"your_rating": 2},
+                         HTTP_AUTHORIZATION=self.reader_auth, format='json')
+        counters = self.counters()
+        self.assertEqual(counters["rating_sum"], 2)
+        self.assertEqual(counters["rating_count"], 1)
+
+        self.client.delete(url, HTTP_AUTHORIZATION=self.reader_auth,
+                           format='json')
+        counters = self.counters()
+        self.assertEqual(counters["rating_sum"], 0)
+        self.assertEqual(counters["rating_count"], 0)
+
+    def test_comment_counters(self):
+        """ Test adding and deleting a comment moves the counter both ways
+        """
+        response = self.client.post(
+            '/api/articles/' + self.slug + '/comments/',
+            {"comment": {"body": "nice read"}},
+            HTTP_AUTHORIZATION=self.reader_auth, format='json')
+        comment_id = json.loads(response.content)["comment"]["id"]
+        self.assertEqual(self.counters()["comments_count"], 1)
+
+        self.client.delete(
+            '/api/articles/{}/comments/{}'.format(self.slug, comment_id),
+            HTTP_AUTHORIZATION=self.reader_auth, format='json')
+        self.assertEqual(self.counters()["comments_count"], 0)
+
+    def test_edit_keeps_counters(self):
+        """ Test editing an article does not overwrite its counters
+        """
+        self.client.post('/api/articles/' + self.slug + '/like',
+                         HTTP_AUTHORIZATION=self.reader_auth, format='json')
+        self.client.put('/api/articles/' + self.slug, {
+            "title": "Andela",
+            "description": "edited",
+            "body": "powering todays teams",
+            "tag_list": []
+        }, HTTP_AUTHORIZATION=self.author_auth, format='json')
+
+        self.assertEqual(self.counters()["likes_count"], 1)
+
+    def test_reconcile_counters(self):
+        """ Test the reconcile command repairs drifted counters
+        """
+        self.client.post('/api/articles/' + self.slug + '/like',
+                         HTTP_AUTHORIZATION=self.reader_auth, format='json')
+        Article.objects.update(likes_count=42, rating_count=7)
+        version = Article.objects.get().version
+
+        output = StringIO()
+        call_command('reconcile_counters', chunk_size=1, stdout=output)
+
+        counters = self.counters()
+        self.assertEqual(counters["likes_count"], 1)
+        self.assertEqual(counters["rating_count"], 0)
+        self.assertIn('Reconciled counters on 1 articles', output.getvalue())
+        self.assertEqual(Article.objects.get().version, version + 1)
+
+        output = StringIO()
+        call_command('reconcile_counters', stdout=output)
+        self.assertIn('Reconciled counters on 0 articles', output.getvalue())
+        self.assertEqual(Article.objects.get().version, version + 1)
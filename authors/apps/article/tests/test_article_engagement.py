@@ -0,0 +1,116 @@
+import json
+
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+
+class TestArticleEngagement(APITestCase):
+    """ This class tests the engagement figures annotated on article reads
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        """ Creates an author with an article and a reader who likes,
+        rates and favourites it
+        """
+        self.author = {
+            "user": {
+                "username": "kibet",
+                "email": "kibet@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.reader = {
+            "user": {
+                "username": "chirchir",
+                "email": "chirchir@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.article = {
+            "title": "Andela",
+            "description": "be epic",
+            "body": "powering todays teams",
+            "images": ""
+        }
+
+        self.author_token = self.login(self.author)
+        self.reader_token = self.login(self.reader)
+
+        self.client.post('/api/profile/create_profile/', self.author,
+                         HTTP_AUTHORIZATION='Token ' + self.author_token,
+                         format='json')
+        response = self.client.post(
+            '/api/articles/', self.article,
+            HTTP_AUTHORIZATION='Token ' + self.author_token, format='json')
+        self.slug = json.loads(response.content)["article"]["slug"]
+
+        reader = 'Token ' + self.reader_token
+        self.client.post('/api/articles/' + self.slug + '/like',
+                         HTTP_AUTHORIZATION=reader, format='json')
+        self.client.post('/api/articles/' + self.slug + '/favorite',
+                         HTTP_AUTHORIZATION=reader, format='json')
+        self.client.post('/api/rate/' + self.slug + '/', {"your_rating": 4},
+                         HTTP_AUTHORIZATION=reader, format='json')
+
+    def login(self, user):
+        self.client.post('/api/users/', user, format='json')
+        response = self.client.post('/api/users/login/', user, format='json')
+        return json.loads(response.content)["user"]["token"]
+
+    def test_list_engagement(self):
+        """ Test the article list carries counts, rating and favourited
+        """
+        response = self.client.get(
+            '/api/articles/', HTTP_AUTHORIZATION='Token ' + self.reader_token,
+            format='json')
+        article = json.loads(response.content)["articles"][0]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(article["likes_count"], 1)
+        self.assertEqual(article["dislikes_count"], 0)
+        self.assertEqual(article["rates"], 4)
+        self.assertTrue(article["favourited"])
+        self.assertEqual(
+            article["likes"][0]["user"]["username"], "chirchir")
+
+    def test_detail_engagement(self):
+        """ Test a single article carries counts, rating and favourited
+        """
+        response = self.client.get(
+            '/api/articles/' + self.slug,
+            HTTP_AUTHORIZATION='Token ' + self.reader_token, format='json')
+        article = json.loads(response.content)["article"]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(article["likes_count"], 1)
+        self.assertEqual(article["rates"], 4)
+        self.assertTrue(article["favourited"])
+
+    def test_not_favourited_by_other_viewers(self):
+        """ Test favourited is computed for the viewer, not any user
+        """
+        response = self.client.get(
+            '/api/articles/', HTTP_AUTHORIZATION='Token ' + self.author_token,
+            format='json')
+        article = json.loads(response.content)["articles"][0]
+        self.assertFalse(article["favourited"])
+
+        response = self.client.get('/api/articles/', format='json')
+        article = json.loads(response.content)["articles"][0]
+        self.assertFalse(article["favourited"])
+
+    def test_embedded_users_are_public(self):
+        """ Test authors and likers are embedded without email or token
+        """
+        response = self.client.get(
+            '/api/articles/' + self.slug,
+            HTTP_AUTHORIZATION='Token ' + self.reader_token, format='json')
+        article = json.loads(response.content)["article"]
+
+        self.assertEqual(
+            sorted(article["author"]), ["avatar", "bio", "username"])
+        self.assertEqual(article["author"]["username"], "kibet")
+        self.assertEqual(
+            sorted(article["likes"][0]["user"]), ["avatar", "bio", "username"])
@@ -0,0 +1,165 @@
+import json
+
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+
+class TestConditionalGet(APITestCase):
+    """ This class tests ETag and Last-Modified on article and comment reads
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        """ Creates a user with a profile and an article
+        """
+        self.user = {
+            "user": {
+                "username": "kibet",
+                "email": "kibet@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.article = {
+            "title": "Andela",
+            "description": "be epic",
+            "body": "powering todays teams",
+            "images": ""
+        }
+
+        self.client.post('/api/users/', self.user, format='json')
+        response = self.client.post(
+            '/api/users/login/', self.user, format='json')
+        result = json.loads(response.content)
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + result["user"]["token"])
+        response = self.client.post(
+            '/api/profile/create_profile/', self.user, format='json')
+        self.user_id = json.loads(response.content)["profile"]["username_id"]
+
+        response = self.client.post(
+            '/api/articles/', self.article, format='json')
+        self.slug = json.loads(response.content)["article"]["slug"]
+        self.url = '/api/articles/' + self.slug
+
+    def test_article_not_modified(self):
+        """ Test an unchanged article is answered with 304 and no body
+        """
+        response = self.client.get(self.url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response['ETag'], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_like_changes_etag(self):
+        """ Test liking an article serves it in full again
+        """
+        etag = self.client.get(self.url, format='json')['ETag']
+        self.client.post(self.url + '/like', format='json')
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=etag, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(
+            json.loads(response.content)["article"]["likes_count"], 1)
+
+    def test_edit_changes_etag(self):
+        """ Test editing an article serves it in full again
+        """
+        etag = self.client.get(self.url, format='json')['ETag']
+        self.client.put(self.url, {
+            "title": "Andela",
+            "description": "edited",
+            "body": "powering todays teams",
+            "tag_list": ["andela"]
+        }, format='json')
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=etag, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_modified_since(self):
+        """ Test an unchanged article is 304 for If-Modified-Since
+        """
+        response = self.client.get(self.url, format='json')
+
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+            format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_comments_not_modified_until_commented(self):
+        """ Test the comment list is 304 until a comment is added
+        """
+        url = self.url + '/comments/'
+        etag = self.client.get(url, format='json')['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, format='json')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(url, {"comment": {"body": "nice read"}},
+                         format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content)["comments"][0]["body"], "nice read")
+
+    def test_profile_edit_changes_etag(self):
+        """ Test editing the author's profile serves the article and its
+        comments in full again
+        """
+        comments = self.url + '/comments/'
+        self.client.post(comments, {"comment": {"body": "nice read"}},
+                         format='json')
+        etag = self.client.get(self.url, format='json')['ETag']
+        comments_etag = self.client.get(comments, format='json')['ETag']
+
+        self.client.put('/api/profile/edit_profile/', {"bio": "epic"},
+                        format='json')
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=etag, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(
+            comments, HTTP_IF_NONE_MATCH=comments_etag, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(
+            response.content)["comments"][0]["author"]["bio"], "epic")
+
+    def test_follow_changes_etag(self):
+        """ Test following the author serves the article in full again,
+        since it shows whether the reader follows them
+        """
+        reader = {"user": {"username": "jake", "email": "jake@olympians.com",
+                           "password": "qwerty12"}}
+        self.client.post('/api/users/', reader, format='json')
+        response = self.client.post(
+            '/api/users/login/', reader, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json.loads(
+            response.content)["user"]["token"])
+        self.client.post('/api/profile/create_profile/', reader,
+                         format='json')
+        etag = self.client.get(self.url, format='json')['ETag']
+
+        self.client.post('/api/profile/view_profile/{}/follow/'.format(
+            self.user_id), format='json')
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=etag, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_article(self):
+        """ Test reading a missing article is still a 404
+        """
+        response = self.client.get('/api/articles/missing', format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,158 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ...authentication.models import User
+from ..models import FeedEntry
+
+
+class TestFeed(APITestCase):
+    """ This class tests the feed of articles by followed authors
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        self.reader = self.login('reader')
+        self.kibet = self.login('kibet')
+        self.olympian = self.login('olympian')
+
+    def login(self, username):
+        user = {
+            "user": {
+                "username": username,
+                "email": username + "@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.client.post('/api/users/', user, format='json')
+        response = self.client.post('/api/users/login/', user, format='json')
+        content = json.loads(response.content)["user"]
+        auth = 'Token ' + content["token"]
+        self.client.post('/api/profile/create_profile/', {},
+                         HTTP_AUTHORIZATION=auth, format='json')
+        return auth
+
+    def follow(self, auth, author, method='post'):
+        response = getattr(self.client, method)(
+            '/api/profile/view_profile/{}/follow/'.format(
+                User.objects.get(username=author).pk),
+            HTTP_AUTHORIZATION=auth, format='json')
+        self.assertIn(response.status_code,
+                      (status.HTTP_200_OK, status.HTTP_201_CREATED))
+
+    def publish(self, auth, title="Andela"):
+        article = {
+            "title": title,
+            "description": "be epic",
+            "body": "powering todays teams",
+        }
+        response = self.client.post('/api/articles/', article,
+                                    HTTP_AUTHORIZATION=auth, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return json.loads(response.content)["article"]["slug"]
+
+    def feed(self, auth, query=''):
+        response = self.client.get('/api/articles/feed' + query,
+                                   HTTP_AUTHORIZATION=auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def slugs(self, page):
+        return [article["slug"] for article in page["articles"]]
+
+    def test_feed_requires_login(self):
+        """ Test the feed is only served to logged in users
+        """
+        response = self.client.get('/api/articles/feed')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_new_articles_are_fanned_out(self):
+        """ Test a new article reaches the feeds of its author's followers
+        only
+        """
+        self.follow(self.reader, 'kibet')
+        first = self.publish(self.kibet, "First")
+        self.publish(self.olympian, "Unfollowed")
+        second = self.publish(self.kibet, "Second")
+
+        page = self.feed(self.reader)
+        self.assertEqual(self.slugs(page), [second, first])
+        self.assertEqual(page["articlesCount"], 2)
+        self.assertEqual(self.feed(self.kibet)["articlesCount"], 0)
+
+    def test_follow_backfills_feed(self):
+        """ Test following an author adds their earlier articles
+        """
+        first = self.publish(self.kibet, "First")
+        second = self.publish(self.kibet, "Second")
+
+        self.follow(self.reader, 'kibet')
+
+        self.assertEqual(self.slugs(self.feed(self.reader)), [second, first])
+
+    def test_unfollow_prunes_feed(self):
+        """ Test unfollowing an author removes their articles only
+        """
+        self.follow(self.reader, 'kibet')
+        self.follow(self.reader, 'olympian')
+        self.publish(self.kibet, "First")
+        kept = self.publish(self.olympian, "Kept")
+
+        self.follow(self.reader, 'kibet', method='delete')
+
+        self.assertEqual(self.slugs(self.feed(self.reader)), [kept])
+
+    def test_feed_pages(self):
+        """ Test the feed is paginated with cursors
+        """
+        self.follow(self.reader, 'kibet')
+        slugs = [self.publish(self.kibet, "Article {}".format(n))
+                 for n in range(3)]
+
+        page = self.feed(self.reader, '?limit=2')
+        self.assertEqual(self.slugs(page), slugs[:0:-1])
+        response = self.client.get(page["next"],
+                                   HTTP_AUTHORIZATION=self.reader)
+        page = json.loads(response.content)
+        self.assertEqual(self.slugs(page), slugs[:1])
+        self.assertIsNone(page["next"])
+
+    def test_constant_queries(self):
+        """ Test reading the feed takes the same queries however many
+        authors the reader follows
+        """
+        self.follow(self.reader, 'kibet')
+        self.publish(self.kibet)
+        with CaptureQueriesContext(connection) as one_author:
+            self.feed(self.reader)
+
+        self.follow(self.reader, 'olympian')
+        self.publish(self.olympian)
+        for number in range(3):
+            author = self.login('author{}'.format(number))
+            self.follow(self.reader, 'author{}'.format(number))
+            self.publish(author)
+        with CaptureQueriesContext(connection) as five_authors:
+            page = self.feed(self.reader)
+
+        self.assertEqual(page["articlesCount"], 5)
+        self.assertEqual(len(one_author), len(five_authors))
+        self.assertEqual(FeedEntry.objects.count(), 5)
+
+    def test_fan_out_in_batches(self):
+        """ Test fanning out in batches reaches every follower once
+        """
+        for number in range(5):
+            self.follow(self.login('follower{}'.format(number)), 'kibet')
+        slug = self.publish(self.kibet)
+        article = FeedEntry.objects.filter(article__slug=slug).first().article
+        FeedEntry.objects.filter(article=article).delete()
+
+        FeedEntry.objects.fan_out(article, batch_size=2)
+
+        self.assertEqual(
+            FeedEntry.objects.filter(article=article).count(), 5)
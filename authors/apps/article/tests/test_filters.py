@@ -0,0 +1,143 @@
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ..models import Article
+
+
+class TestArticleFilters(APITestCase):
+    """ This class tests the structured filters of the article list
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        self.kibet = self.login('kibet')
+        self.jake = self.login('jake')
+        self.andela = self.publish(self.kibet, "Andela", ["andela", "kenya"])
+        self.vim = self.publish(self.jake, "Vim", ["code"])
+        self.kenya = self.publish(self.jake, "Kenya", ["kenya"])
+
+    def login(self, username):
+        user = {
+            "user": {
+                "username": username,
+                "email": username + "@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.client.post('/api/users/', user, format='json')
+        response = self.client.post('/api/users/login/', user, format='json')
+        auth = 'Token ' + json.loads(response.content)["user"]["token"]
+        self.client.post('/api/profile/create_profile/', {},
+                         HTTP_AUTHORIZATION=auth, format='json')
+        return auth
+
+    def publish(self, auth, title, tags):
+        response = self.client.post('/api/articles/', {
+            "title": title,
+            "description": "be epic",
+            "body": "powering todays teams",
+            "tag_list": tags
+        }, HTTP_AUTHORIZATION=auth, format='json')
+        return json.loads(response.content)["article"]["slug"]
+
+    def articles(self, query, auth=''):
+        response = self.client.get('/api/articles/?' + query,
+                                   HTTP_AUTHORIZATION=auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [article["slug"]
+                for article in json.loads(response.content)["articles"]]
+
+    def test_filter_by_author(self):
+        """ Test articles are filtered by their author's username
+        """
+        self.assertEqual(self.articles('author=jake'), [self.kenya, self.vim])
+        self.assertEqual(self.articles('author=nobody'), [])
+
+    def test_filter_by_tags(self):
+        """ Test articles are filtered by tag, repeated tags all required
+        """
+        self.assertEqual(self.articles('tag=kenya'),
+                         [self.kenya, self.andela])
+        self.assertEqual(self.articles('tag=kenya&tag=andela'), [self.andela])
+
+    def test_filter_by_favourites_and_bookmarks(self):
+        """ Test articles are filtered by who favourited or bookmarked them
+        """
+        self.client.post('/api/articles/{}/favorite'.format(self.vim),
+                         HTTP_AUTHORIZATION=self.kibet)
+        self.client.post('/api/articles/{}/bookmark'.format(self.kenya),
+                         HTTP_AUTHORIZATION=self.kibet)
+
+        self.assertEqual(self.articles('favorited_by=kibet'), [self.vim])
+        self.assertEqual(self.articles('bookmarked_by=kibet', self.kibet),
+                         [self.kenya])
+        self.assertEqual(self.articles('favorited_by=jake'), [])
+
+    def test_bookmarks_are_private(self):
+        """ Test nobody but the owner can list a user's bookmarks
+        """
+        self.client.post('/api/articles/{}/bookmark'.format(self.kenya),
+                         HTTP_AUTHORIZATION=self.kibet)
+
+        for url in ('/api/articles/?bookmarked_by=kibet',
+                    '/api/search/articles?bookmarked_by=kibet'):
+            response = self.client.get(url, HTTP_AUTHORIZATION=self.jake)
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+            self.assertNotIn(self.kenya, response.content.decode())
+            response = self.client.get(url)
+            self.assertIn(response.status_code, (
+                status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_filter_by_dates(self):
+        """ Test articles are filtered by when they were created
+        """
+        week_ago = timezone.now() - timedelta(days=7)
+        Article.objects.filter(slug=self.andela).update(created_at=week_ago)
+        yesterday = (timezone.now() - timedelta(days=1)).date().isoformat()
+
+        self.assertEqual(self.articles('created_after=' + yesterday),
+                         [self.kenya, self.vim])
+        self.assertEqual(self.articles('created_before=' + yesterday),
+                         [self.andela])
+
+    def test_invalid_date(self):
+        """ Test an invalid date is rejected
+        """
+        response = self.client.get('/api/articles/?created_after=yesterday')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('created_after', response.content.decode())
+
+    def test_filters_compose_with_pages(self):
+        """ Test filters combine with each other and with the cursors
+        """
+        page = json.loads(self.client.get(
+            '/api/articles/?author=jake&tag=kenya&limit=1').content)
+        self.assertEqual([a["slug"] for a in page["articles"]], [self.kenya])
+        self.assertEqual(page["articlesCount"], 1)
+
+        page = json.loads(self.client.get(
+            '/api/articles/?author=jake&limit=1').content)
+        self.assertIn('author=jake', page["next"])
+        page = json.loads(self.client.get(page["next"]).content)
+        self.assertEqual([a["slug"] for a in page["articles"]], [self.vim])
+
+    def test_search_uses_filters(self):
+        """ Test structured params on search are filtered, not matched
+        against the text
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/search/articles?author=jake')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        slugs = [article["slug"]
+                 for article in json.loads(response.content)["articles"]]
+        self.assertEqual(sorted(slugs), sorted([self.kenya, self.vim]))
+        self.assertFalse(any('to_tsvector' in query['sql']
+                             for query in queries))
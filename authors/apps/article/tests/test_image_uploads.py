@@ -0,0 +1,209 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ...authentication.models import User
+from .. import uploads
+from ..models import Article, ArticleImage
+from ..storage import ImageStorage
+from ..uploads import enqueue_image, process_pending
+
+
+class BrokenStorage(ImageStorage):
+
+    def save(self, path):
+        raise IOError('storage is down')
+
+
+class LeaseCheckingStorage(ImageStorage):
+    """ Stores nothing, checking the image being uploaded is leased
+    """
+
+    def save(self, path):
+        image = ArticleImage.objects.get(spool_path=path)
+        self.leased = image.available_at > timezone.now() and \
+            not ArticleImage.objects.claim(10, ArticleImage.UPLOAD_LEASE)
+        return 'image/upload/cover.png'
+
+
+class TestImageUploads(APITestCase):
+    """ This class tests that uploaded article images are spooled and
+    stored in the background
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        self.spool = tempfile.mkdtemp()
+        self.stored = os.path.join(self.spool, 'stored')
+        settings = override_settings(
+            IMAGE_SPOOL_DIR=self.spool, LOCAL_IMAGE_ROOT=self.stored,
+            ARTICLE_IMAGE_WORKER=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(shutil.rmtree, self.spool)
+
+        user = {
+            "user": {
+                "username": "kibet",
+                "email": "kibet@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.client.post('/api/users/', user, format='json')
+        response = self.client.post('/api/users/login/', user, format='json')
+        self.auth = 'Token ' + json.loads(response.content)["user"]["token"]
+        self.client.post('/api/profile/create_profile/', {},
+                         HTTP_AUTHORIZATION=self.auth, format='json')
+
+    def post_article(self, **images):
+        article = {
+            "title": "Andela",
+            "description": "be epic",
+            "body": "powering todays teams",
+        }
+        article.update(images)
+        response = self.client.post('/api/articles/', article,
+                                    HTTP_AUTHORIZATION=self.auth,
+                                    format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return json.loads(response.content)["article"]["slug"]
+
+    def upload(self):
+        return SimpleUploadedFile(
+            'cover.PNG', b'\x89PNG not really', content_type='image/png')
+
+    def images(self, slug):
+        response = self.client.get('/api/articles/{}/images'.format(slug))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)["images"]
+
+    def test_upload_is_pending(self):
+        """ Test an uploaded image is spooled and pending after the request
+        """
+        slug = self.post_article(images=self.upload())
+
+        image = ArticleImage.objects.get()
+        self.assertEqual(image.status, ArticleImage.PENDING)
+        self.assertTrue(image.spool_path.endswith('.png'))
+        self.assertTrue(os.path.exists(image.spool_path))
+        self.assertEqual(self.images(slug), [{
+            "id": image.pk, "image": None,
+            "description": "image for article", "status": "pending"}])
+
+    def test_command_stores_pending_images(self):
+        """ Test the command stores pending images and removes the spool
+        """
+        slug = self.post_article(images=self.upload())
+        spooled = ArticleImage.objects.get().spool_path
+
+        out = StringIO()
+        call_command('process_image_uploads', '--once', stdout=out)
+
+        image = ArticleImage.objects.get()
+        self.assertIn('Attempted 1 image uploads', out.getvalue())
+        self.assertEqual(image.status, ArticleImage.READY)
+        self.assertEqual(image.spool_path, '')
+        self.assertFalse(os.path.exists(spooled))
+        name = os.path.basename(spooled)
+        self.assertTrue(os.path.exists(os.path.join(self.stored, name)))
+        self.assertEqual(self.images(slug)[0]["image"],
+                         'image/upload/local/' + name)
+
+    def test_image_reference_is_ready(self):
+        """ Test an image sent as a reference is saved without an upload
+        """
+        slug = self.post_article(images="image/upload/v1/andela.png")
+
+        self.assertEqual(self.images(slug)[0]["image"],
+                         "image/upload/v1/andela.png")
+        self.assertEqual(ArticleImage.objects.get().status,
+                         ArticleImage.READY)
+
+    def test_failed_upload_is_retried(self):
+        """ Test a failed upload is retried later with a growing delay
+        """
+        self.post_article(images=self.upload())
+
+        with self.assertLogs('authors.apps.article.uploads', 'WARNING'):
+            self.assertEqual(process_pending(storage=BrokenStorage()), 1)
+        image = ArticleImage.objects.get()
+        self.assertEqual(image.status, ArticleImage.PENDING)
+        self.assertEqual(image.attempts, 1)
+        self.assertIn('storage is down', image.last_error)
+        self.assertGreater(image.available_at, timezone.now())
+        self.assertTrue(os.path.exists(image.spool_path))
+
+        # not due yet
+        self.assertEqual(process_pending(storage=BrokenStorage()), 0)
+
+    def test_upload_is_leased(self):
+        """ Test an image is leased while it uploads, so other workers
+        skip it without a lock held
+        """
+        self.post_article(images=self.upload())
+        storage = LeaseCheckingStorage()
+
+        self.assertEqual(process_pending(storage=storage), 1)
+
+        self.assertTrue(storage.leased)
+        self.assertEqual(ArticleImage.objects.get().status,
+                         ArticleImage.READY)
+
+    def test_upload_gives_up(self):
+        """ Test an upload is marked failed after MAX_ATTEMPTS
+        """
+        self.post_article(images=self.upload())
+        spooled = ArticleImage.objects.get().spool_path
+
+        for _ in range(ArticleImage.MAX_ATTEMPTS):
+            ArticleImage.objects.update(available_at=timezone.now())
+            with self.assertLogs('authors.apps.article.uploads', 'WARNING'):
+                process_pending(storage=BrokenStorage())
+
+        image = ArticleImage.objects.get()
+        self.assertEqual(image.status, ArticleImage.FAILED)
+        self.assertEqual(image.attempts, ArticleImage.MAX_ATTEMPTS)
+        self.assertFalse(os.path.exists(spooled))
+        self.assertIsNone(ArticleImage.objects.next_due())
+
+
+class TestUploadWorker(TransactionTestCase):
+    """ This class tests the background worker the web process starts
+    """
+
+    def test_worker_stores_committed_uploads(self):
+        """ Test the worker starts on commit and stores the upload
+        """
+        spool = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool)
+        author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+        article = Article.objects.create(
+            title="Andela", description="be epic",
+            body="powering todays teams", author=author)
+
+        with override_settings(IMAGE_SPOOL_DIR=spool,
+                               LOCAL_IMAGE_ROOT=os.path.join(spool, 'stored'),
+                               ARTICLE_IMAGE_WORKER=True):
+            with transaction.atomic():
+                enqueue_image(article, SimpleUploadedFile(
+                    'cover.png', b'\x89PNG not really'))
+            for thread in threading.enumerate():
+                if isinstance(thread, uploads.UploadWorker):
+                    thread.join(10)
+
+        self.assertIsNone(uploads._worker)
+        self.assertEqual(ArticleImage.objects.get().status,
+                         ArticleImage.READY)
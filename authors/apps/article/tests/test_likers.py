@@ -0,0 +1,143 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ..models import LIKERS_PREVIEW_SIZE, ArticleLikes
+
+
+class TestLikers(APITestCase):
+    """ This class tests the paginated likers endpoints and the capped
+    likers preview on articles
+    """
+
+    client = APIClient()
+    readers = LIKERS_PREVIEW_SIZE + 1
+
+    def setUp(self):
+        """ Creates an article liked by one more reader than the preview
+        shows and disliked by its author
+        """
+        self.article = {
+            "title": "Andela",
+            "description": "be epic",
+            "body": "powering todays teams",
+            "images": ""
+        }
+
+        author_auth = self.login('kibet')
+        self.client.post('/api/profile/create_profile/', {},
+                         HTTP_AUTHORIZATION=author_auth, format='json')
+        response = self.client.post('/api/articles/', self.article,
+                                    HTTP_AUTHORIZATION=author_auth,
+                                    format='json')
+        self.slug = json.loads(response.content)["article"]["slug"]
+        self.url = '/api/articles/' + self.slug
+
+        for number in range(self.readers):
+            self.client.post(self.url + '/like',
+                             HTTP_AUTHORIZATION=self.login(
+                                 'reader{}'.format(number)),
+                             format='json')
+        self.client.post(self.url + '/dislike',
+                         HTTP_AUTHORIZATION=author_auth, format='json')
+
+    def login(self, username):
+        user = {
+            "user": {
+                "username": username,
+                "email": username + "@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.client.post('/api/users/', user, format='json')
+        response = self.client.post('/api/users/login/', user, format='json')
+        return 'Token ' + json.loads(response.content)["user"]["token"]
+
+    def get(self, url):
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_article_preview_is_capped(self):
+        """ Test an article embeds only the latest likers with full counts
+        """
+        for article in (self.get(self.url)["article"],
+                        self.get('/api/articles/')["articles"][0]):
+            self.assertEqual(article["likes_count"], self.readers)
+            self.assertEqual(len(article["likes"]), LIKERS_PREVIEW_SIZE)
+            self.assertEqual(article["likes"][0]["user"]["username"],
+                             'reader{}'.format(self.readers - 1))
+
+    def test_list_previews_in_one_query(self):
+        """ Test the previews of every listed article are read in a single
+        query, each article keeping its own latest likers and dislikers
+        """
+        auth = self.login('jake')
+        self.client.post('/api/profile/create_profile/', {},
+                         HTTP_AUTHORIZATION=auth, format='json')
+        response = self.client.post('/api/articles/', self.article,
+                                    HTTP_AUTHORIZATION=auth, format='json')
+        other = json.loads(response.content)["article"]["slug"]
+        self.client.post('/api/articles/{}/dislike'.format(other),
+                         HTTP_AUTHORIZATION=auth, format='json')
+        likes_table = ArticleLikes._meta.db_table
+
+        with CaptureQueriesContext(connection) as queries:
+            articles = {article["slug"]: article for article in
+                        self.get('/api/articles/')["articles"]}
+
+        self.assertEqual(len([query for query in queries
+                              if likes_table in query['sql']]), 1)
+        self.assertEqual(len(articles[self.slug]["likes"]),
+                         LIKERS_PREVIEW_SIZE)
+        self.assertEqual(
+            [like["user"]["username"]
+             for like in articles[self.slug]["dislikes"]], ['kibet'])
+        self.assertEqual(articles[other]["likes"], [])
+        self.assertEqual(
+            [like["user"]["username"]
+             for like in articles[other]["dislikes"]], ['jake'])
+
+    def test_likers_pages(self):
+        """ Test the likers endpoint walks every liker, newest first
+        """
+        result = self.get(self.url + '/likes?limit=4')
+        usernames = [like["user"]["username"] for like in result["users"]]
+        self.assertEqual(result["usersCount"], self.readers)
+        self.assertIsNone(result["previous"])
+
+        result = self.get(result["next"])
+        usernames += [like["user"]["username"] for like in result["users"]]
+        self.assertIsNone(result["next"])
+
+        self.assertEqual(usernames, ['reader{}'.format(number) for number
+                                     in reversed(range(self.readers))])
+
+    def test_likers_page_queries(self):
+        """ Test a page of likers takes the same queries whatever its size
+        """
+        with CaptureQueriesContext(connection) as small:
+            self.get(self.url + '/likes?limit=1')
+        with CaptureQueriesContext(connection) as large:
+            self.get(self.url + '/likes?limit=20')
+
+        self.assertEqual(len(small), len(large))
+
+    def test_dislikers(self):
+        """ Test the dislikers endpoint lists only dislikes
+        """
+        result = self.get(self.url + '/dislikes')
+
+        self.assertEqual(result["usersCount"], 1)
+        self.assertEqual(result["users"][0]["user"]["username"], 'kibet')
+
+    def test_missing_article(self):
+        """ Test listing the likers of a missing article is a 404
+        """
+        response = self.client.get('/api/articles/missing/likes',
+                                   format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
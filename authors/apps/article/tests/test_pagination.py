@@ -0,0 +1,123 @@
+import json
+
+from django.db import connection
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+
+class TestArticlePagination(APITestCase):
+    """ This class tests cursor pagination of the article list
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        """ Creates a user, a profile and five articles
+        """
+        self.user = {
+            "user": {
+                "username": "kibet",
+                "email": "kibet@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+
+        self.client.post('/api/users/', self.user, format='json')
+        response = self.client.post(
+            '/api/users/login/', self.user, format='json')
+        result = json.loads(response.content)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + result["user"]["token"])
+        self.client.post(
+            '/api/profile/create_profile/', self.user, format='json')
+
+        for number in range(5):
+            self.client.post('/api/articles/', {
+                "title": "Article {}".format(number),
+                "description": "description",
+                "body": "body",
+                "images": ""
+            }, format='json')
+
+    def get_page(self, url):
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_first_page(self):
+        """ Test the first page holds the newest articles and the total count
+        """
+        result = self.get_page('/api/articles/?limit=2')
+
+        self.assertEqual(
+            ['article-4', 'article-3'],
+            [article['slug'] for article in result['articles']])
+        self.assertEqual(result['articlesCount'], 5)
+        self.assertIsNotNone(result['next'])
+        self.assertIsNone(result['previous'])
+
+    def test_walk_pages(self):
+        """ Test following next cursors visits every article exactly once
+        """
+        slugs = []
+        url = '/api/articles/?limit=2'
+        while url:
+            result = self.get_page(url)
+            slugs += [article['slug'] for article in result['articles']]
+            url = result['next']
+
+        self.assertEqual(
+            ['article-4', 'article-3', 'article-2', 'article-1', 'article-0'],
+            slugs)
+
+    def test_previous_page(self):
+        """ Test the previous cursor returns to the page before
+        """
+        first = self.get_page('/api/articles/?limit=2')
+        second = self.get_page(first['next'])
+        back = self.get_page(second['previous'])
+
+        self.assertEqual(
+            [article['slug'] for article in first['articles']],
+            [article['slug'] for article in back['articles']])
+
+    def test_invalid_cursor(self):
+        """ Test a tampered cursor is rejected
+        """
+        response = self.client.get(
+            '/api/articles/?cursor=garbage', format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def counts(self, url):
+        """ Returns the total of a page and the COUNT queries it took
+        """
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            result = self.get_page(url)
+        return result['articlesCount'], sum(
+            'COUNT(' in query.upper() for query in queries)
+
+    def test_cached_count(self):
+        """ Test the total is counted once per filter set until an article
+        is written
+        """
+        self.assertEqual(self.counts('/api/articles/?limit=2'), (5, 1))
+        first = self.get_page('/api/articles/?limit=2')
+        self.assertEqual(self.counts(first['next']), (5, 0))
+        self.assertEqual(
+            self.counts('/api/articles/?author=kibet&limit=2'), (5, 1))
+
+        self.client.post('/api/articles/', {
+            "title": "Article 5",
+            "description": "description",
+            "body": "body",
+            "images": ""
+        }, format='json')
+        self.assertEqual(self.counts('/api/articles/?limit=2'), (6, 1))
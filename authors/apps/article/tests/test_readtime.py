@@ -1,8 +1,13 @@
 import json
 
+from django.core.management import call_command
+from django.utils.six import StringIO
 from rest_framework.test import APITestCase, APIClient
 from rest_framework.views import status
 
+from ...authentication.models import User
+from ..models import Article
+
 
 class TestArticleReadTime(APITestCase):
     """
@@ -59,3 +64,54 @@ class TestArticleReadTime(APITestCase):
         self.assertIn(
             'read_time', str(result))
         self.assertEqual(response_article.status_code, status.HTTP_200_OK)
+
+    def test_readtime_stored_on_save(self):
+        """
+        test the word count and read time are stored and follow body edits
+        """
+        article = Article.objects.create(
+            title="Andela", description="sdsd", body="word " * 600,
+            author=User.objects.get(username="chirchir"))
+        self.assertEqual(article.word_count, 600)
+        self.assertEqual(article.read_time_minutes, 3)
+
+        article = Article.objects.get(pk=article.pk)
+        article.body = "short"
+        article.save()
+        article.refresh_from_db()
+        self.assertEqual(article.word_count, 1)
+        self.assertEqual(article.read_time_minutes, 1)
+
+    def test_word_count_ignores_punctuation(self):
+        """
+        test trailing punctuation and empty bodies count no extra words
+        """
+        article = Article(body="Hello world.")
+        article.measure_body()
+        self.assertEqual(article.word_count, 2)
+
+        article.body = ""
+        article.measure_body()
+        self.assertEqual(article.word_count, 0)
+
+    def test_readtime_backfill(self):
+        """
+        test the backfill command measures articles with missing figures
+        """
+        article = Article.objects.create(
+            title="Andela", description="sdsd", body="word " * 600,
+            author=User.objects.get(username="chirchir"))
+        Article.objects.update(word_count=0, read_time_minutes=0)
+        version = Article.objects.get().version
+
+        output = StringIO()
+        call_command('backfill_read_time', chunk_size=1, stdout=output)
+
+        article.refresh_from_db()
+        self.assertEqual(article.word_count, 600)
+        self.assertEqual(article.read_time_minutes, 3)
+        self.assertEqual(article.version, version + 1)
+        call_command('backfill_read_time', stdout=StringIO())
+        article.refresh_from_db()
+        self.assertEqual(article.version, version + 1)
+        self.assertIn('Measured 1 articles', output.getvalue())
@@ -0,0 +1,76 @@
+import json
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.utils.six import StringIO
+
+from ...core.renderers import EncodedJSON, encode, prepend_fields
+from ..renderer import ArticleJSONRenderer, CommentJSONRenderer
+
+
+class TestRenderers(SimpleTestCase):
+    """ This class tests the shared envelope renderer base
+    """
+
+    def test_renders_bytes_in_envelope(self):
+        """ Test renderers return bytes with the usual envelopes
+        """
+        rendered = ArticleJSONRenderer().render([{"slug": "andela"}])
+
+        self.assertIsInstance(rendered, bytes)
+        self.assertEqual(json.loads(rendered.decode()), {
+            "articles": [{"slug": "andela"}], "articlesCount": 1})
+
+    def test_errors_have_no_envelope(self):
+        """ Test errors are rendered without an envelope
+        """
+        rendered = CommentJSONRenderer().render({"errors": {"body": "bad"}})
+
+        self.assertEqual(json.loads(rendered.decode()),
+                         {"errors": {"body": "bad"}})
+
+    def test_splices_encoded_fragments(self):
+        """ Test pre-encoded fragments are spliced in verbatim
+        """
+        fragment = EncodedJSON(b'{"slug":"andela"}')
+        rendered = ArticleJSONRenderer().render([fragment, fragment])
+
+        self.assertEqual(rendered, b'{"articles":[{"slug":"andela"},'
+                                   b'{"slug":"andela"}],"articlesCount":2}')
+
+    def test_refuses_deep_fragments(self):
+        """ Test fragments too deep to splice are not turned into strings
+        """
+        fragment = EncodedJSON(b'{"slug":"andela"}')
+
+        with self.assertRaises(TypeError):
+            encode({"nested": [fragment]})
+
+    def test_prepend_fields(self):
+        """ Test fields are added to an encoded object without decoding it
+        """
+        self.assertEqual(
+            json.loads(prepend_fields(
+                EncodedJSON(b'{"slug":"andela"}'), favourited=True).decode()),
+            {"slug": "andela", "favourited": True})
+        self.assertEqual(
+            prepend_fields(EncodedJSON(b'{}'), favourited=False),
+            b'{"favourited":false}')
+
+    @override_settings(
+        JSON_ENCODER='authors.apps.core.renderers.stdlib_encode')
+    def test_stdlib_encoder(self):
+        """ Test the stdlib encoder handles the types DRF renders
+        """
+        self.assertEqual(encode({"title": "café", "count": 1}),
+                         b'{"title":"caf\\u00e9","count":1}')
+
+    def test_benchmark(self):
+        """ Test the renderer benchmark reports each candidate
+        """
+        output = StringIO()
+        call_command('benchmark_renderers', articles=10, repeat=1,
+                     stdout=output)
+
+        self.assertIn('legacy json.dumps', output.getvalue())
+        self.assertIn('renderer stdlib', output.getvalue())
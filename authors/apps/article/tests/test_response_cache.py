@@ -0,0 +1,175 @@
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models import F
+from django.test import override_settings
+from rest_framework.test import APIClient, APITestCase
+
+from ..models import Article
+from ..serializers import ArticleSerializer
+
+
+class TestResponseCache(APITestCase):
+    """ This class tests the rendered-response cache of article reads
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        """ Creates an author with an article and a reader
+        """
+        cache.clear()
+        self.author = {
+            "user": {
+                "username": "kibet",
+                "email": "kibet@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.reader = {
+            "user": {
+                "username": "chirchir",
+                "email": "chirchir@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.article = {
+            "title": "Andela",
+            "description": "be epic",
+            "body": "powering todays teams",
+            "images": ""
+        }
+
+        self.author_auth = 'Token ' + self.login(self.author)
+        self.reader_auth = 'Token ' + self.login(self.reader)
+        for auth, user in ((self.author_auth, self.author),
+                           (self.reader_auth, self.reader)):
+            self.client.post('/api/profile/create_profile/', user,
+                             HTTP_AUTHORIZATION=auth, format='json')
+
+        response = self.client.post('/api/articles/', self.article,
+                                    HTTP_AUTHORIZATION=self.author_auth,
+                                    format='json')
+        self.slug = json.loads(response.content)["article"]["slug"]
+        self.url = '/api/articles/' + self.slug
+
+    def login(self, user):
+        self.client.post('/api/users/', user, format='json')
+        response = self.client.post('/api/users/login/', user, format='json')
+        return json.loads(response.content)["user"]["token"]
+
+    def read(self, auth=None):
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION=auth or '', format='json')
+        return json.loads(response.content)["article"]
+
+    def test_hit_skips_serializer(self):
+        """ Test a cached article is served without serializing it
+        """
+        first = self.read()
+
+        with mock.patch.object(
+                ArticleSerializer, 'to_representation') as serialize:
+            second = self.read()
+
+        serialize.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_like_invalidates(self):
+        """ Test liking an article refreshes its cached response
+        """
+        self.read()
+        self.client.post(self.url + '/like',
+                         HTTP_AUTHORIZATION=self.reader_auth, format='json')
+
+        self.assertEqual(self.read()["likes_count"], 1)
+
+    def test_comment_invalidates(self):
+        """ Test commenting on an article refreshes its cached response
+        """
+        self.read(self.reader_auth)
+        self.client.post(self.url + '/comments/',
+                         {"comment": {"body": "nice read"}},
+                         HTTP_AUTHORIZATION=self.reader_auth, format='json')
+
+        self.assertEqual(self.read(self.reader_auth)["comments_count"], 1)
+
+    def test_edit_invalidates(self):
+        """ Test editing an article refreshes its cached response
+        """
+        self.read()
+        self.client.put(self.url, {
+            "title": "Andela",
+            "description": "edited",
+            "body": "powering todays teams",
+            "tag_list": ["andela"]
+        }, HTTP_AUTHORIZATION=self.author_auth, format='json')
+
+        self.assertEqual(self.read()["description"], "edited")
+
+    def test_version_keys_responses(self):
+        """ Test a write seen only through the database's version, as one
+        made by another process, refreshes the cached response
+        """
+        self.read()
+        Article.objects.filter(slug=self.slug).update(
+            description="elsewhere", version=F('version') + 1)
+
+        self.assertEqual(self.read()["description"], "elsewhere")
+
+    def test_reused_slug(self):
+        """ Test a new article under a deleted article's slug is not served
+        the deleted article's cached response
+        """
+        self.read()
+        Article.objects.filter(slug=self.slug).delete()
+        self.client.post('/api/articles/', dict(
+            self.article, description="reborn"),
+            HTTP_AUTHORIZATION=self.author_auth, format='json')
+
+        self.assertEqual(self.read()["description"], "reborn")
+
+    def test_tags_invalidate(self):
+        """ Test retagging an article refreshes its cached response
+        """
+        self.read()
+        Article.objects.get(slug=self.slug).set_tags(["kenya"])
+
+        self.assertEqual(self.read()["tag_list"], ["kenya"])
+
+    def test_favourited_is_per_viewer(self):
+        """ Test a cached article still reports favourited per viewer
+        """
+        self.client.post(self.url + '/favorite',
+                         HTTP_AUTHORIZATION=self.reader_auth, format='json')
+
+        self.assertFalse(self.read(self.author_auth)["favourited"])
+        self.assertTrue(self.read(self.reader_auth)["favourited"])
+        self.assertFalse(self.read()["favourited"])
+
+
+class TestFileResponseCache(TestResponseCache):
+    """ This class runs the response cache tests on the file backend
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.cache_settings = override_settings(CACHES={
+            'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': cls.cache_dir,
+            }
+        })
+        cls.cache_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.cache_settings.disable()
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
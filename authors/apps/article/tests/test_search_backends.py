@@ -0,0 +1,167 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ...authentication.models import User
+from ..inverted_index import InvertedIndex, tokenize
+from ..models import Article
+from ..search import load_search_backend
+
+
+class TestInvertedIndex(TestCase):
+    """ This class tests the pure-Python inverted index
+    """
+
+    def setUp(self):
+        self.index = InvertedIndex({'title': 1.0, 'body': 0.2})
+        self.index.add(1, {'title': "Editors", 'body': "people prefer vim"})
+        self.index.add(2, {'title': "Learning vim", 'body': "motions"})
+        self.index.add(3, {'title': "Andela", 'body': "powering teams"})
+
+    def test_tokenize(self):
+        """ Test text is lowercased, stemmed and stripped of stop words
+        """
+        self.assertEqual(tokenize("The Tools of teams, tooling"),
+                         ['tool', 'team', 'tool'])
+
+    def test_scores_weighted_fields(self):
+        """ Test a match in the title outranks a match in the body
+        """
+        self.assertEqual([doc for doc, _ in self.index.search('vim')], [2, 1])
+
+    def test_requires_every_token(self):
+        """ Test only documents containing every query token match
+        """
+        self.assertEqual(
+            [doc for doc, _ in self.index.search('vim motions')], [2])
+        self.assertEqual(self.index.search('vim andela'), [])
+        self.assertEqual(self.index.search('the'), [])
+
+    def test_updates_incrementally(self):
+        """ Test documents are replaced and removed with their postings
+        """
+        self.index.add(2, {'title': "Learning emacs", 'body': "motions"})
+        self.assertEqual([doc for doc, _ in self.index.search('vim')], [1])
+
+        self.index.remove(1)
+        self.assertEqual(self.index.search('vim'), [])
+        self.assertNotIn('vim', self.index.postings)
+        self.assertEqual(len(self.index), 2)
+
+
+@override_settings(
+    ARTICLE_SEARCH_BACKEND='authors.apps.article.search.'
+    'InvertedIndexSearchBackend')
+class TestInvertedIndexBackend(APITestCase):
+    """ This class tests searching articles on the in-process index
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        load_search_backend.cache_clear()
+        self.author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+        self.editors = self.write("Editors", "some people prefer vim")
+        self.vim = self.write("Learning vim", "motions and modes")
+
+    def tearDown(self):
+        load_search_backend.cache_clear()
+
+    def write(self, title, body):
+        return Article.objects.create(
+            title=title, description="tools we use", body=body,
+            author=self.author)
+
+    def search(self, query):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/search/articles?' + query)
+        self.assertFalse(any('@@' in query['sql'] for query in queries))
+        if response.status_code == status.HTTP_404_NOT_FOUND:
+            return []
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)["articles"]
+
+    def slugs(self, query):
+        return [result["slug"] for result in self.search(query)]
+
+    def test_ranks_and_excerpts(self):
+        """ Test results are ranked without the database's text search and
+        excerpted with the matches marked
+        """
+        results = self.search('search=vim')
+        self.assertEqual([result["slug"] for result in results],
+                         [self.vim.slug, self.editors.slug])
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+        self.assertEqual(results[1]["excerpt"],
+                         "some people prefer <mark>vim</mark>")
+
+    def test_escapes_excerpts(self):
+        """ Test markup written in a body is escaped in the excerpts, with
+        only the matches marked up
+        """
+        self.write("Hacks", "<script>alert(1)</script> <b>vim</b>")
+
+        self.assertEqual(
+            self.search('search=hacks')[0]["excerpt"],
+            "&lt;script&gt;alert(1)&lt;/script&gt; &lt;b&gt;vim&lt;/b&gt;")
+        self.assertEqual(
+            self.search('search=alert vim')[0]["excerpt"],
+            "<mark>&lt;script&gt;alert(1)&lt;/script&gt;</mark> "
+            "<mark>&lt;b&gt;vim&lt;/b&gt;</mark>")
+
+    def test_follows_saves_tags_and_deletes(self):
+        """ Test the index follows articles once it is built
+        """
+        self.assertEqual(self.slugs('search=emacs'), [])
+        self.vim.title = "Learning emacs"
+        self.vim.save()
+        self.assertEqual(self.slugs('search=emacs'), [self.vim.slug])
+
+        self.editors.set_tags(['kenya'])
+        self.assertEqual(self.slugs('search=kenya'), [self.editors.slug])
+
+        self.vim.delete()
+        self.assertEqual(self.slugs('search=emacs'), [])
+
+    def test_filters(self):
+        """ Test structured filters narrow the matches
+        """
+        other = User.objects.create_user(
+            'jake', 'jake@olympians.com', 'qwerty12')
+        Article.objects.create(title="Vim for jake", description="tools",
+                               body="motions", author=other)
+
+        self.assertEqual(len(self.slugs('search=vim')), 3)
+        self.assertEqual(self.slugs('search=vim&author=kibet&limit=1'),
+                         [self.vim.slug])
+
+    def test_search_articles(self):
+        """ Test the model's search method runs on the backend
+        """
+        self.assertEqual(
+            set(Article().search_articles(['vim']).values_list(
+                'slug', flat=True)),
+            {self.vim.slug, self.editors.slug})
+
+
+class TestSearchBenchmark(TestCase):
+    """ This class tests the search backend benchmark
+    """
+
+    def test_benchmark(self):
+        """ Test both backends are measured and the corpus rolled back
+        """
+        output = StringIO()
+        call_command('benchmark_search', '--articles=20', '--queries=5',
+                     '--vocabulary=50', stdout=output)
+
+        self.assertIn('postgres', output.getvalue())
+        self.assertIn('inverted index', output.getvalue())
+        self.assertFalse(Article.objects.exists())
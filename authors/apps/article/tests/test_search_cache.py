@@ -0,0 +1,131 @@
+import json
+
+from django.contrib.postgres.search import SearchVector
+from django.db import connection
+from django.db.models import Value
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ...authentication.models import User
+from ..models import (
+    SEARCH_GENERATION, Article, ArticleFavourite, CacheGeneration)
+
+
+class TestSearchCache(APITestCase):
+    """ This class tests that repeated searches are answered from cached
+    results until an article changes
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+        self.vim = self.write("Learning vim", "motions and modes")
+        self.editors = self.write("Editors", "some people prefer vim")
+
+    def write(self, title, body):
+        return Article.objects.create(
+            title=title, description="tools we use", body=body,
+            author=self.author)
+
+    def search(self, query):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/search/articles?' + query)
+        matched = any('@@' in query['sql'] for query in queries)
+        if response.status_code == status.HTTP_404_NOT_FOUND:
+            return [], matched
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        slugs = [article["slug"]
+                 for article in json.loads(response.content)["articles"]]
+        return slugs, matched
+
+    def test_repeated_search_skips_matching(self):
+        """ Test a repeated search, however it is spelled, only loads the
+        cached articles
+        """
+        slugs, matched = self.search('search=vim&also=Learning')
+        self.assertEqual(slugs, [self.vim.slug])
+        self.assertTrue(matched)
+
+        slugs, matched = self.search('a=learning++&b=VIM')
+        self.assertEqual(slugs, [self.vim.slug])
+        self.assertFalse(matched)
+
+    def test_word_order_shares_results(self):
+        """ Test searches for the same words in any order share results
+        """
+        slugs, matched = self.search('search=learning vim')
+        self.assertEqual(slugs, [self.vim.slug])
+        self.assertTrue(matched)
+
+        slugs, matched = self.search('search=vim  Learning')
+        self.assertEqual(slugs, [self.vim.slug])
+        self.assertFalse(matched)
+
+    def test_saves_and_deletes_invalidate(self):
+        """ Test saving, tagging or deleting an article drops cached results
+        """
+        self.search('search=vim')
+        self.editors.title = "Editors for vim"
+        self.editors.save()
+        slugs, matched = self.search('search=vim')
+        self.assertTrue(matched)
+        self.assertEqual(sorted(slugs), [self.editors.slug, self.vim.slug])
+
+        self.search('search=vi')
+        self.editors.set_tags(['vi'])
+        slugs, matched = self.search('search=vi')
+        self.assertTrue(matched)
+
+        self.vim.delete()
+        slugs, matched = self.search('search=vim')
+        self.assertTrue(matched)
+        self.assertEqual(slugs, [self.editors.slug])
+
+    def test_follows_generation_in_database(self):
+        """ Test results cached by this process are dropped when another
+        process moves the corpus generation in the database
+        """
+        self.search('search=vim')
+        Article.objects.filter(pk=self.vim.pk).update(
+            search_vector=SearchVector(Value('emacs')))
+        CacheGeneration.objects.filter(name=SEARCH_GENERATION).update(
+            token='other')
+
+        slugs, matched = self.search('search=vim')
+        self.assertTrue(matched)
+        self.assertEqual(slugs, [self.editors.slug])
+
+    def test_filters_are_part_of_the_key(self):
+        """ Test searches differing only in their filters are cached apart
+        """
+        self.search('search=vim')
+        slugs, matched = self.search('search=vim&author=nobody')
+        self.assertTrue(matched)
+        self.assertEqual(slugs, [])
+
+    def test_favourites_are_not_cached(self):
+        """ Test filters on favourites, which change without saving the
+        article, are always searched
+        """
+        self.search('search=vim&favorited_by=kibet')
+        ArticleFavourite.objects.create(
+            article=self.vim, user=self.author, favourited=True)
+
+        slugs, matched = self.search('search=vim&favorited_by=kibet')
+        self.assertTrue(matched)
+        self.assertEqual(slugs, [self.vim.slug])
+
+    @override_settings(SEARCH_CACHE_DEPTH=1)
+    def test_pages_past_the_cache(self):
+        """ Test pages past the cached rows are searched again
+        """
+        self.search('search=vim&limit=1')
+        slugs, matched = self.search('search=vim&limit=1')
+        self.assertFalse(matched)
+
+        slugs, matched = self.search('search=vim&limit=1&offset=1')
+        self.assertTrue(matched)
+        self.assertEqual(slugs, [self.editors.slug])
@@ -0,0 +1,113 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ...authentication.models import User
+from ..models import Article
+
+
+class TestSearchRanking(APITestCase):
+    """ This class tests that search results are ranked, paginated and
+    excerpted
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+        self.body_match = self.write(
+            "Editors", "tools we use", "some people prefer vim for editing")
+        self.title_match = self.write(
+            "Learning vim", "tools we use", "motions and modes")
+        self.write("Andela", "be epic", "powering todays teams")
+
+    def write(self, title, description, body):
+        return Article.objects.create(
+            title=title, description=description, body=body,
+            author=self.author).slug
+
+    def search(self, query):
+        response = self.client.get('/api/search/articles?' + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_ranks_title_matches_first(self):
+        """ Test a match in the title outranks a match in the body
+        """
+        results = self.search('search=vim')["articles"]
+
+        self.assertEqual([result["slug"] for result in results],
+                         [self.title_match, self.body_match])
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+
+    def test_compact_results(self):
+        """ Test results carry a summary and a highlighted excerpt only
+        """
+        result = self.search('search=vim')["articles"][1]
+
+        self.assertEqual(
+            set(result),
+            {'slug', 'title', 'description', 'author', 'created_at',
+             'rank', 'excerpt'})
+        self.assertEqual(result["author"], 'kibet')
+        self.assertIn('<mark>vim</mark>', result["excerpt"])
+
+    def test_pages(self):
+        """ Test results are paged with limit and offset, without a count
+        """
+        first = self.search('search=vim&limit=1')
+        self.assertEqual([result["slug"] for result in first["articles"]],
+                         [self.title_match])
+        self.assertNotIn('count', first)
+        self.assertIsNone(first["previous"])
+
+        second = json.loads(self.client.get(first["next"]).content)
+        self.assertEqual([result["slug"] for result in second["articles"]],
+                         [self.body_match])
+        self.assertIsNone(second["next"])
+        self.assertIn('limit=1', second["previous"])
+
+        past_the_end = self.search('search=vim&offset=5')
+        self.assertEqual(past_the_end["articles"], [])
+
+    def test_filters_without_text(self):
+        """ Test filtering alone lists the newest articles with excerpts
+        """
+        results = self.search('author=kibet&limit=2')["articles"]
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["excerpt"], "powering todays teams")
+
+    def test_escapes_excerpts(self):
+        """ Test markup written in a body is escaped in the excerpts, with
+        only the matches marked up
+        """
+        self.write("Hacks", "tools we use",
+                   "<script>alert('vim')</script> vim & emacs")
+
+        matched = self.search('search=hacks')["articles"][0]["excerpt"]
+        self.assertNotIn('<script>', matched)
+        self.assertIn('<mark>vim</mark>', self.search(
+            'search=vim emacs')["articles"][0]["excerpt"])
+
+        newest = self.search('author=kibet&limit=1')["articles"][0]
+        self.assertEqual(
+            newest["excerpt"],
+            "&lt;script&gt;alert(&#39;vim&#39;)&lt;/script&gt; vim &amp; emacs")
+
+    def test_constant_queries(self):
+        """ Test a search page takes the same queries however many
+        articles match
+        """
+        with CaptureQueriesContext(connection) as few:
+            self.search('search=vim&limit=2')
+        for number in range(5):
+            self.write("Vim {}".format(number), "tools", "vim again")
+        with CaptureQueriesContext(connection) as many:
+            self.search('search=vim&limit=2')
+
+        self.assertEqual(len(few), len(many))
@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ...authentication.models import User
+from ..models import Article
+
+
+class TestSearchVector(TestCase):
+    """ This class tests the stored, weighted article search vector
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+        self.article = Article.objects.create(
+            title="Learning vim", description="editors are fun",
+            body="modal editing with motions", author=self.author)
+
+    def vector(self):
+        return Article.objects.values_list(
+            'search_vector', flat=True).get(pk=self.article.pk)
+
+    def search(self, *terms):
+        return list(Article().search_articles(terms).values_list(
+            'slug', flat=True))
+
+    def test_weights(self):
+        """ Test the title is weighted A, the description B and the body C
+        """
+        vector = self.vector()
+        self.assertIn("'vim':2A", vector)
+        self.assertIn("'editor':3B", vector)
+        self.assertIn("'modal':6C", vector)
+
+    def test_follows_edits(self):
+        """ Test the vector is recomputed when the text is edited
+        """
+        self.article.title = "Learning emacs"
+        self.article.save()
+
+        self.assertEqual(self.search('emacs'), [self.article.slug])
+        self.assertEqual(self.search('vim'), [])
+
+    def test_follows_tags(self):
+        """ Test tags are searchable once set, and only once per article
+        """
+        self.article.set_tags(['tooling', 'tools'])
+        self.assertEqual(self.search('tool'), [self.article.slug])
+
+        self.article.set_tags([])
+        self.assertEqual(self.search('tool'), [])
+
+    def test_search_reads_the_column(self):
+        """ Test searching matches the stored vector without joins
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.search('vim'), [self.article.slug])
+
+        sql = queries[-1]['sql']
+        self.assertIn('"search_vector" @@', sql)
+        self.assertNotIn('JOIN', sql)
+
+    def test_backfill(self):
+        """ Test the backfill command stores missing vectors
+        """
+        Article.objects.update(search_vector=None)
+        self.assertEqual(self.search('vim'), [])
+
+        output = StringIO()
+        call_command('backfill_search_vectors', '--chunk-size=1',
+                     stdout=output)
+
+        self.assertIn('Indexed 1 articles', output.getvalue())
+        self.assertEqual(self.search('vim'), [self.article.slug])
@@ -0,0 +1,122 @@
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from ...authentication.models import User
+from ..models import Article, ArticleQuerySet
+
+
+def write_article(author, title="Andela"):
+    article = Article(title=title, description="be epic",
+                      body="powering todays teams", author=author)
+    article.save()
+    return article
+
+
+class TestSlugs(TestCase):
+    """ This class tests how article slugs are allocated
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+
+    def test_suffixes(self):
+        """ Test same-titled articles get -1, -2, ... suffixes
+        """
+        slugs = [write_article(self.author).slug for _ in range(3)]
+
+        self.assertEqual(slugs, ['andela', 'andela-1', 'andela-2'])
+
+    def test_similar_titles_are_not_counted(self):
+        """ Test slugs that only start with the same words are ignored
+        """
+        write_article(self.author)
+        write_article(self.author, "Andela Kenya")
+        write_article(self.author, "Andelans")
+
+        self.assertEqual(write_article(self.author).slug, 'andela-1')
+
+    def test_reserved_slugs(self):
+        """ Test titles matching a route next to the articles are suffixed
+        """
+        self.assertEqual(write_article(self.author, "Feed").slug, 'feed-1')
+        self.assertEqual(write_article(self.author, "Feed").slug, 'feed-2')
+        self.assertEqual(write_article(self.author, "Trending").slug,
+                         'trending-1')
+
+    def test_titles_without_slug(self):
+        """ Test titles slugify leaves empty are numbered from 'article'
+        """
+        slugs = [write_article(self.author, title).slug
+                 for title in ("???", "Привет", "日本語")]
+
+        self.assertEqual(slugs, ['article', 'article-1', 'article-2'])
+
+    def test_retries_taken_slug(self):
+        """ Test a slug taken after it was picked is retried, not an error
+        """
+        write_article(self.author)
+        with mock.patch.object(ArticleQuerySet, 'next_free_slug',
+                               side_effect=['andela', 'andela-1']):
+            article = write_article(self.author)
+
+        self.assertEqual(article.slug, 'andela-1')
+
+    def test_constant_queries(self):
+        """ Test allocating a slug takes the same queries however many
+        articles share the title
+        """
+        write_article(self.author)
+        with CaptureQueriesContext(connection) as second:
+            write_article(self.author)
+        for _ in range(10):
+            write_article(self.author)
+        with CaptureQueriesContext(connection) as thirteenth:
+            article = write_article(self.author)
+
+        self.assertEqual(article.slug, 'andela-12')
+        self.assertEqual(len(second), len(thirteenth))
+
+
+class TestConcurrentSlugs(TransactionTestCase):
+    """ This class tests slug allocation under concurrent saves
+    """
+    threads = 8
+    articles_per_thread = 25
+
+    def test_parallel_same_titles(self):
+        """ Test hundreds of same-titled articles saved from parallel threads
+        all get distinct slugs
+        """
+        author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+        errors = []
+        start = threading.Barrier(self.threads)
+
+        def publish():
+            try:
+                start.wait()
+                for _ in range(self.articles_per_thread):
+                    write_article(author)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=publish)
+                   for _ in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        total = self.threads * self.articles_per_thread
+        slugs = set(Article.objects.values_list('slug', flat=True))
+        self.assertEqual(errors, [])
+        self.assertEqual(len(slugs), total)
+        self.assertEqual(
+            slugs, {'andela'} | {'andela-{}'.format(n) for n in range(1, total)})
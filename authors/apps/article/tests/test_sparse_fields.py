@@ -0,0 +1,129 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+
+class TestSparseFields(APITestCase):
+    """ This class tests the ?fields= and ?exclude= query params
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        """ Creates a user with a profile, an article and a comment
+        """
+        self.user = {
+            "user": {
+                "username": "kibet",
+                "email": "kibet@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.article = {
+            "title": "Andela",
+            "description": "be epic",
+            "body": "powering todays teams",
+            "images": "",
+            "tag_list": ["andela"]
+        }
+
+        self.client.post('/api/users/', self.user, format='json')
+        response = self.client.post(
+            '/api/users/login/', self.user, format='json')
+        result = json.loads(response.content)
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + result["user"]["token"])
+
+        response = self.client.post(
+            '/api/profile/create_profile/', self.user, format='json')
+        self.user_id = json.loads(response.content)["profile"]["username_id"]
+
+        response = self.client.post(
+            '/api/articles/', self.article, format='json')
+        self.slug = json.loads(response.content)["article"]["slug"]
+        self.client.post('/api/articles/' + self.slug + '/like',
+                         format='json')
+        response = self.client.post(
+            '/api/articles/' + self.slug + '/comments/',
+            {"comment": {"body": "nice read"}}, format='json')
+        self.comment_id = json.loads(response.content)["comment"]["id"]
+
+    def get(self, url):
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_article_list_fields(self):
+        """ Test ?fields= keeps only the listed article fields
+        """
+        result = self.get('/api/articles/?fields=title,slug,likes_count')
+
+        self.assertEqual(
+            {"title": "Andela", "slug": self.slug, "likes_count": 1},
+            result["articles"][0])
+
+    def test_article_exclude(self):
+        """ Test ?exclude= drops article fields
+        """
+        result = self.get(
+            '/api/articles/' + self.slug + '?exclude=body,likes,dislikes')
+
+        self.assertNotIn("body", result["article"])
+        self.assertNotIn("likes", result["article"])
+        self.assertEqual(result["article"]["likes_count"], 1)
+
+    def test_excluded_fields_skip_queries(self):
+        """ Test excluding likers and tags skips the queries behind them
+        """
+        # the total is counted once, then cached for both
+        self.get('/api/articles/')
+        with CaptureQueriesContext(connection) as full:
+            self.get('/api/articles/')
+        with CaptureQueriesContext(connection) as sparse:
+            self.get('/api/articles/?exclude=likes,dislikes,tag_list')
+
+        # one query for the likers and dislikers, one for the tags
+        self.assertEqual(len(full) - 2, len(sparse))
+
+    def test_comment_exclude(self):
+        """ Test ?exclude= drops comment fields
+        """
+        result = self.get('/api/articles/' + self.slug +
+                          '/comments/?exclude=subcomments,like,dislike')
+        comment = result["comments"][0]
+
+        self.assertEqual(comment["body"], "nice read")
+        self.assertNotIn("subcomments", comment)
+        self.assertNotIn("like", comment)
+
+    def test_single_comment_fields(self):
+        """ Test ?fields= on one comment leaves its nested author whole
+        """
+        result = self.get('/api/articles/{}/comments/{}?fields=body,author'
+                          .format(self.slug, self.comment_id))
+
+        self.assertEqual(set(result["comment"]), {"body", "author"})
+        self.assertEqual(
+            {"username", "bio", "image", "following"},
+            set(result["comment"]["author"]))
+
+    def test_profile_fields(self):
+        """ Test ?fields= keeps the listed profile fields and the username
+        """
+        result = self.get('/api/profile/view_profile/{}?fields=bio'.format(
+            self.user_id))
+
+        self.assertEqual(
+            {"username": "kibet", "bio": ""}, result["profile"])
+
+    def test_writes_ignore_fields(self):
+        """ Test ?fields= does not limit the fields accepted on a write
+        """
+        response = self.client.post(
+            '/api/articles/?fields=title', self.article, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("body", json.loads(response.content)["article"])
@@ -0,0 +1,123 @@
+import json
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ...authentication.models import User
+from ..models import Article
+from ..spelling import SymSpell, edit_distance, vocabulary
+
+
+class TestSymSpell(TestCase):
+    """ This class tests the symmetric delete spelling index
+    """
+
+    def setUp(self):
+        self.index = SymSpell(max_distance=2)
+        for word, count in (('learning', 3), ('leaning', 1), ('vim', 2),
+                            ('powering', 1)):
+            self.index.add(word, count)
+
+    def test_edit_distance(self):
+        """ Test edits and swaps of adjacent letters each count one
+        """
+        self.assertEqual(edit_distance('vim', 'vim', 2), 0)
+        self.assertEqual(edit_distance('vmi', 'vim', 2), 1)
+        self.assertEqual(edit_distance('lerning', 'learning', 2), 1)
+        self.assertEqual(edit_distance('emacs', 'vim', 2), 3)
+
+    def test_lookup_ranks_by_distance_then_count(self):
+        """ Test the closest and then most common words come first
+        """
+        self.assertEqual(self.index.lookup('leanring', 5),
+                         [('learning', 1, 3), ('leaning', 1, 1)])
+        self.assertEqual(self.index.lookup('vmi', 5), [('vim', 1, 2)])
+        self.assertEqual(self.index.lookup('emacs', 5), [])
+
+    def test_long_words(self):
+        """ Test words longer than the indexed prefix are corrected
+        """
+        self.index.add('internationalization')
+        self.assertEqual(
+            self.index.lookup('internationalisation', 1),
+            [('internationalization', 1, 1)])
+
+    def test_discard(self):
+        """ Test a word is forgotten once its count drops to zero
+        """
+        self.index.discard('learning', 2)
+        self.assertIn('learning', self.index)
+        self.index.discard('learning')
+        self.assertNotIn('learning', self.index)
+        self.assertEqual(self.index.lookup('lerning', 5),
+                         [('leaning', 1, 1)])
+        self.assertFalse(any('learning' in words
+                             for words in self.index.deletes.values()))
+
+
+@override_settings(SPELLING_REFRESH_INTERVAL=0)
+class TestDidYouMean(APITestCase):
+    """ This class tests that searches finding nothing suggest respelled
+    searches
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        vocabulary.index = None
+        self.author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+        self.vim = self.write("Learning vim", "motions and modes")
+        self.write("Leaning towers", "powering todays teams")
+        self.write("Learning go", "goroutines")
+
+    def write(self, title, body):
+        return Article.objects.create(
+            title=title, description="tools we use", body=body,
+            author=self.author)
+
+    def did_you_mean(self, query):
+        response = self.client.get('/api/search/articles?' + query)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        return json.loads(response.content)["did_you_mean"]
+
+    def test_suggests_corrections(self):
+        """ Test unknown words are respelled, the most common first
+        """
+        self.assertEqual(self.did_you_mean('search=lernin vmi'),
+                         ["learning vim", "leaning vim"])
+
+    def test_keeps_known_words(self):
+        """ Test only unknown words are corrected
+        """
+        self.assertEqual(self.did_you_mean('search=vim&also=towrs'),
+                         ["towers vim"])
+        self.assertEqual(self.did_you_mean('search=vim towers'), [])
+
+    def test_follows_saves_and_deletes(self):
+        """ Test the vocabulary follows saved and deleted articles
+        """
+        self.assertEqual(self.did_you_mean('search=emcas'), [])
+        self.vim.title = "Learning emacs"
+        self.vim.save()
+        self.assertEqual(self.did_you_mean('search=emcas'), ["emacs"])
+
+        self.vim.delete()
+        self.assertEqual(self.did_you_mean('search=emcas'), [])
+
+    def test_corrects_while_updating(self):
+        """ Test corrections do not wait for another thread updating the
+        vocabulary, they use the current one
+        """
+        self.did_you_mean('search=vmi')
+        vocabulary.built_at = 0
+        with vocabulary.updating:
+            self.assertEqual(vocabulary.corrections(['vmi'], 1), ["vim"])
+        self.assertEqual(vocabulary.built_at, 0)
+
+    def test_filters_only(self):
+        """ Test searches without text suggest nothing
+        """
+        self.assertEqual(self.did_you_mean('author=nobody'), [])
@@ -0,0 +1,97 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+
+class TestStreaming(APITestCase):
+    """ This class tests streaming article and comment collections
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        """ Creates a user with a profile and a commented article
+        """
+        self.user = {
+            "user": {
+                "username": "kibet",
+                "email": "kibet@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.article = {
+            "title": "Andela",
+            "description": "be epic",
+            "body": "powering todays teams",
+            "images": "",
+            "tag_list": ["andela"]
+        }
+
+        self.client.post('/api/users/', self.user, format='json')
+        response = self.client.post(
+            '/api/users/login/', self.user, format='json')
+        result = json.loads(response.content)
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + result["user"]["token"])
+        self.client.post(
+            '/api/profile/create_profile/', self.user, format='json')
+
+        self.slug = self.create_article()
+        self.client.post('/api/articles/' + self.slug + '/like',
+                         format='json')
+        self.client.post('/api/articles/' + self.slug + '/comments/',
+                         {"comment": {"body": "nice read"}}, format='json')
+
+    def create_article(self):
+        response = self.client.post(
+            '/api/articles/', self.article, format='json')
+        return json.loads(response.content)["article"]["slug"]
+
+    def stream(self, url):
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content).decode())
+
+    def test_stream_articles(self):
+        """ Test streamed articles match the paginated ones in the envelope
+        """
+        self.create_article()
+        streamed = self.stream('/api/articles/?stream=true')
+        paged = json.loads(self.client.get(
+            '/api/articles/', format='json').content)
+
+        self.assertEqual(streamed["articlesCount"], 2)
+        self.assertEqual(streamed["articles"], paged["articles"])
+
+    def test_stream_article_queries(self):
+        """ Test streaming takes the same queries however many articles
+        """
+        with CaptureQueriesContext(connection) as one:
+            self.stream('/api/articles/?stream=true')
+        for _ in range(3):
+            self.create_article()
+        with CaptureQueriesContext(connection) as four:
+            self.stream('/api/articles/?stream=true')
+
+        self.assertEqual(len(one), len(four))
+
+    def test_stream_fields(self):
+        """ Test ?fields= applies to streamed articles
+        """
+        result = self.stream('/api/articles/?stream=true&fields=slug')
+
+        self.assertEqual(result["articles"], [{"slug": self.slug}])
+
+    def test_stream_comments(self):
+        """ Test streamed comments are filtered like buffered ones
+        """
+        url = '/api/articles/' + self.slug + '/comments/'
+        streamed = self.stream(url + '?stream=true')
+        buffered = json.loads(self.client.get(url, format='json').content)
+
+        self.assertEqual(streamed, buffered)
+        self.assertNotIn("is_active", streamed["comments"][0])
@@ -0,0 +1,152 @@
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import override_settings
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ...authentication.models import User
+from ..models import Article
+from ..suggest import PrefixIndex, suggestions
+
+
+class TestPrefixIndex(TestCase):
+    """ This class tests the in-memory prefix index
+    """
+
+    def fill(self, index):
+        index.add(('article', 1), "Learning vim", 2, words=True)
+        index.add(('tag', 1), "vim", 1)
+        index.add(('article', 2), "Learning go", words=True)
+        index.add(('article', 1), "Learning emacs", 2, words=True)
+
+    def test_loading_matches_adding(self):
+        """ Test entries loaded in bulk are found like entries added one
+        at a time, re-added ones replaced
+        """
+        added = PrefixIndex()
+        self.fill(added)
+        loaded = PrefixIndex()
+        with loaded.loading():
+            self.fill(loaded)
+
+        self.assertEqual(loaded.keys, added.keys)
+        self.assertEqual(loaded.search('emacs', 5),
+                         [(('article', 1), "Learning emacs", {})])
+        self.assertEqual([entry for entry, _, _ in loaded.search('vi', 5)],
+                         [('tag', 1)])
+
+
+@override_settings(SUGGEST_REFRESH_INTERVAL=0, SUGGEST_SIZE=3)
+class TestSuggest(APITestCase):
+    """ This class tests typeahead suggestions of titles, tags and authors
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        suggestions.index = None
+        self.author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+        self.vim = self.write("Learning vim")
+        self.vim.set_tags(['vim', 'editors'])
+
+    def write(self, title):
+        return Article.objects.create(
+            title=title, description="tools we use", body="motions",
+            author=self.author)
+
+    def suggest(self, query):
+        response = self.client.get('/api/search/suggest?' + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)["suggestions"]
+
+    def texts(self, query):
+        return [(s["type"], s["text"]) for s in self.suggest(query)]
+
+    def test_suggests_titles_tags_and_authors(self):
+        """ Test each kind of suggestion is found by its prefix
+        """
+        self.assertEqual(self.texts('q=lea'), [('article', "Learning vim")])
+        self.assertEqual(self.texts('q=Edit'), [('tag', "editors")])
+        self.assertEqual(self.texts('q=kib'), [('author', "kibet")])
+        self.assertEqual(self.suggest('q=lea')[0]["slug"], self.vim.slug)
+
+    def test_matches_words_of_titles(self):
+        """ Test a title is found by any of its words
+        """
+        self.assertEqual(self.texts('q=vim'),
+                         [('tag', "vim"), ('article', "Learning vim")])
+
+    def test_ranks_and_caps(self):
+        """ Test popular articles rank first and at most SUGGEST_SIZE are
+        returned
+        """
+        for title in ("Learning go", "Learning rust", "Learning c"):
+            self.write(title)
+        Article.objects.filter(title="Learning rust").update(likes_count=5)
+
+        results = self.texts('q=learning')
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], ('article', "Learning rust"))
+        self.assertEqual(len(self.texts('q=learning&limit=1')), 1)
+
+    def test_follows_saves_and_deletes(self):
+        """ Test saved articles are suggested and deleted ones are not
+        """
+        self.assertEqual(self.texts('q=emacs'), [])
+        self.vim.title = "Learning emacs"
+        self.vim.save()
+        self.assertEqual(self.texts('q=emacs'),
+                         [('article', "Learning emacs")])
+
+        self.vim.delete()
+        self.assertEqual(self.texts('q=emacs'), [])
+
+    def test_follows_renamed_authors(self):
+        """ Test renamed and deactivated authors are refreshed
+        """
+        self.assertEqual(self.texts('q=kib'), [('author', "kibet")])
+        self.author.username = 'kiprono'
+        self.author.save()
+        self.assertEqual(self.texts('q=kib'), [])
+        self.assertEqual(self.texts('q=kip'), [('author', "kiprono")])
+
+        self.author.is_active = False
+        self.author.save()
+        self.assertEqual(self.texts('q=kip'), [])
+
+    def test_answers_while_updating(self):
+        """ Test a search does not wait for another thread updating the
+        index, it answers from the current one
+        """
+        self.suggest('q=lea')
+        suggestions.built_at = 0
+        with suggestions.updating:
+            self.assertEqual(
+                [label for _, label, _ in suggestions.search('lea', 3)],
+                ["Learning vim"])
+        self.assertEqual(suggestions.built_at, 0)
+
+    @override_settings(SUGGEST_REFRESH_INTERVAL=60)
+    def test_answers_from_memory(self):
+        """ Test a warm index answers without querying the database
+        """
+        self.suggest('q=lea')
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            self.assertEqual(self.texts('q=learn'),
+                             [('article', "Learning vim")])
+        self.assertEqual(queries, [])
+
+    def test_requires_a_phrase(self):
+        """ Test an empty phrase is rejected
+        """
+        response = self.client.get('/api/search/suggest?q=')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,150 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ..models import TAGS_GENERATION, CacheGeneration, TagCount
+
+
+class TestTagDirectory(APITestCase):
+    """ This class tests the tag directory and the articles of a tag
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        user = {
+            "user": {
+                "username": "kibet",
+                "email": "kibet@olympians.com",
+                "password": "qwerty12"
+            }
+        }
+        self.client.post('/api/users/', user, format='json')
+        response = self.client.post('/api/users/login/', user, format='json')
+        self.auth = 'Token ' + json.loads(response.content)["user"]["token"]
+        self.client.post('/api/profile/create_profile/', {},
+                         HTTP_AUTHORIZATION=self.auth, format='json')
+
+    def publish(self, tags, title="Andela"):
+        response = self.client.post('/api/articles/', {
+            "title": title,
+            "description": "be epic",
+            "body": "powering todays teams",
+            "tag_list": tags
+        }, HTTP_AUTHORIZATION=self.auth, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return json.loads(response.content)["article"]["slug"]
+
+    def retag(self, slug, tags):
+        response = self.client.put('/api/articles/' + slug, {
+            "title": "Andela",
+            "description": "be epic",
+            "body": "powering todays teams",
+            "tag_list": tags
+        }, HTTP_AUTHORIZATION=self.auth, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def tags(self, query=''):
+        response = self.client.get('/api/tags' + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(tag["name"], tag["articlesCount"])
+                for tag in json.loads(response.content)["tags"]]
+
+    def test_counts_articles_per_tag(self):
+        """ Test the directory lists tags by article count, most used first
+        """
+        self.publish(["andela", "kenya"])
+        self.publish(["andela"])
+        self.publish(["nairobi", "andela", "kenya"])
+
+        self.assertEqual(self.tags(),
+                         [("andela", 3), ("kenya", 2), ("nairobi", 1)])
+        self.assertEqual(self.tags('?limit=2'), [("andela", 3), ("kenya", 2)])
+
+    def test_counts_follow_edits_and_deletes(self):
+        """ Test retagging and deleting articles update the counts
+        """
+        first = self.publish(["andela", "kenya"])
+        second = self.publish(["andela"])
+        self.assertEqual(self.tags(), [("andela", 2), ("kenya", 1)])
+
+        self.retag(first, ["kenya", "nairobi"])
+        self.assertEqual(self.tags(),
+                         [("andela", 1), ("kenya", 1), ("nairobi", 1)])
+
+        response = self.client.delete('/api/articles/' + second,
+                                      HTTP_AUTHORIZATION=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(self.tags(), [("kenya", 1), ("nairobi", 1)])
+
+    def test_directory_is_cached(self):
+        """ Test the directory is served from the cache, reading only its
+        generation from the database, until tags change
+        """
+        self.publish(["andela"])
+        self.tags()
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            self.assertEqual(self.tags(), [("andela", 1)])
+        self.publish(["andela"])
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self.tags(), [("andela", 2)])
+
+    def test_directory_follows_database(self):
+        """ Test a count changed by another process is seen at once, as
+        the cache generation is read from the database
+        """
+        self.publish(["andela"])
+        self.tags()
+        with transaction.atomic():
+            TagCount.objects.update(articles=F('articles') + 1)
+            CacheGeneration.objects.bump(TAGS_GENERATION)
+
+        self.assertEqual(self.tags(), [("andela", 2)])
+
+    def test_articles_of_a_tag(self):
+        """ Test the articles of a tag are paginated newest first
+        """
+        first = self.publish(["andela"], "First")
+        self.publish(["kenya"], "Untagged")
+        second = self.publish(["andela", "kenya"], "Second")
+        third = self.publish(["andela"], "Third")
+
+        response = self.client.get('/api/tags/andela/articles?limit=2')
+        page = json.loads(response.content)
+        self.assertEqual([article["slug"] for article in page["articles"]],
+                         [third, second])
+        self.assertEqual(page["articlesCount"], 3)
+        page = json.loads(self.client.get(page["next"]).content)
+        self.assertEqual([article["slug"] for article in page["articles"]],
+                         [first])
+
+    def test_unknown_tag(self):
+        """ Test the articles of an unknown tag are not found
+        """
+        response = self.client.get('/api/tags/andela/articles')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_reconcile_counts(self):
+        """ Test the reconcile_counters command repairs tag counts
+        """
+        self.publish(["andela", "kenya"])
+        TagCount.objects.all().delete()
+
+        output = StringIO()
+        call_command('reconcile_counters', stdout=output)
+
+        self.assertIn('Reconciled article counts of 2 tags',
+                      output.getvalue())
+        self.assertEqual(self.tags(), [("andela", 1), ("kenya", 1)])
@@ -1,5 +1,7 @@
 import json
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase,APIClient
 from rest_framework.views import status
 
@@ -94,3 +96,77 @@ class TestCreateArticleWithTag(APITestCase):
         result = json.loads(response.content)
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_tags_constant_queries(self):
+        '''
+        the article list loads tags for the whole page in one query
+        '''
+        def list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    '/api/articles/',
+                    HTTP_AUTHORIZATION='Token ' + self.token,
+                    format='json')
+            return len(queries), json.loads(response.content)
+
+        for _ in range(2):
+            self.client.post('/api/articles/', self.article,
+                             HTTP_AUTHORIZATION='Token ' + self.token,
+                             format='json')
+        few, result = list_queries()
+
+        for _ in range(3):
+            self.client.post('/api/articles/', self.article,
+                             HTTP_AUTHORIZATION='Token ' + self.token,
+                             format='json')
+        many, result = list_queries()
+
+        self.assertEqual(few, many)
+        self.assertEqual(
+            ["andela", "kenya"], result["articles"][0]["tag_list"])
+
+    def edit_tags(self, slug, tags):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put('/api/articles/' + slug, {
+                "title": "we love Andela",
+                "description": "i love Andela",
+                "body": "andela is a cool place",
+                "tag_list": tags
+            }, HTTP_AUTHORIZATION='Token ' + self.token, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return len(queries)
+
+    def read_tags(self, slug):
+        response = self.client.get('/api/articles/' + slug, format='json')
+        return json.loads(response.content)["article"]["tag_list"]
+
+    def test_edit_tags_writes_diff(self):
+        '''
+        editing tags keeps, adds and removes only what changed
+        '''
+        response = self.client.post('/api/articles/', self.article,
+                                    HTTP_AUTHORIZATION='Token ' + self.token,
+                                    format='json')
+        slug = json.loads(response.content)["article"]["slug"]
+
+        self.edit_tags(slug, ["kenya", "nairobi", "nairobi"])
+        self.assertEqual(["kenya", "nairobi"], self.read_tags(slug))
+
+        self.edit_tags(slug, [])
+        self.assertEqual([], self.read_tags(slug))
+
+    def test_edit_tags_constant_queries(self):
+        '''
+        editing many tags takes the same queries as editing a few
+        '''
+        response = self.client.post('/api/articles/', self.article,
+                                    HTTP_AUTHORIZATION='Token ' + self.token,
+                                    format='json')
+        slug = json.loads(response.content)["article"]["slug"]
+
+        few = self.edit_tags(slug, ["kenya", "lagos"])
+        many = self.edit_tags(
+            slug, ["tag{}".format(number) for number in range(20)])
+
+        self.assertEqual(few, many)
+        self.assertEqual(20, len(self.read_tags(slug)))
@@ -0,0 +1,187 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from ...authentication.models import User
+from ...profiles.models import UserProfile
+from ..models import (
+    Article, ArticleComment, ArticleFavourite, ArticleLikes, ArticleView,
+    TrendingArticle, TrendingScore)
+from ..trending import compute_trending, pending_views
+
+
+class TestTrending(APITestCase):
+    """ This class tests the trending articles computed from engagement
+    """
+
+    client = APIClient()
+
+    def setUp(self):
+        pending_views.counts.clear()
+        self.author = User.objects.create_user(
+            'kibet', 'kibet@olympians.com', 'qwerty12')
+        self.readers = [
+            User.objects.create_user(
+                'reader{}'.format(n), 'reader{}@olympians.com'.format(n),
+                'qwerty12')
+            for n in range(3)]
+        self.andela = self.write("Andela")
+        self.epic = self.write("Epic")
+        self.teams = self.write("Teams")
+
+    def write(self, title):
+        return Article.objects.create(
+            title=title, description="be epic",
+            body="powering todays teams", author=self.author)
+
+    def like(self, article, reader, when=None):
+        like = ArticleLikes.objects.create(
+            user=reader, article=article, likes=1)
+        if when is not None:
+            ArticleLikes.objects.filter(pk=like.pk).update(created=when)
+
+    def trending(self, query=''):
+        response = self.client.get('/api/articles/trending' + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [article["slug"]
+                for article in json.loads(response.content)["articles"]]
+
+    def count_queries(self):
+        """
+        :return: the trending slugs and the number of queries reading them
+        """
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            slugs = self.trending()
+        return slugs, len(queries)
+
+    def test_ranks_weighted_engagement(self):
+        """ Test articles are ranked by their weighted engagement
+        """
+        for reader in self.readers:
+            self.like(self.epic, reader)
+        ArticleFavourite.objects.create(
+            user=self.readers[0], article=self.andela, favourited=True)
+        ArticleView.objects.create(article=self.teams)
+
+        compute_trending(timezone.now())
+
+        self.assertEqual(self.trending(), ['epic', 'andela', 'teams'])
+
+    def test_engagement_decays(self):
+        """ Test older engagement counts for less than recent engagement
+        """
+        now = timezone.now()
+        self.like(self.andela, self.readers[0], now - timedelta(hours=30))
+        self.like(self.andela, self.readers[1], now - timedelta(hours=30))
+        self.like(self.epic, self.readers[0], now)
+
+        compute_trending(now - timedelta(hours=29))
+        compute_trending(now)
+
+        self.assertEqual(self.trending(), ['epic', 'andela'])
+        score = TrendingArticle.objects.get(article=self.andela).score
+        self.assertAlmostEqual(score, 2 * 3 * 0.5 ** (30 / 24), places=5)
+
+    def test_runs_are_incremental(self):
+        """ Test a run only rescores articles with new engagement and keeps
+        what earlier runs counted
+        """
+        self.like(self.andela, self.readers[0])
+        first = compute_trending(timezone.now())
+        self.like(self.epic, self.readers[0])
+        self.like(self.epic, self.readers[1])
+        second = compute_trending(timezone.now())
+
+        self.assertEqual((first, second), (1, 1))
+        self.assertEqual(self.trending(), ['epic', 'andela'])
+        self.assertEqual(TrendingScore.objects.count(), 2)
+
+    def test_reads_are_counted(self):
+        """ Test reading an article counts towards its score
+        """
+        ArticleComment.objects.create(
+            article=self.andela, body="nice",
+            author=UserProfile.objects.create(username=self.readers[0]))
+        for _ in range(6):
+            self.client.get('/api/articles/epic')
+        self.assertFalse(ArticleView.objects.exists())
+
+        out = StringIO()
+        call_command('compute_trending', '--once', stdout=out)
+
+        self.assertIn('Updated trending scores of 2 articles', out.getvalue())
+        self.assertEqual(self.trending(), ['epic', 'andela'])
+        self.assertEqual(list(ArticleView.objects.values_list(
+            'article_id', 'count')), [('epic', 6)])
+
+    @override_settings(TRENDING_VIEW_FLUSH_INTERVAL=0)
+    def test_reads_are_written_when_due(self):
+        """ Test pending reads are written once the flush interval passes
+        """
+        self.client.get('/api/articles/epic')
+
+        self.assertEqual(ArticleView.objects.filter(article=self.epic).count(),
+                         1)
+
+    @override_settings(TRENDING_BACKFILL=60 * 60)
+    def test_prunes_counted_reads(self):
+        """ Test reads older than the last run and the backfill are deleted
+        """
+        now = timezone.now()
+        compute_trending(now - timedelta(hours=3))
+        ArticleView.objects.bulk_create([
+            ArticleView(article=self.epic, created=now - timedelta(hours=2)),
+            ArticleView(article=self.teams, created=now)])
+
+        compute_trending(now)
+
+        self.assertEqual(list(ArticleView.objects.values_list(
+            'article_id', flat=True)), ['teams'])
+
+    @override_settings(TRENDING_SIZE=2)
+    def test_keeps_top_articles(self):
+        """ Test only the top TRENDING_SIZE articles are kept and `limit`
+        pages them
+        """
+        for article, likes in ((self.andela, 1), (self.epic, 3),
+                               (self.teams, 2)):
+            for reader in self.readers[:likes]:
+                self.like(article, reader)
+
+        compute_trending(timezone.now())
+
+        self.assertEqual(self.trending(), ['epic', 'teams'])
+        self.assertEqual(self.trending('?limit=1'), ['epic'])
+
+    def test_constant_queries(self):
+        """ Test reading the trending articles takes the same queries
+        however much engagement there is
+        """
+        self.like(self.andela, self.readers[0])
+        compute_trending(timezone.now())
+        self.trending()
+        _, little = self.count_queries()
+
+        for reader in self.readers:
+            self.like(self.epic, reader)
+            self.like(self.teams, reader)
+        ArticleView.objects.bulk_create(
+            [ArticleView(article=self.teams) for _ in range(50)])
+        compute_trending(timezone.now())
+        slugs, lots = self.count_queries()
+
+        self.assertEqual(len(slugs), 3)
+        self.assertEqual(little, lots)
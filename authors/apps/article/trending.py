@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import ExpressionWrapper, F, FloatField, Sum
+from django.utils import timezone
+
+from .models import (
+    Article, ArticleComment, ArticleFavourite, ArticleLikes, ArticleView,
+    Rate, TrendingArticle, TrendingRun, TrendingScore, decay_factor)
+
+# first key of the advisory lock held while trending scores are computed
+TRENDING_LOCK_NAMESPACE = 7317
+
+# decayed scores below this are dropped from the score table
+MIN_SCORE = 0.01
+
+# the engagement counted towards trending scores, as (model, path to the
+# article's pk, timestamp field, filters, weight, field counting how many
+# times a row happened or None for once)
+ENGAGEMENT = (
+    (ArticleView, 'article__id', 'created', {}, 1, 'count'),
+    (ArticleLikes, 'article__id', 'created', {'likes': 1}, 3, None),
+    (Rate, 'article_id', 'created', {}, 4, None),
+    (ArticleComment, 'article__id', 'createdAt', {}, 5, None),
+    (ArticleFavourite, 'article_id', 'created', {'favourited': True}, 6,
+     None),
+)
+
+
+class PendingViews(object):
+    """
+    The article reads of this process not yet written to the database.
+    Reads are counted in memory and written with one insert every
+    TRENDING_VIEW_FLUSH_INTERVAL seconds, as one row an article carrying
+    its number of reads, rather than one insert a read,
+    and by compute_trending before it counts them, stamped with the time
+    they are written. A process that stops loses the reads of at most
+    that many seconds.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.flushed_at = time.monotonic()
+
+    def add(self, slug):
+        """
+        Counts a read of the article `slug`, writing the pending reads if
+        they are due
+        """
+        with self.lock:
+            self.counts[slug] += 1
+            if time.monotonic() - self.flushed_at < \
+                    settings.TRENDING_VIEW_FLUSH_INTERVAL:
+                return
+        self.flush()
+
+    def flush(self, now=None):
+        """
+        Writes the pending reads, dropping those of deleted articles
+        :param now: the time the reads are stamped with, defaults to now
+        :return: the number of reads written
+        """
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+            self.flushed_at = time.monotonic()
+        if not counts:
+            return 0
+        now = now or timezone.now()
+        try:
+            with transaction.atomic():
+                return self.write(counts, now)
+        except IntegrityError:
+            for slug in set(counts) - set(Article.objects.filter(
+                    slug__in=list(counts)).values_list('slug', flat=True)):
+                del counts[slug]
+            return self.write(counts, now)
+
+    def write(self, counts, now):
+        ArticleView.objects.bulk_create([
+            ArticleView(article_id=slug, created=now, count=count)
+            for slug, count in counts.items()])
+        return sum(counts.values())
+
+
+pending_views = PendingViews()
+
+
+def column(model, field_name):
+    """
+    Returns the quoted, table-qualified column of a model field
+    """
+    quote = connection.ops.quote_name
+    return '{}.{}'.format(quote(model._meta.db_table),
+                          quote(model._meta.get_field(field_name).column))
+
+
+def engagement_between(since, until, half_life):
+    """
+    Sums the weighted engagement of each article in (since, until],
+    decayed to `until`, with one grouped query per kind of engagement
+    :return: a dict of article pk to score
+    """
+    gained = defaultdict(float)
+    for model, article, timestamp, filters, weight, times in ENGAGEMENT:
+        score = decay_factor(column(model, timestamp), until, half_life)
+        if times:
+            score = ExpressionWrapper(score * F(times),
+                                      output_field=FloatField())
+        rows = model.objects.filter(**filters, **{
+            timestamp + '__gt': since, timestamp + '__lte': until,
+        }).values(article_pk=F(article)).annotate(
+            score=Sum(score)).order_by()
+        for row in rows:
+            gained[row['article_pk']] += weight * row['score']
+    return gained
+
+
+def compute_trending(now):
+    """
+    Adds the engagement since the last run to the stored scores and swaps
+    in the new top TRENDING_SIZE articles. Runs in one transaction, so
+    readers see either the old or the new ranking, and concurrent runs
+    take turns. Reads older than TRENDING_BACKFILL are deleted once
+    counted, as not even a first run would count them again.
+    :param now: the time scores are computed for
+    :return: the number of articles whose score changed
+    """
+    half_life = settings.TRENDING_HALF_LIFE
+    pending_views.flush(now)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s, 0)',
+                           [TRENDING_LOCK_NAMESPACE])
+        run = TrendingRun.objects.first()
+        since = run.until if run else now - timedelta(
+            seconds=settings.TRENDING_BACKFILL)
+        if since >= now:
+            return 0
+
+        gained = engagement_between(since, now, half_life)
+        scores = TrendingScore.objects.in_bulk(list(gained))
+        TrendingScore.objects.filter(pk__in=list(scores)).delete()
+        TrendingScore.objects.bulk_create([
+            TrendingScore(
+                article_id=pk, scored_at=now, score=score + (
+                    scores[pk].decayed(now, half_life) if pk in scores
+                    else 0))
+            for pk, score in gained.items()])
+
+        current = TrendingScore.objects.at(now, half_life)
+        current.filter(pk__in=current.filter(
+            current__lt=MIN_SCORE).values('pk')).delete()
+        top = current.order_by('-current', 'pk').values_list(
+            'pk', 'current')[:settings.TRENDING_SIZE]
+
+        TrendingArticle.objects.all().delete()
+        TrendingArticle.objects.bulk_create([
+            TrendingArticle(rank=rank, article_id=pk, score=score)
+            for rank, (pk, score) in enumerate(top, 1)])
+
+        ArticleView.objects.filter(created__lte=now - timedelta(
+            seconds=settings.TRENDING_BACKFILL)).delete()
+        if run:
+            run.until = now
+            run.save()
+        else:
+            TrendingRun.objects.create(until=now)
+    return len(gained)
@@ -0,0 +1,134 @@
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ArticleImage
+from .storage import get_image_storage, spool
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_image(article, upload, description="image for article"):
+    """
+    Spools an uploaded image to local disk and records it as pending, to
+    be stored by the background worker once the transaction commits
+    :param article: the article the image belongs to
+    :param upload: an UploadedFile from the request
+    :return: the pending ArticleImage
+    """
+    image = ArticleImage.objects.create(
+        article=article, description=description,
+        status=ArticleImage.PENDING, spool_path=spool(upload))
+    if settings.ARTICLE_IMAGE_WORKER:
+        transaction.on_commit(start_worker)
+    return image
+
+
+def discard_spooled(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def process_pending(batch_size=10, storage=None):
+    """
+    Stores every pending image that is due, a batch at a time. Each batch
+    is leased in a short transaction, so several workers can run at once,
+    and uploaded with no transaction open. Failures are retried later
+    with a backoff, see ArticleImage.mark_failed.
+    :param batch_size: the number of images leased at a time
+    :param storage: the storage backend, ARTICLE_IMAGE_STORAGE by default
+    :return: the number of upload attempts made
+    """
+    storage = storage or get_image_storage()
+    attempted = 0
+    while True:
+        images = ArticleImage.objects.claim(
+            batch_size, ArticleImage.UPLOAD_LEASE)
+        if not images:
+            return attempted
+        for image in images:
+            try:
+                stored = storage.save(image.spool_path)
+            except Exception as error:
+                logger.warning('Upload of article image %s failed: %r',
+                               image.pk, error)
+                record_attempt(image, error=error)
+            else:
+                record_attempt(image, stored)
+            attempted += 1
+
+
+def record_attempt(image, stored=None, error=None):
+    """
+    Records the outcome of an upload attempt on the image, unless it was
+    deleted or stored by another worker in the meantime
+    :param image: the image as it was claimed
+    :param stored: the value the storage backend returned
+    :param error: the exception the attempt raised
+    """
+    with transaction.atomic():
+        current = ArticleImage.objects.select_for_update().filter(
+            pk=image.pk, status=ArticleImage.PENDING).first()
+        if current is not None:
+            if error is None:
+                current.mark_ready(stored)
+            else:
+                current.mark_failed(error)
+    if current is None or current.status != ArticleImage.PENDING:
+        discard_spooled(image.spool_path)
+
+
+class UploadWorker(threading.Thread):
+    """
+    Stores pending images in the background of the web process, which
+    shares the spool directory with the requests that fill it. It sleeps
+    until the next retry is due and exits once nothing is pending.
+    """
+    daemon = True
+    # longest wait before checking for due images again, in seconds
+    poll_interval = 60
+
+    def run(self):
+        global _worker
+        try:
+            while True:
+                _wake.clear()
+                try:
+                    process_pending()
+                    due = ArticleImage.objects.next_due()
+                except Exception:
+                    logger.exception('Article image worker failed')
+                    due = timezone.now()
+
+                with _lock:
+                    if due is None and not _wake.is_set():
+                        _worker = None
+                        return
+                if due is not None:
+                    wait = (due - timezone.now()).total_seconds()
+                    _wake.wait(min(max(wait, 1), self.poll_interval))
+        finally:
+            connection.close()
+
+
+_worker = None
+_lock = threading.Lock()
+_wake = threading.Event()
+
+
+def start_worker():
+    """
+    Wakes the upload worker of this process, starting it if needed
+    """
+    global _worker
+    with _lock:
+        _wake.set()
+        if _worker is None:
+            _worker = UploadWorker()
+            _worker.start()
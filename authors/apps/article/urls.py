@@ -1,20 +1,27 @@
 from django.urls import path
 
-from .views import (ArticlesAPIView, RetrieveArticleAPIView, LikeAPIView, DislikeAPIView, RateAPIView, FavouriteAPIView,
+from .views import (ArticlesAPIView, FeedAPIView, TrendingAPIView, RetrieveArticleAPIView, LikeAPIView, DislikeAPIView, RateAPIView, FavouriteAPIView,
+                    LikersAPIView, DislikersAPIView, ArticleImagesAPIView,
+                    TagsAPIView, TagArticlesAPIView,
                     CommentsAPIView,
                     RetrieveCommentsAPIView, SubCommentAPIView, LikeUnlikeAPIView, CommentDislikeAPIView,
                     BookmarkAPIView,
                     BookmarksAPIView, ReportArticlesView, GetSingleReportView, GetAllReportsViews, SocialShareArticle,
-                    SearchArticles)
+                    SearchArticles, SuggestAPIView)
 
 app_name = "article"
 
 urlpatterns = [
     path('articles/', ArticlesAPIView.as_view()),
+    path('articles/feed', FeedAPIView.as_view()),
+    path('articles/trending', TrendingAPIView.as_view()),
     path('articles/<slug>', RetrieveArticleAPIView.as_view()),
     path('rate/<slug>/', RateAPIView.as_view(), name='rate'),
     path('articles/<slug>/like', LikeAPIView.as_view()),
     path('articles/<slug>/dislike', DislikeAPIView.as_view()),
+    path('articles/<slug>/likes', LikersAPIView.as_view()),
+    path('articles/<slug>/dislikes', DislikersAPIView.as_view()),
+    path('articles/<slug>/images', ArticleImagesAPIView.as_view()),
     path('articles/<slug>/comments/', CommentsAPIView.as_view()),
     path('articles/<slug>/comments/<pk>', RetrieveCommentsAPIView.as_view()),
     path('articles/<slug>/comments/<pk>/subcomment', SubCommentAPIView.as_view()),
@@ -23,9 +30,12 @@ urlpatterns = [
     path('articles/<slug>/favorite', FavouriteAPIView.as_view()),
     path('articles/<slug>/bookmark', BookmarkAPIView.as_view()),
     path('bookmarks/', BookmarksAPIView.as_view()),
+    path('tags', TagsAPIView.as_view()),
+    path('tags/<str:name>/articles', TagArticlesAPIView.as_view()),
     path('report/<slug>/', ReportArticlesView.as_view()),
     path('reports/<slug>/', GetSingleReportView.as_view()),
     path('reports/', GetAllReportsViews.as_view()),
     path("articles/<str:slug>/share/<str:provider>", SocialShareArticle.as_view(), name="share_article"),
-    path('search/articles', SearchArticles.as_view())
+    path('search/articles', SearchArticles.as_view()),
+    path('search/suggest', SuggestAPIView.as_view())
 ]
@@ -1,8 +1,17 @@
-from django.db.models import Avg
+import hashlib
+from calendar import timegm
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.db.models import Avg, Prefetch
+from django.db.models.query import prefetch_related_objects
 from django.db.utils import IntegrityError
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from django.utils.html import strip_tags
+from django.utils.http import http_date
 from django_social_share.templatetags import social_share
 
 
@@ -15,26 +24,135 @@ from rest_framework.views import APIView
 
 from ..authentication.models import User
 from ..authentication.utils import send_email
+from ..core.renderers import (
+    EncodedJSON, EnvelopeJSONRenderer, encode, prepend_fields)
+from ..core.serializers import field_requested
+from .cache import (
+    count_key, get_article_response, get_tags_response, search_key,
+    set_article_response, set_tags_response)
+from .filters import ArticleFilter
 from .models import(
-    Article, ArticleImage, ArticleLikes, Rate,
-    ArticleFavourite, ArticleComment, LikeComment, ArticleBookmark,
-    ReportArticle
+    Article, ArticleImage, ArticleLikes, Rate, FeedEntry,
+    ArticleFavourite, TagCount, TrendingArticle, ArticleComment, LikeComment,
+    ArticleBookmark, ReportArticle, CacheGeneration, SEARCH_GENERATION,
+    TAGS_GENERATION
     )
 from ..profiles.models import UserProfile, NotifyMe
 from ..profiles.serializers import NotificationSerializer
-from .renderer import ArticleJSONRenderer, CommentJSONRenderer
+from .pagination import (
+    ArticleCursorPagination, LikersCursorPagination, SearchPagination)
+from .renderer import (
+    ArticleJSONRenderer, CommentJSONRenderer, StreamingArticleJSONRenderer,
+    StreamingCommentJSONRenderer)
 from .serializers import(
-    ArticleSerializer, CommentSerializer, DeleteCommentSerializer,
-    RateSerializer, BookmarksSerializer, ReportSerializer
+    ArticleImageSerializer, ArticleSerializer, CommentSerializer,
+    DeleteCommentSerializer, LikesSerializer, RateSerializer,
+    BookmarksSerializer, ReportSerializer, SearchResultSerializer,
+    TagCountSerializer
     )
+from .search import (
+    UNCACHED_FILTERS, CachedRanking, get_search_backend, normalize_terms)
+from .spelling import vocabulary
+from .suggest import suggestions
+from .trending import pending_views
+from .uploads import enqueue_image
 from .utils import email_message
 
 
+def article_reads(request, queryset=None, shared=False):
+    """
+    Returns the article queryset for a read, loading only what the fields
+    requested with `?fields=`/`?exclude=` need
+    :param request: the request being answered
+    :param queryset: the articles to read, all of them by default
+    :param shared: leave out what is specific to the viewer, for responses
+                   cached for every viewer
+    :return: a queryset of articles
+    """
+    def wanted(name):
+        return field_requested(request, name)
+
+    if queryset is None:
+        queryset = Article.objects.all()
+    queryset = queryset.with_engagement(
+        request.user if wanted('favourited') and not shared else None,
+        likers=wanted('likes') or wanted('dislikes'))
+    if wanted('tag_list'):
+        queryset = queryset.with_tags()
+    return queryset
+
+
+def stream_requested(request):
+    """
+    Returns True if the client asked for the whole collection to be
+    streamed with `?stream=true` rather than paginated or buffered
+    """
+    return request.query_params.get('stream', '').lower() in ('1', 'true')
+
+
+def article_stamp(slug):
+    """
+    Returns the version and last activity of an article, without loading
+    the article. Versions restart when a slug is reused by a new article,
+    so the primary key, which never is, comes with them.
+    :param slug: the article's unique slug
+    :return: a (pk, version, last_activity_at) tuple, or None if there is
+             no article
+    """
+    return Article.objects.filter(slug=slug).values_list(
+        'pk', 'version', 'last_activity_at').first()
+
+
+def article_validators(request, slug, scope, stamp):
+    """
+    Returns the ETag and Last-Modified values of a read tied to an article,
+    from its version and last activity alone
+    :param request: the request being answered
+    :param slug: the article's unique slug
+    :param scope: names the representation, e.g. 'article' or 'comments'
+    :param stamp: the tuple returned by article_stamp
+    :return: an (etag, last_modified) tuple
+    """
+    pk, version, last_activity_at = stamp
+    key = ':'.join((scope, slug, str(pk), str(version), str(request.user.pk),
+                    request.META.get('QUERY_STRING', '')))
+    etag = '"{}"'.format(hashlib.md5(key.encode('utf-8')).hexdigest())
+    return etag, timegm(last_activity_at.utctimetuple())
+
+
+def not_modified(request, validators):
+    """
+    Returns a 304 response if the client's copy is still current
+    :param request: the request being answered
+    :param validators: the (etag, last_modified) tuple of the read
+    :return: a response, or None if the read must be served in full
+    """
+    etag, last_modified = validators
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        patch_vary_headers(response, ('Authorization', ))
+    return response
+
+
+def set_validators(response, validators):
+    """
+    Adds the ETag, Last-Modified and Vary headers to a full read
+    """
+    etag, last_modified = validators
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ('Authorization', ))
+    return response
+
+
 class ArticlesAPIView(APIView):
     queryset = Article.objects.all()
     permission_classes = (IsAuthenticatedOrReadOnly, )
     serializer_class = ArticleSerializer
     renderer_classes = (ArticleJSONRenderer, )
+    pagination_class = ArticleCursorPagination
+    filter_backends = (ArticleFilter, )
     lookup_field = 'slug'
 
     def post(self, request):
@@ -45,7 +163,6 @@ class ArticlesAPIView(APIView):
         """
         context = {'request': request}
         article = request.data
-        article_data = dict(article)
 
         CommentVerification().check_profile(self.request.user.id)
 
@@ -54,14 +171,8 @@ class ArticlesAPIView(APIView):
             user = request.user
             serializer.is_valid(raise_exception=True)
             article = serializer.save(author=user)
-            for key, value in article_data.items():
-                if key.startswith('image'):
-                    image = request.data["images"]
-                    article_image = ArticleImage.objects.create(
-                        article=article,
-                        image=image,
-                        description="image for article")
-
+            self.add_images(article, request.data)
+            FeedEntry.objects.fan_out(article)
 
             # Start of notification sending
             queryset = user.profile.following.all()
@@ -91,16 +202,59 @@ class ArticlesAPIView(APIView):
         except IntegrityError as e:
             raise APIException({"warning": "the slug is already used"})
 
+    def add_images(self, article, data):
+        """
+        Adds the images sent under `image*` keys to a new article. Uploaded
+        files are spooled and stored in the background, so the request does
+        not wait on the image storage; image references are saved as is.
+        :param article: the article just created
+        :param data: the request data
+        """
+        for key in data:
+            if not key.startswith('image'):
+                continue
+            values = data.getlist(key) if hasattr(data, 'getlist') else [
+                data[key]]
+            for value in values:
+                if isinstance(value, UploadedFile):
+                    enqueue_image(article, value)
+                elif value and isinstance(value, str):
+                    ArticleImage.objects.create(
+                        article=article, image=value,
+                        description="image for article")
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
     def get(self, request):
         """
-        Retrieve all articles
+        Retrieve one page of articles, newest first, or stream all of them,
+        narrowed by the filters of ArticleFilter. The total is counted once
+        per filter set and corpus generation, which every article save,
+        delete and tag change moves, except for the filters on favourites
+        and bookmarks.
         """
-        articles = Article.objects.all()
-        for article in articles:
-            article.tag_list = list(article.tag_list.names())
+        articles = self.filter_queryset(article_reads(request))
+        if stream_requested(request):
+            renderer = StreamingArticleJSONRenderer()
+            return renderer.response(
+                articles.order_by('-created_at', '-id').stream(
+                    renderer.chunk_size),
+                ArticleSerializer(context={'request': request}))
+
+        paginator = self.pagination_class()
+        filters = {param: sorted(request.query_params.getlist(param))
+                   for param in ArticleFilter.params
+                   if param in request.query_params}
+        if not set(filters).intersection(UNCACHED_FILTERS):
+            paginator.count_cache_key = count_key(
+                filters, CacheGeneration.objects.current(SEARCH_GENERATION))
+        articles = paginator.paginate_queryset(articles, request, view=self)
         serializer = ArticleSerializer(
-            articles, many=True)
-        return Response(serializer.data)
+            articles, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     def destroy(self, request, slug):
         """
@@ -146,10 +300,63 @@ class ArticlesAPIView(APIView):
             return Response(response, status=status.HTTP_401_UNAUTHORIZED)
 
 
+class FeedAPIView(APIView):
+    """ This class returns one page of the articles written by the authors
+    the user follows, newest first
+    """
+    permission_classes = (IsAuthenticated, )
+    renderer_classes = (ArticleJSONRenderer, )
+    pagination_class = ArticleCursorPagination
+
+    def get(self, request):
+        """
+        :param request: the request, may carry `cursor` and `limit`
+        :return: http Response with one page of articles
+        """
+        paginator = self.pagination_class()
+        entries = paginator.paginate_queryset(
+            FeedEntry.objects.filter(user=request.user), request, view=self)
+        prefetch_related_objects(
+            entries, Prefetch('article', queryset=article_reads(request)))
+        serializer = ArticleSerializer(
+            [entry.article for entry in entries], many=True,
+            context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+
+class TrendingAPIView(APIView):
+    """ This class returns the trending articles, as ranked by the last run
+    of the compute_trending command
+    """
+    renderer_classes = (ArticleJSONRenderer, )
+    page_size = 20
+    page_size_query_param = 'limit'
+
+    def get(self, request):
+        """
+        :param request: the request, may carry `limit`
+        :return: http Response with the top articles
+        """
+        try:
+            limit = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            limit = self.page_size
+        limit = max(1, min(limit, settings.TRENDING_SIZE))
+
+        ranks = list(TrendingArticle.objects.order_by('rank')[:limit])
+        prefetch_related_objects(
+            ranks, Prefetch('article', queryset=article_reads(request)))
+        serializer = ArticleSerializer(
+            [rank.article for rank in ranks], many=True,
+            context={'request': request})
+        return Response(serializer.data)
+
+
 class RetrieveArticleAPIView(APIView):
     """
     this class that handles the get request with slug
     """
+    renderer_classes = (EnvelopeJSONRenderer, )
 
     def get(self, request, slug):
         """
@@ -157,13 +364,35 @@ class RetrieveArticleAPIView(APIView):
         :param slug: This is the article slug
         :return: Response to the user
         """
+        stamp = article_stamp(slug)
         try:
-            article = Article.objects.get(slug=slug)
-            article.tag_list = list(article.tag_list.names())
-            serializer = ArticleSerializer(
-                article, many=False, context={'request': self.request})
-            return Response({'article': serializer.data},
-                            status=status.HTTP_200_OK)
+            if stamp is None:
+                raise Article.DoesNotExist
+            validators = article_validators(request, slug, 'article', stamp)
+            pending_views.add(slug)
+            response = not_modified(request, validators)
+            if response is not None:
+                return response
+
+            # the article is cached encoded, without favourited, and spliced
+            # into the response as is
+            key, data = get_article_response(request, slug, stamp[:2])
+            if data is None:
+                article = article_reads(request, shared=True).get(slug=slug)
+                data = ArticleSerializer(
+                    article, many=False, context={'request': self.request}).data
+                data.pop('favourited', None)
+                data = EncodedJSON(encode(data))
+                set_article_response(key, data)
+
+            if field_requested(request, 'favourited'):
+                data = prepend_fields(
+                    data, favourited=request.user.is_authenticated and
+                    ArticleFavourite.objects.filter(
+                        user=request.user, article__slug=slug).exists())
+            return set_validators(
+                Response({'article': data}, status=status.HTTP_200_OK),
+                validators)
         except Article.DoesNotExist:
             return Response(
                 {"message": "The article requested does not exist"},
@@ -246,17 +475,28 @@ class RateAPIView(GenericAPIView):
                 detail={'message': 'You cannot rate your own article'})
 
         # updates a user's rating if it already exists
+        previous_rating = None
         try:
             # Update Rating if Exists
             current_rating = Rate.objects.get(
                 user=request.user.id, article=article.id)
+            previous_rating = current_rating.your_rating
             serializer = self.serializer_class(current_rating, data=rate)
         except Rate.DoesNotExist:
             #  Create rating if not founds
             serializer = self.serializer_class(data=rate)
 
         serializer.is_valid(raise_exception=True)
-        serializer.save(user=request.user, article=article)
+        with transaction.atomic():
+            rating = serializer.save(user=request.user, article=article)
+            if previous_rating is None:
+                Article.update_counters(
+                    article.slug, rating_sum=rating.your_rating,
+                    rating_count=1)
+            else:
+                Article.update_counters(
+                    article.slug,
+                    rating_sum=rating.your_rating - previous_rating)
 
         return Response({
             'message': 'rate_success',
@@ -333,7 +573,11 @@ class RateAPIView(GenericAPIView):
             elif article.author != request.user:
                 # get user rating and delete
                 rating = self.get_rating(user=request.user, article=article)
-                rating.delete()
+                with transaction.atomic():
+                    rating.delete()
+                    Article.update_counters(
+                        article.slug, rating_sum=-rating.your_rating,
+                        rating_count=-1)
                 return Response({'message': 'Deleted successfully'},
                                 status=status.HTTP_200_OK)
             else:
@@ -374,6 +618,113 @@ class DislikeAPIView(APIView):
         return message
 
 
+class LikersAPIView(APIView):
+    """ This class lists the users who liked an Article, newest first
+    :return: one page of users and the total number of likes
+    """
+    permission_classes = (IsAuthenticatedOrReadOnly, )
+    pagination_class = LikersCursorPagination
+    reaction = {'likes': 1}
+    counter_field = 'likes_count'
+
+    def get(self, request, slug):
+        """
+        :param request: the request, may carry `cursor` and `limit`
+        :param slug: Article slug field
+        :return: http Response with one page of users
+        """
+        article = get_object_or_404(
+            Article.objects.only('slug', self.counter_field), slug=slug)
+
+        paginator = self.pagination_class()
+        paginator.total = getattr(article, self.counter_field)
+        reactions = paginator.paginate_queryset(
+            ArticleLikes.objects.filter(
+                article=slug, **self.reaction).select_related(
+                    'user__profile'),
+            request, view=self)
+        serializer = LikesSerializer(reactions, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class DislikersAPIView(LikersAPIView):
+    """ This class lists the users who disliked an Article, newest first
+    :return: one page of users and the total number of dislikes
+    """
+    reaction = {'dislikes': -1}
+    counter_field = 'dislikes_count'
+
+
+class ArticleImagesAPIView(APIView):
+    """ This class lists the images of an Article with their upload status
+    :return: the images, oldest first
+    """
+    permission_classes = (IsAuthenticatedOrReadOnly, )
+
+    def get(self, request, slug):
+        """
+        :param request: the request
+        :param slug: Article slug field
+        :return: http Response with the images
+        """
+        article = get_object_or_404(Article.objects.only('pk'), slug=slug)
+        serializer = ArticleImageSerializer(
+            article.article_images.all(), many=True)
+        return Response({'images': serializer.data})
+
+
+class TagsAPIView(APIView):
+    """ This class lists the tags in use with their article counts, most
+    used first. `?limit=` keeps only the most used tags, for a tag cloud.
+    """
+    renderer_classes = (EnvelopeJSONRenderer, )
+
+    def get(self, request):
+        """
+        :param request: the request, may carry `limit`
+        :return: http Response with the tags
+        """
+        key, data = get_tags_response(
+            request, CacheGeneration.objects.current(TAGS_GENERATION))
+        if data is None:
+            counts = TagCount.objects.filter(articles__gt=0).select_related(
+                'tag').order_by('-articles', 'tag__name')
+            try:
+                counts = counts[:max(0, int(request.query_params['limit']))]
+            except (KeyError, ValueError):
+                pass
+            tags = TagCountSerializer(counts, many=True).data
+            data = EncodedJSON(encode(
+                {'tags': tags, 'tagsCount': len(tags)}))
+            set_tags_response(key, data)
+        return Response(data)
+
+
+class TagArticlesAPIView(APIView):
+    """ This class returns one page of the articles with a tag, newest
+    first
+    """
+    renderer_classes = (ArticleJSONRenderer, )
+    pagination_class = ArticleCursorPagination
+
+    def get(self, request, name):
+        """
+        :param request: the request, may carry `cursor` and `limit`
+        :param name: the tag name
+        :return: http Response with one page of articles
+        """
+        count = get_object_or_404(
+            TagCount.objects.select_related('tag'), tag__name=name)
+        paginator = self.pagination_class()
+        paginator.total = count.articles
+        articles = paginator.paginate_queryset(
+            article_reads(request).filter(tag_list__id=count.tag_id),
+            request, view=self)
+        serializer = ArticleSerializer(
+            articles, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+
 class CommentVerification(object):
     def article_exists(self, slug):
         try:
@@ -452,7 +803,9 @@ class CommentsAPIView(APIView):
         serializer = self.serializer_class(
             data=new_comment, context={'request': self.request})
         serializer.is_valid(raise_exception=True)
-        serializer.save(author=request.user.profile)
+        with transaction.atomic():
+            serializer.save(author=request.user.profile)
+            Article.update_counters(slug, comments_count=1)
 
 
         # Start of notification sending
@@ -467,14 +820,29 @@ class CommentsAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def get(self, request, slug):
-        CommentVerification.article_exists(self, slug)
+        stamp = article_stamp(slug)
+        if stamp is None:
+            APIException.status_code = status.HTTP_404_NOT_FOUND
+            raise APIException({"error": "Article does not exist!"})
+        validators = article_validators(request, slug, 'comments', stamp)
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+
+        comments = ArticleComment.objects.filter(
+            article=slug, parent_comment=None)
+        if stream_requested(request):
+            renderer = StreamingCommentJSONRenderer()
+            return set_validators(renderer.response(
+                comments.iterator(chunk_size=renderer.chunk_size),
+                self.serializer_class(context={'request': self.request})),
+                validators)
 
         serializer = self.serializer_class(
-            ArticleComment.objects.filter(article=slug, parent_comment=None),
-            many=True,
-            context={'request': self.request})
+            comments, many=True, context={'request': self.request})
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(
+            Response(serializer.data, status=status.HTTP_200_OK), validators)
 
 
 class RetrieveCommentsAPIView(APIView):
@@ -505,7 +873,9 @@ class RetrieveCommentsAPIView(APIView):
             partial=True,
             context={'request': self.request})
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
+            Article.update_counters(kwargs['slug'])
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -520,7 +890,9 @@ class RetrieveCommentsAPIView(APIView):
         serializer = DeleteCommentSerializer(
             delete_comment, data={"is_active": False})
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
+            Article.update_counters(kwargs['slug'], comments_count=-1)
 
         return Response({"message": "comment deleted successfully"},
                         status=status.HTTP_202_ACCEPTED)
@@ -543,8 +915,10 @@ class SubCommentAPIView(APIView):
         serializer = self.serializer_class(
             data=new_comment, context={'request': self.request})
         serializer.is_valid(raise_exception=True)
-        serializer.save(
-            author=request.user.profile, parent_comment=parent_article)
+        with transaction.atomic():
+            serializer.save(
+                author=request.user.profile, parent_comment=parent_article)
+            Article.update_counters(kwargs['slug'], comments_count=1)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -569,8 +943,10 @@ class LikeUnlikeAPIView(APIView):
         like_comment = CommentVerification.comment_exists(
             self, kwargs['slug'], kwargs['pk'])
 
-        return_message = LikeComment.comment_like_unlike(
-            request.user.profile, like_comment.id)
+        with transaction.atomic():
+            return_message = LikeComment.comment_like_unlike(
+                request.user.profile, like_comment.id)
+            Article.update_counters(kwargs['slug'])
 
         return Response(return_message, status=status.HTTP_200_OK)
 
@@ -584,8 +960,10 @@ class CommentDislikeAPIView(APIView):
         like_comment = CommentVerification.comment_exists(
             self, kwargs['slug'], kwargs['pk'])
 
-        return_message = LikeComment.comment_dislike(request.user.profile,
-                                                     like_comment.id)
+        with transaction.atomic():
+            return_message = LikeComment.comment_dislike(
+                request.user.profile, like_comment.id)
+            Article.update_counters(kwargs['slug'])
 
         return Response(return_message, status=status.HTTP_200_OK)
 
@@ -620,8 +998,10 @@ class FavouriteAPIView(APIView):
                 status=status.HTTP_406_NOT_ACCEPTABLE)
 
         except ArticleFavourite.DoesNotExist:
-            favourited = ArticleFavourite.objects.create(
-                user=request.user, article=article, favourited=True)
+            with transaction.atomic():
+                favourited = ArticleFavourite.objects.create(
+                    user=request.user, article=article, favourited=True)
+                Article.update_counters(slug, favourites_count=1)
             response = {"message": "Successfully favourited the article"}
             return Response(response, status=status.HTTP_202_ACCEPTED)
 
@@ -643,7 +1023,9 @@ class FavouriteAPIView(APIView):
                 user=request.user, article=article)
             article = ArticleFavourite.objects.get(
                 user=request.user, article=article, favourited=True)
-            article.delete()
+            with transaction.atomic():
+                article.delete()
+                Article.update_counters(slug, favourites_count=-1)
             return Response({"success": "you have successfully deleted"},
                             status=status.HTTP_202_ACCEPTED)
 
@@ -696,9 +1078,11 @@ class BookmarksAPIView(APIView):
     def get(self, request):
         CommentVerification.check_profile(self, request.user.id)
 
-        articles = ArticleBookmark.objects.filter(user=request.user.id)
-        for bookmark in articles:
-            bookmark.article.tag_list = list(bookmark.article.tag_list.names())
+        articles = ArticleBookmark.objects.filter(
+            user=request.user.id).prefetch_related(Prefetch(
+                'article',
+                queryset=Article.objects.with_engagement(
+                    request.user).with_tags()))
 
         serializer = self.serializer_class(articles, many=True)
 
@@ -900,32 +1284,80 @@ class SocialShareArticle(RetrieveAPIView):
 
 class SearchArticles(APIView):
     """This class creates a view to perform search and filtering on articles.
+    Results are ranked by how well they match, paginated with `limit` and
+    `offset`, and show an excerpt with the matches highlighted.
     :returns: a http Response message
     """
+    pagination_class = SearchPagination
 
     def get(self, request):
         """This method creates a GET APIView to search for or filter Articles
         :params request: this is the HTTP request object
         :returns: Returns a HTTP Response object
         """
-
+        paginator = self.pagination_class()
         query_params = dict(request.GET.items())
+        for param in ('fields', 'exclude', paginator.limit_query_param,
+                      paginator.offset_query_param):
+            query_params.pop(param, None)
         if not query_params:
             return Response({'message': 'Please provide a search phrase'},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        query_params_values = list(query_params.values())
-        query = Article().search_articles(query_params_values)
-
-        if not query:
+        # structured params are filtered on their indexes, only the rest
+        # is matched against the text
+        filters = {param: sorted(request.query_params.getlist(param))
+                   for param in ArticleFilter.params
+                   if query_params.pop(param, None) is not None}
+        terms = normalize_terms(query_params.values())
+        backend = get_search_backend()
+        articles = ArticleFilter().filter_queryset(
+            request, Article.objects.all(), self)
+
+        key = None
+        if not set(filters).intersection(UNCACHED_FILTERS):
+            key = search_key(
+                settings.ARTICLE_SEARCH_BACKEND, terms, filters,
+                CacheGeneration.objects.current(SEARCH_GENERATION))
+        page = paginator.paginate_queryset(
+            CachedRanking(backend.rank(articles, terms), key),
+            request, view=self)
+        if not page and not paginator.offset:
             return Response({
                 'message':
-                'Sorry we could not find what you are looking for.'
+                'Sorry we could not find what you are looking for.',
+                'did_you_mean': vocabulary.corrections(
+                    terms, settings.SPELLING_SIZE) if terms else []
             },
                             status=status.HTTP_404_NOT_FOUND)
 
-        for article in query:
-            article.tag_list = list(article.tag_list.names())
-        serializer = ArticleSerializer(query, many=True)
-        return Response({'article': serializer.data},
-                        status=status.HTTP_200_OK)
+        serializer = SearchResultSerializer(
+            backend.results(page, terms), many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class SuggestAPIView(APIView):
+    """ This class suggests article titles, tags and authors while a search
+    phrase is typed, from an index held in memory
+    """
+
+    def get(self, request):
+        """
+        :param request: the request, carries the typed prefix as `q` and
+        may carry `limit`
+        :return: http Response with the best suggestions first
+        """
+        prefix = request.query_params.get('q', '').strip()
+        if not prefix:
+            return Response({'message': 'Please provide a search phrase'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params['limit'])
+        except (KeyError, ValueError):
+            limit = settings.SUGGEST_SIZE
+        limit = max(1, min(limit, settings.SUGGEST_SIZE))
+
+        return Response({'suggestions': [
+            dict(data, type=kind, text=label)
+            for (kind, _), label, data in suggestions.search(prefix, limit)
+        ]})
@@ -81,8 +81,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     # A timestamp representing when this object was created.
     created_at = models.DateTimeField(auto_now_add=True)
 
-    # A timestamp reprensenting when this object was last updated.
-    updated_at = models.DateTimeField(auto_now=True)
+    # A timestamp reprensenting when this object was last updated. Indexed
+    # for the search suggestions, which re-read the users saved since they
+    # were last refreshed.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     # More fields required by Django when specifying a custom user model.
 
@@ -1,30 +1,7 @@
-import json
+from ..core.renderers import TokenEnvelopeJSONRenderer
 
-from rest_framework.renderers import JSONRenderer
 
-
-class UserJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        # If the view throws an error (such as the user can't be authenticated
-        # or something similar), `data` will contain an `errors` key. We want
-        # the default JSONRenderer to handle rendering errors, so we need to
-        # check for this case.
-        errors = data.get('errors', None)
-        token = data.get('token', None)
-
-        if errors is not None:
-            # As mentioned about, we will let the default JSONRenderer handle
-            # rendering errors.
-            return super(UserJSONRenderer, self).render(data)
-
-        if token is not None and isinstance(token, bytes):
-            # We will decode `token` if it is of type
-            # bytes.
-            data['token'] = token.decode('utf-8')
-
-        # Finally, we can render our data under the "user" namespace.
-        return json.dumps({
-            'user': data
-        })
+class UserJSONRenderer(TokenEnvelopeJSONRenderer):
+    # Errors are rendered as they are; everything else goes under the
+    # "user" namespace.
+    envelope = 'user'
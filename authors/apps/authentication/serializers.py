@@ -184,6 +184,25 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
+class AuthorSerializer(serializers.ModelSerializer):
+    """
+    Read-only public representation of a user embedded in other resources.
+
+    Unlike `UserSerializer` it exposes no email or token, so embedding it
+    does not sign a JWT per user. Select `profile` along with the user to
+    keep it to a single query.
+    """
+    bio = serializers.CharField(
+        source='profile.bio', default='', read_only=True)
+    avatar = serializers.CharField(
+        source='profile.avatar', default=None, read_only=True)
+
+    class Meta:
+        model = User
+        fields = ('username', 'bio', 'avatar')
+        read_only_fields = ('username',)
+
+
 class SocialSerializer(serializers.Serializer):
     access_token = serializers.CharField(max_length=270, required=True)
     access_token_secret = serializers.CharField(max_length=300, allow_blank=True)
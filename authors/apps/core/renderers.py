@@ -0,0 +1,167 @@
+import json
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class EncodedJSON(bytes):
+    """
+    A value that is already encoded as UTF-8 JSON. The renderers splice it
+    into the response as is instead of decoding and encoding it again.
+    """
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """
+    DRF's encoder, refusing EncodedJSON nested too deep to be spliced
+    rather than turning it into a string
+    """
+
+    def default(self, obj):
+        if isinstance(obj, EncodedJSON):
+            raise TypeError(
+                'EncodedJSON can only be spliced into the top level of the '
+                'data or directly inside a top-level list or dict')
+        return super(JSONEncoder, self).default(obj)
+
+
+def stdlib_encode(data):
+    """
+    Encodes `data` with the standard library, handling the same types as
+    DRF's JSONRenderer. Non-ASCII text is escaped, which the C encoder
+    does faster than it builds unicode output.
+    :return: UTF-8 encoded JSON
+    """
+    return json.dumps(
+        data, cls=JSONEncoder, separators=(',', ':')).encode('utf-8')
+
+
+def orjson_encode(data):
+    """
+    Encodes `data` with orjson, falling back to DRF's encoder for the
+    types orjson does not know
+    :return: UTF-8 encoded JSON
+    """
+    return orjson.dumps(data, default=JSONEncoder().default)
+
+
+def get_encoder():
+    """
+    Returns the function the renderers encode JSON with. JSON_ENCODER
+    names one by dotted path; by default orjson is used when installed and
+    the standard library otherwise.
+    """
+    path = getattr(settings, 'JSON_ENCODER', None)
+    if path:
+        return import_string(path)
+    if orjson is not None:
+        return orjson_encode
+    return stdlib_encode
+
+
+def encode(data):
+    """
+    Encodes `data` to JSON bytes, splicing in any EncodedJSON values at the
+    top level or directly inside a top-level list or dict
+    """
+    if isinstance(data, EncodedJSON):
+        return data
+    if isinstance(data, list) and any(
+            isinstance(item, EncodedJSON) for item in data):
+        return b'[' + b','.join(encode(item) for item in data) + b']'
+    if isinstance(data, dict) and any(
+            isinstance(value, EncodedJSON) for value in data.values()):
+        return b'{' + b','.join(
+            encode(str(key)) + b':' + encode(value)
+            for key, value in data.items()) + b'}'
+    return get_encoder()(data)
+
+
+def encode_object(pairs):
+    """
+    Encodes (key, value) pairs as a JSON object in a single join. Values
+    given as bytes are taken to be encoded JSON and spliced in as is, so
+    an envelope costs no copy of the payload beyond the final one.
+    :param pairs: an iterable of (key, value) tuples
+    :return: UTF-8 encoded JSON
+    """
+    parts = [b'{']
+    for key, value in pairs:
+        if len(parts) > 1:
+            parts.append(b',')
+        parts.append(encode(str(key)))
+        parts.append(b':')
+        parts.append(value if isinstance(value, bytes) else encode(value))
+    parts.append(b'}')
+    return b''.join(parts)
+
+
+def prepend_fields(fragment, **fields):
+    """
+    Adds `fields` to an encoded JSON object without decoding it
+    :param fragment: an EncodedJSON object, e.g. b'{"a":1}'
+    :return: an EncodedJSON object with the fields at the front
+    """
+    if not fields:
+        return fragment
+    head = encode(fields)[:-1]
+    if fragment == b'{}':
+        return EncodedJSON(head + b'}')
+    return EncodedJSON(head + b',' + fragment[1:])
+
+
+class EnvelopeJSONRenderer(JSONRenderer):
+    """
+    Base for the app renderers, which wrap the response data in an
+    envelope such as `{"user": ...}`. The data is encoded once with the
+    configured encoder and the envelope is spliced around the bytes.
+
+    Subclasses set `envelope` and may override `prepare` to adjust the
+    data first. Errors, and all data when `envelope` is None, are rendered
+    without an envelope.
+    """
+    charset = 'utf-8'
+    envelope = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict) and data.get('errors', None) is not None:
+            return encode(data)
+        return self.wrap(self.prepare(data))
+
+    def prepare(self, data):
+        """
+        Returns the data to put in the envelope
+        """
+        return data
+
+    def wrap(self, data, **extra):
+        """
+        Encodes `data` under the envelope key, followed by any `extra` keys
+        """
+        if self.envelope is None:
+            return encode(data)
+        return encode_object(
+            [(self.envelope, encode(data))] + list(extra.items()))
+
+
+class TokenEnvelopeJSONRenderer(EnvelopeJSONRenderer):
+    """
+    An envelope renderer that decodes a `token` given as bytes
+    """
+
+    def prepare(self, data):
+        if not isinstance(data, dict):
+            return data
+        token = data.get('token', None)
+        if token is not None and isinstance(token, bytes):
+            data['token'] = token.decode('utf-8')
+        return data
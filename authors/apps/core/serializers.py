@@ -0,0 +1,67 @@
+from rest_framework.serializers import ListSerializer
+
+
+def requested_fields(request):
+    """
+    Returns the field names a client asked for on a read.
+    `?fields=a,b` keeps only those fields and `?exclude=a,b` drops them.
+    Writes always get every field so validation is unaffected.
+    :param request: the request, may be None
+    :return: a (fields, exclude) tuple; fields is None when not limited
+    """
+    if request is None or request.method != 'GET':
+        return None, set()
+
+    def split(param):
+        value = request.query_params.get(param)
+        if value is None:
+            return None
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    return split('fields'), split('exclude') or set()
+
+
+def field_requested(request, name):
+    """
+    Returns True if the response to `request` will include field `name`
+    """
+    fields, exclude = requested_fields(request)
+    return name not in exclude and (fields is None or name in fields)
+
+
+class DynamicFieldsMixin(object):
+    """
+    Lets a serializer drop fields the client did not ask for, through the
+    `fields`/`exclude` keyword arguments or the query string of the request
+    in its context. Dropped fields are removed before serialization, so the
+    queries and computation behind them never run.
+
+    The query string only applies to the top-level serializer, not to
+    serializers nested inside it. Names in `always_include` are kept
+    regardless, for renderers that rely on them.
+    """
+    always_include = ()
+
+    def __init__(self, *args, **kwargs):
+        self._fields_only = kwargs.pop('fields', None)
+        self._fields_exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, exclude = self._fields_only, set(self._fields_exclude or ())
+
+        if only is None and not exclude and self.is_top_level():
+            only, exclude = requested_fields(self.context.get('request'))
+
+        for name in list(fields):
+            if name in self.always_include:
+                continue
+            if name in exclude or (only is not None and name not in only):
+                fields.pop(name)
+        return fields
+
+    def is_top_level(self):
+        parent = self.parent
+        return parent is None or (
+            isinstance(parent, ListSerializer) and parent.parent is None)
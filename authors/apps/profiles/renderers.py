@@ -1,77 +1,25 @@
-from django.utils.timezone import now
+from ..core.renderers import TokenEnvelopeJSONRenderer
 
-import json
 
-from rest_framework.renderers import JSONRenderer
+class ProfileJSONRenderer(TokenEnvelopeJSONRenderer):
+    envelope = 'profile'
 
-
-class ProfileJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        # If the view throws an error (such as the user can't be authenticated
-        # or something similar), `data` will contain an `errors` key. We want
-        # the default JSONRenderer to handle rendering errors, so we need to
-        # check for this case.
-        errors = data.get('errors', None)
-        token = data.get('token', None)
-
-        if errors is not None:
-            # As mentioned about, we will let the default JSONRenderer handle
-            # rendering errors.
-            return super(ProfileJSONRenderer, self).render(data)
-
-        if token is not None and isinstance(token, bytes):
-            # We will decode `token` if it is of type
-            # bytes.
-            data['token'] = token.decode('utf-8')
+    def prepare(self, data):
+        data = super(ProfileJSONRenderer, self).prepare(data)
 
         # Append Cloudinary URL prefix to stored avatar link
-        if data.get("avatar"):
+        if isinstance(data, dict) and data.get("avatar"):
             avatar_prefix = "https://res.cloudinary.com/jumakahiga/"
             data["avatar"] = avatar_prefix + data["avatar"]
 
-        # Finally, we can render our data under the "user" namespace.
-        return json.dumps({
-            'profile': data
-        })
-
-class FollowListJSONRenderer(JSONRenderer):
-    """Renders followers/following list. """
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        errors = data.get('errors', None)
-        token = data.get('token', None)
+        return data
 
-        if errors is not None:
-            return super(FollowListJSONRenderer, self).render(data)
 
-        if token is not None and isinstance(token, bytes):
-            data['token'] = token.decode('utf-8')
-
-        return json.dumps({
-            'profile': data
-        })
+class FollowListJSONRenderer(TokenEnvelopeJSONRenderer):
+    """Renders followers/following list. """
+    envelope = 'profile'
 
 
-class NotifyJSONRenderer(JSONRenderer):
+class NotifyJSONRenderer(TokenEnvelopeJSONRenderer):
     """Renders notifications. """
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        errors = data.get('errors', None)
-        token = data.get('token', None)
-
-        if errors is not None:
-            return super(NotifyJSONRenderer, self).render(data)
-
-        if token is not None and isinstance(token, bytes):
-            # We will decode `token` if it is of type
-            # bytes.
-            data['token'] = token.decode('utf-8')
-
-        # Finally, we can render our data under the "notifications" namespace.
-        return json.dumps({
-            'notifications': data
-        })
+    envelope = 'notifications'
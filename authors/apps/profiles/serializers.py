@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
+from authors.apps.core.serializers import DynamicFieldsMixin
 from .models import UserProfile, NotifyMe
 
 
@@ -18,8 +19,9 @@ class EmailNotificationSerializer(serializers.ModelSerializer):
 		fields = ['email_notify', ]
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
 	"""Serializes creation of user profile. """
+	always_include = ('username',)
 	username = serializers.SlugRelatedField(read_only=True, slug_field='username')
 	following = serializers.SerializerMethodField()
 
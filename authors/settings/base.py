@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/1.11/ref/settings/
 """
 
 import os
+import tempfile
 import django_heroku
 import cloudinary
 
@@ -106,6 +107,75 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/2.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'authors-haven'),
+    },
+    # ranked search results, the least recently used beyond
+    # SEARCH_CACHE_SIZE searches are dropped
+    'search': {
+        'BACKEND': os.getenv(
+            'SEARCH_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('SEARCH_CACHE_LOCATION', 'authors-haven-search'),
+        'TIMEOUT': int(os.getenv('SEARCH_CACHE_TIMEOUT', 60)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('SEARCH_CACHE_SIZE', 1000)),
+        },
+    },
+}
+
+# the engine searches run on, see authors.apps.article.search
+ARTICLE_SEARCH_BACKEND = os.getenv(
+    'ARTICLE_SEARCH_BACKEND',
+    'authors.apps.article.search.PostgresSearchBackend')
+
+# ranked rows cached per search, later pages are searched again
+SEARCH_CACHE_DEPTH = int(os.getenv('SEARCH_CACHE_DEPTH', 100))
+
+# seconds a rendered article stays cached, edits invalidate it earlier
+ARTICLE_CACHE_TIMEOUT = int(os.getenv('ARTICLE_CACHE_TIMEOUT', 300))
+
+# Article image uploads are spooled here and stored by a background worker
+ARTICLE_IMAGE_STORAGE = os.getenv(
+    'ARTICLE_IMAGE_STORAGE',
+    'authors.apps.article.storage.CloudinaryImageStorage')
+IMAGE_SPOOL_DIR = os.getenv(
+    'IMAGE_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'authors-haven-uploads'))
+# set to False to store images with the process_image_uploads command only
+ARTICLE_IMAGE_WORKER = os.getenv('ARTICLE_IMAGE_WORKER', 'true') == 'true'
+
+# Trending articles: engagement loses half its weight every
+# TRENDING_HALF_LIFE seconds, and the first run counts the engagement of
+# the last TRENDING_BACKFILL seconds. Each process writes the reads it
+# counted every TRENDING_VIEW_FLUSH_INTERVAL seconds.
+TRENDING_HALF_LIFE = int(os.getenv('TRENDING_HALF_LIFE', 24 * 60 * 60))
+TRENDING_BACKFILL = int(os.getenv('TRENDING_BACKFILL', 7 * 24 * 60 * 60))
+TRENDING_SIZE = int(os.getenv('TRENDING_SIZE', 50))
+TRENDING_VIEW_FLUSH_INTERVAL = int(
+    os.getenv('TRENDING_VIEW_FLUSH_INTERVAL', 10))
+
+# Search suggestions: each process picks up saved articles every
+# SUGGEST_REFRESH_INTERVAL seconds and rebuilds its index every
+# SUGGEST_REBUILD_INTERVAL seconds, and answers with at most SUGGEST_SIZE
+SUGGEST_REFRESH_INTERVAL = int(os.getenv('SUGGEST_REFRESH_INTERVAL', 5))
+SUGGEST_REBUILD_INTERVAL = int(os.getenv('SUGGEST_REBUILD_INTERVAL', 10 * 60))
+SUGGEST_SIZE = int(os.getenv('SUGGEST_SIZE', 10))
+
+# "Did you mean" corrections of searches that found nothing: words up to
+# SPELLING_MAX_DISTANCE edits away, at most SPELLING_SIZE suggestions. The
+# vocabulary is refreshed and rebuilt like the search suggestions.
+SPELLING_MAX_DISTANCE = int(os.getenv('SPELLING_MAX_DISTANCE', 2))
+SPELLING_SIZE = int(os.getenv('SPELLING_SIZE', 5))
+SPELLING_REFRESH_INTERVAL = int(os.getenv('SPELLING_REFRESH_INTERVAL', 5))
+SPELLING_REBUILD_INTERVAL = int(
+    os.getenv('SPELLING_REBUILD_INTERVAL', 60 * 60))
+
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
 
@@ -1,3 +1,7 @@
 from .base import *
 
 DEBUG = True
+
+# never upload test images to Cloudinary
+ARTICLE_IMAGE_STORAGE = 'authors.apps.article.storage.LocalImageStorage'
+LOCAL_IMAGE_ROOT = os.path.join(IMAGE_SPOOL_DIR, 'stored')